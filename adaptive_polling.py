@@ -0,0 +1,124 @@
+# ==============================================
+# АДАПТИВНЫЙ ИНТЕРВАЛ ОПРОСА ДОСОК
+# ==============================================
+# Вместо фиксированного CHECK_INTERVAL интервал каждой доски выбирается
+# по ее недавней истории:
+# - после изменений в колонках доска опрашивается часто
+# - в рабочие часы - чаще, чем ночью и в выходные
+# - если доска давно не менялась - интервал растет экспоненциально
+# - при ошибках Jira (в том числе 429) - экспоненциальная пауза
+# Общий бюджет запросов в минуту ограничивает суммарную нагрузку на Jira
+
+import time
+import threading
+
+
+class RequestBudget:
+    """
+    Бюджет запросов в минуту (token bucket)
+    """
+
+    def __init__(self, requests_per_minute, clock=time.monotonic, burst=None):
+        """
+        Args:
+            requests_per_minute: сколько проверок досок в минуту разрешено всего
+            clock: источник времени (подменяется в тестах)
+            burst: сколько запросов можно сделать подряд (по умолчанию - минутный бюджет)
+        """
+        self.capacity = max(1.0, float(burst if burst is not None else requests_per_minute))
+        self.rate = requests_per_minute / 60.0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = clock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self):
+        """
+        Returns:
+            bool: True если запрос укладывается в бюджет
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def wait_time(self):
+        """Через сколько секунд в бюджете появится запрос"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+
+class AdaptivePollPolicy:
+    """
+    Выбирает интервал до следующей проверки доски
+    """
+
+    def __init__(self, base_interval, min_interval, working_interval, max_interval,
+                 backoff_factor=2, idle_polls_per_step=3, recent_change_window=600,
+                 working_hours=None, working_days=(0, 1, 2, 3, 4), localtime=time.localtime):
+        """
+        Args:
+            base_interval: интервал в нерабочее время (секунды)
+            min_interval: интервал сразу после изменений (секунды)
+            working_interval: интервал в рабочие часы (секунды)
+            max_interval: предельный интервал при простое и ошибках (секунды)
+            backoff_factor: во сколько раз растет интервал на каждом шаге
+            idle_polls_per_step: после скольких проверок без изменений интервал растет
+            recent_change_window: сколько секунд после изменения опрашивать часто
+            working_hours: (час начала, час конца) или None - рабочих часов нет
+            working_days: дни недели рабочих часов (0 - понедельник)
+            localtime: источник местного времени (подменяется в тестах)
+        """
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.working_interval = working_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.idle_polls_per_step = max(1, idle_polls_per_step)
+        self.recent_change_window = recent_change_window
+        self.working_hours = working_hours
+        self.working_days = working_days
+        self._localtime = localtime
+
+    def is_working_time(self):
+        """Сейчас рабочие часы"""
+        if not self.working_hours:
+            return False
+        now = self._localtime()
+        start, end = self.working_hours
+        return now.tm_wday in self.working_days and start <= now.tm_hour < end
+
+    def next_interval(self, state, success, now):
+        """
+        Args:
+            state: BoardState после проверки (error_streak, idle_streak, last_change_at)
+            success: успешна ли проверка
+            now: время по часам движка
+
+        Returns:
+            float: секунд до следующей проверки
+        """
+        if not success:
+            backoff = self.base_interval * self.backoff_factor ** (state.error_streak - 1)
+            return min(backoff, self.max_interval)
+
+        if state.last_change_at is not None and now - state.last_change_at < self.recent_change_window:
+            return self.min_interval
+
+        # Доска не меняется - интервал растет, но в рабочие часы не выше base_interval
+        if self.is_working_time():
+            interval, limit = self.working_interval, max(self.working_interval, self.base_interval)
+        else:
+            interval, limit = self.base_interval, self.max_interval
+        steps = state.idle_streak // self.idle_polls_per_step
+        return min(interval * self.backoff_factor ** steps, limit)
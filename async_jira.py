@@ -0,0 +1,186 @@
+# ==============================================
+# АСИНХРОННЫЙ КЛИЕНТ JIRA (aiohttp)
+# ==============================================
+# Используется в асинхронном режиме работы бота (RUNTIME = "asyncio").
+# Повторяет поведение get_desk_api(): общий автомат защиты, одно
+# обновление куков при 401, повторы 5xx/429/таймаутов с растущей паузой
+# в пределах общего срока. Ответ доски разбирается потоково по мере
+# получения, готовый снимок кладется в общий кэш досок
+
+import time
+import asyncio
+import aiohttp
+from board_snapshot import BoardSnapshot
+from board_stream import BoardStreamParser
+from cookie_store import cookie_store
+from cookie_manager import refresh_cookies_on_401, get_cookie_generation
+from get_desk_api import (
+    url,
+    circuit_breaker,
+    board_caches,
+    JiraResult,
+    _backoff_delay,
+    ERROR_CIRCUIT_OPEN,
+    ERROR_TIMEOUT,
+    ERROR_CONNECTION,
+    ERROR_HTTP,
+    ERROR_AUTH
+)
+from config import (
+    JIRA_REQUEST_TIMEOUT,
+    JIRA_CALL_DEADLINE,
+    JIRA_MAX_RETRIES,
+    JIRA_POOL_SIZE,
+    BOARD_STREAM_CHUNK_SIZE
+)
+
+
+class AsyncJiraClient:
+    """
+    Загрузка досок Jira без блокировки цикла событий
+    """
+
+    def __init__(self, executor=None):
+        """
+        Args:
+            executor: пул для блокирующих операций (вход в Jira при 401)
+        """
+        self._executor = executor
+        self._session = None
+
+    async def _get_session(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=JIRA_POOL_SIZE)
+            )
+        return self._session
+
+    async def close(self):
+        """Закрывает HTTP-сессию"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _refresh_cookies(self, generation):
+        # Вход в Jira блокирующий (HTTP или Selenium) - выполняем вне цикла событий
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, refresh_cookies_on_401, generation)
+
+    async def fetch_board(self, board_name="ARM_QA", deadline=None):
+        """
+        Загружает доску и обновляет общий кэш
+
+        Args:
+            board_name: название доски из словаря url
+            deadline: крайний срок по time.monotonic() (по умолчанию через JIRA_CALL_DEADLINE секунд)
+
+        Returns:
+            tuple: (BoardSnapshot или None, JiraResult)
+        """
+        # События вебхуков, пришедшие во время загрузки, повторяются на ее снимке
+        cache = board_caches[board_name]
+        load_id = cache.begin_load()
+        snapshot = None
+        try:
+            snapshot, result = await self._fetch_board(board_name, deadline)
+        except BaseException:
+            # Непредвиденная ошибка (в том числе отмена задачи) не должна
+            # навсегда занять пробный запрос автомата защиты
+            circuit_breaker.release()
+            raise
+        finally:
+            snapshot = cache.finish_load(load_id, snapshot)
+        return snapshot, result
+
+    async def _fetch_board(self, board_name, deadline):
+        if deadline is None:
+            deadline = time.monotonic() + JIRA_CALL_DEADLINE
+
+        if not circuit_breaker.allow():
+            print(f"⛔ Jira недоступна - запрос пропущен (повтор через {int(circuit_breaker.retry_after())} сек)")
+            return self._failed(board_name, JiraResult(error=ERROR_CIRCUIT_OPEN))
+
+        session = await self._get_session()
+        cookies_refreshed = False
+        attempt = 0
+        requested = False
+
+        while True:
+            generation = get_cookie_generation()
+            cookies = cookie_store.load()
+            if cookies is None:
+                print("⚠️ Нет корректных куков - создаю новые куки...")
+                if cookies_refreshed or not await self._refresh_cookies(generation):
+                    circuit_breaker.record_success()
+                    return self._failed(board_name, JiraResult(error=ERROR_AUTH))
+                cookies_refreshed = True
+                continue
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                result = JiraResult(error=ERROR_TIMEOUT)
+                break
+
+            timeout = aiohttp.ClientTimeout(total=min(remaining, JIRA_REQUEST_TIMEOUT))
+            requested = True
+            try:
+                async with session.get(url[board_name], cookies=cookies, timeout=timeout) as response:
+                    status = response.status
+                    if status == 200:
+                        # Jira ответила - ошибка разбора не означает ее недоступность
+                        circuit_breaker.record_success()
+                        parser = BoardStreamParser()
+                        async for chunk in response.content.iter_chunked(BOARD_STREAM_CHUNK_SIZE):
+                            parser.feed(chunk)
+                        try:
+                            snapshot = BoardSnapshot(parser.close())
+                        except (ValueError, KeyError) as e:
+                            board_caches[board_name].last_error = str(e) or e.__class__.__name__
+                            return None, JiraResult(status_code=status)
+                        board_caches[board_name].last_error = None
+                        return snapshot, JiraResult(status_code=status)
+            except asyncio.TimeoutError as e:
+                print(f"⏱️ Таймаут запроса к Jira: {e}")
+                result = JiraResult(error=ERROR_TIMEOUT)
+            except aiohttp.ClientError as e:
+                print(f"🔌 Ошибка соединения с Jira: {e}")
+                result = JiraResult(error=ERROR_CONNECTION)
+            else:
+                print("Статус:", status)
+
+                if status == 401:
+                    if cookies_refreshed:
+                        circuit_breaker.record_success()
+                        return self._failed(board_name, JiraResult(error=ERROR_AUTH, status_code=status))
+                    print("🔄 Получена 401 ошибка - обновляю куки...")
+                    cookies_refreshed = True
+                    if not await self._refresh_cookies(generation):
+                        circuit_breaker.record_success()
+                        return self._failed(board_name, JiraResult(error=ERROR_AUTH, status_code=status))
+                    continue
+
+                result = JiraResult(error=ERROR_HTTP, status_code=status)
+                if status < 500 and status != 429:
+                    circuit_breaker.record_success()
+                    return self._failed(board_name, result)
+
+            attempt += 1
+            if attempt > JIRA_MAX_RETRIES:
+                break
+            delay = _backoff_delay(attempt)
+            if time.monotonic() + delay >= deadline:
+                break
+            print(f"🔁 Повтор запроса к Jira через {delay:.1f} сек (попытка {attempt}/{JIRA_MAX_RETRIES})")
+            await asyncio.sleep(delay)
+
+        if requested:
+            circuit_breaker.record_failure()
+        else:
+            circuit_breaker.release()
+        return self._failed(board_name, result)
+
+    @staticmethod
+    def _failed(board_name, result):
+        # Обработчики кнопок покажут эту ошибку через get_board_error()
+        board_caches[board_name].last_error = result.error_message
+        return None, result
@@ -0,0 +1,125 @@
+# ==============================================
+# АСИНХРОННЫЙ РЕЖИМ РАБОТЫ БОТА
+# ==============================================
+# Включается в config.py: RUNTIME = "asyncio"
+#
+# Один цикл событий вместо потоков бота, мониторинга и напоминаний:
+# - Telegram: AsyncTeleBot из pyTelegramBotAPI
+# - Jira: aiohttp (async_jira.py)
+# - движок опроса досок и планировщик напоминаний - задачи цикла событий
+#
+# Обработчики из bot_handlers.py общие для обоих режимов. Они написаны
+# синхронно и выполняются потоками handler_executor (как и в режиме
+# с потоками), а их вызовы bot.* передаются в цикл событий через SyncBotBridge
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from telebot.async_telebot import AsyncTeleBot
+from async_jira import AsyncJiraClient
+from bot_handlers import setup_handlers
+from monitoring_engine import AsyncMonitoringEngine
+from monitor import (
+    create_monitoring_engine,
+    process_board_snapshot,
+    reminder_scheduler,
+    start_webhook_receiver,
+    start_telegram_sender
+)
+from session_keeper import start_session_keeper
+from config import BOT_TOKEN, DEBUG_MODE, SHOW_CHECK_STATUS, ASYNC_HANDLER_WORKERS
+
+
+class SyncBotBridge:
+    """
+    Синхронный интерфейс TeleBot поверх AsyncTeleBot
+
+    - message_handler / callback_query_handler регистрируют синхронный
+      обработчик на асинхронном боте (обработчик выполняется в пуле потоков)
+    - остальные методы (send_message, edit_message_text, ...) выполняют
+      корутину асинхронного бота в цикле событий и ждут результат
+    """
+
+    def __init__(self, async_bot, loop, executor):
+        """
+        Args:
+            async_bot: AsyncTeleBot
+            loop: цикл событий, в котором работает async_bot
+            executor: пул потоков для синхронных обработчиков
+        """
+        self._async_bot = async_bot
+        self._loop = loop
+        self._executor = executor
+
+    def _register(self, register, **kwargs):
+        def decorator(handler):
+            async def run_in_executor(update):
+                await self._loop.run_in_executor(self._executor, handler, update)
+            register(**kwargs)(run_in_executor)
+            return handler
+        return decorator
+
+    def message_handler(self, **kwargs):
+        return self._register(self._async_bot.message_handler, **kwargs)
+
+    def callback_query_handler(self, **kwargs):
+        return self._register(self._async_bot.callback_query_handler, **kwargs)
+
+    def __getattr__(self, name):
+        attr = getattr(self._async_bot, name)
+        if not asyncio.iscoroutinefunction(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            # Из потока цикла событий ждать результат нельзя - это блокировка
+            try:
+                running_loop = asyncio.get_running_loop()
+            except RuntimeError:
+                running_loop = None
+            if running_loop is self._loop:
+                raise RuntimeError(f"bot.{name}() вызван из цикла событий - используйте await")
+            return asyncio.run_coroutine_threadsafe(attr(*args, **kwargs), self._loop).result()
+
+        return call
+
+
+async def run_bot_async():
+    """
+    Запускает бота, мониторинг и напоминания в одном цикле событий
+    """
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=ASYNC_HANDLER_WORKERS, thread_name_prefix="handler")
+
+    async_bot = AsyncTeleBot(BOT_TOKEN)
+    # Сообщения отправляются потоком очереди - он ждет цикл событий, а не обработчики
+    bot = start_telegram_sender(SyncBotBridge(async_bot, loop, executor))
+    setup_handlers(bot)
+
+    jira = AsyncJiraClient(executor)
+
+    async def poll_board_async(state):
+        if SHOW_CHECK_STATUS:
+            print(f"⏰ Проверка доски {state.board_name}")
+        webhook_seq = state.webhook_seq
+        snapshot, _ = await jira.fetch_board(state.board_name)
+        # Обработка колонок отправляет сообщения через синхронный интерфейс бота
+        return await loop.run_in_executor(executor, process_board_snapshot, state, bot, snapshot, webhook_seq)
+
+    engine = create_monitoring_engine(bot, engine_class=AsyncMonitoringEngine, poll_func=poll_board_async)
+    # Сессия Jira и прием вебхуков - фоновые потоки, как и в режиме с потоками
+    start_session_keeper()
+    start_webhook_receiver(bot)
+
+    if DEBUG_MODE:
+        print("✅ Асинхронный режим: бот, мониторинг и напоминания в одном цикле событий")
+
+    try:
+        await asyncio.gather(
+            engine.run(),
+            reminder_scheduler.run_async(),
+            async_bot.infinity_polling(timeout=30)
+        )
+    finally:
+        engine.stop()
+        reminder_scheduler.stop()
+        await jira.close()
+        executor.shutdown(wait=False)
@@ -0,0 +1,140 @@
+# ==============================================
+# СПОСОБЫ ВХОДА В JIRA (AUTH BACKENDS)
+# ==============================================
+# Каждый backend умеет войти в Jira и вернуть словарь куков.
+# cookie_manager перебирает backends в порядке AUTH_BACKENDS из config.py:
+# по умолчанию сначала быстрый вход через HTTP, затем Selenium как запасной
+
+from abc import ABC, abstractmethod
+import requests
+from cookie_store import IMPORTANT_COOKIES
+
+
+def earliest_expiry(cookie_expiries):
+    """
+    Определяет, когда истекает сессия: самый ранний срок среди важных куков
+
+    Args:
+        cookie_expiries: словарь {имя кука: unix time истечения или None}
+
+    Returns:
+        float: unix time истечения или None если у важных куков нет срока
+    """
+    expiries = [
+        expires for name, expires in cookie_expiries.items()
+        if name in IMPORTANT_COOKIES and expires
+    ]
+    return min(expiries) if expiries else None
+
+
+class AuthBackend(ABC):
+    """
+    Базовый класс способа входа в Jira
+
+    Backend без своего login() нельзя даже создать - ошибка видна при запуске,
+    а не посреди обновления куков
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def login(self):
+        """
+        Выполняет вход в Jira
+
+        Returns:
+            tuple: (куки {имя: значение}, unix time истечения сессии или None)
+                   при неудаче куки - пустой словарь
+        """
+
+
+class HttpAuthBackend(AuthBackend):
+    """
+    Вход без браузера: POST формы login.jsp, при неудаче - REST /rest/auth/1/session
+    Занимает доли секунды вместо десятков секунд через Chrome
+    """
+
+    name = "http"
+
+    def __init__(self, base_url, username, password, timeout=10):
+        """
+        Args:
+            base_url: адрес Jira (например https://jira.zxz.su)
+            username: логин
+            password: пароль
+            timeout: таймаут одного HTTP-запроса (секунды)
+        """
+        self.base_url = base_url.rstrip('/')
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+
+    def login(self):
+        session = requests.Session()
+        try:
+            if self._login_form(session) or self._login_rest(session):
+                return self._session_cookies(session)
+            return {}, None
+        except requests.RequestException as e:
+            print(f"❌ Ошибка HTTP-входа в Jira: {e}")
+            return {}, None
+        finally:
+            session.close()
+
+    def _login_form(self, session):
+        """
+        Отправляет форму login.jsp так же, как это делает браузер
+        Jira сообщает результат в заголовке X-Seraph-LoginReason
+
+        Returns:
+            bool: True если сессия получена
+        """
+        response = session.post(
+            f"{self.base_url}/login.jsp",
+            data={
+                "os_username": self.username,
+                "os_password": self.password,
+                "os_cookie": "true",  # "Запомнить меня" - выдаёт seraph.rememberme.cookie
+                "os_destination": "",
+                "login": "Log In"
+            },
+            headers={"X-Atlassian-Token": "no-check"},
+            timeout=self.timeout,
+            allow_redirects=False
+        )
+
+        # JSESSIONID Jira выдает и анонимным посетителям, поэтому успехом считаем
+        # только явный ответ "OK" или выданный кук "Запомнить меня"
+        login_reason = response.headers.get("X-Seraph-LoginReason", "")
+        if login_reason == "OK" or "seraph.rememberme.cookie" in session.cookies:
+            return True
+
+        if login_reason:
+            print(f"⚠️ login.jsp отклонил вход: {login_reason}")
+        return False
+
+    def _login_rest(self, session):
+        """
+        Вход через REST API сессий Jira
+
+        Returns:
+            bool: True если сессия получена
+        """
+        response = session.post(
+            f"{self.base_url}/rest/auth/1/session",
+            json={"username": self.username, "password": self.password},
+            timeout=self.timeout
+        )
+        if response.status_code != 200:
+            print(f"⚠️ REST-вход отклонён: статус {response.status_code}")
+            return False
+
+        return "JSESSIONID" in session.cookies
+
+    def _session_cookies(self, session):
+        cookies = {}
+        expiries = {}
+        for cookie in session.cookies:
+            cookies[cookie.name] = cookie.value
+            expiries[cookie.name] = cookie.expires
+        return cookies, earliest_expiry(expiries)
@@ -0,0 +1,186 @@
+# ==============================================
+# ОБЩИЙ КЭШ ДАННЫХ ДОСОК JIRA
+# ==============================================
+# Хранит последний полученный снимок доски для всего процесса.
+# Обработчики кнопок и напоминания берут данные отсюда,
+# а мониторинг при каждой проверке кладёт сюда свежий снимок.
+# Изменения из вебхуков (apply), пришедшие во время загрузки, повторяются
+# на загруженном снимке - иначе снимок, запрошенный до события, затер бы его
+
+import time
+import threading
+from single_flight import SingleFlight
+
+
+class BoardCache:
+    """
+    Кэш снимка одной доски с временем жизни и номером версии
+
+    Номер версии монотонно растёт при каждом новом снимке.
+    Одновременные промахи кэша выполняют только один запрос к Jira.
+    """
+
+    def __init__(self, board_name, loader, ttl):
+        """
+        Args:
+            board_name: название доски (ключ из url)
+            loader: функция loader(board_name) -> BoardSnapshot,
+                    при ошибке возвращает None или выбрасывает исключение
+            ttl: сколько секунд снимок считается свежим
+        """
+        self.board_name = board_name
+        self.ttl = ttl
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self._snapshot = None
+        self._version = 0
+        self._fetched_at = 0.0
+        # Идущие загрузки: {номер загрузки: изменения, примененные во время нее}
+        self._loading = {}
+        self._load_seq = 0
+        # Номер загрузки, чей снимок сейчас в кэше
+        self._loaded_id = 0
+        # Текст последней ошибки загрузки (None если последняя загрузка успешна)
+        self.last_error = None
+
+    @property
+    def version(self):
+        """Номер версии текущего снимка (0 - снимка ещё нет)"""
+        with self._lock:
+            return self._version
+
+    def age(self):
+        """Возраст текущего снимка в секундах или None если снимка нет"""
+        with self._lock:
+            if self._snapshot is None:
+                return None
+            return time.monotonic() - self._fetched_at
+
+    def peek(self):
+        """Текущий снимок без загрузки из Jira (None если снимка нет)"""
+        with self._lock:
+            return self._snapshot
+
+    def get(self, max_age=None):
+        """
+        Возвращает снимок доски, при необходимости загружая новый
+
+        Args:
+            max_age: допустимый возраст снимка в секундах (по умолчанию ttl)
+
+        Returns:
+            BoardSnapshot или None если загрузить не удалось
+        """
+        if max_age is None:
+            max_age = self.ttl
+
+        with self._lock:
+            if self._snapshot is not None and time.monotonic() - self._fetched_at <= max_age:
+                return self._snapshot
+
+        return self.refresh()
+
+    def refresh(self):
+        """
+        Принудительно загружает свежий снимок
+
+        Если загрузка уже идёт в другом потоке - ждёт её и возвращает её результат
+        """
+        snapshot, _ = self._flight.do(self.board_name, self._load)
+        return snapshot
+
+    def put(self, snapshot):
+        """
+        Кладёт в кэш новый снимок и присваивает ему номер версии
+
+        Returns:
+            int: номер версии нового снимка
+        """
+        with self._lock:
+            return self._put(snapshot)
+
+    def apply(self, update):
+        """
+        Применяет изменение к текущему снимку (например событие вебхука)
+
+        Изменение запоминается для идущих загрузок и будет повторено
+        на их снимках, поэтому должно быть идемпотентным
+
+        Args:
+            update: функция update(BoardSnapshot) -> BoardSnapshot
+                    (тот же объект, если изменение к доске не относится)
+
+        Returns:
+            BoardSnapshot: новый снимок или None если снимок не изменился
+        """
+        with self._lock:
+            for updates in self._loading.values():
+                updates.append(update)
+            current = self._snapshot
+            if current is None:
+                return None
+            updated = update(current)
+            if updated is current:
+                return None
+            self._put(updated)
+            return updated
+
+    def begin_load(self):
+        """
+        Отмечает начало загрузки снимка из Jira
+
+        Returns:
+            int: номер загрузки для finish_load()
+        """
+        with self._lock:
+            self._load_seq += 1
+            self._loading[self._load_seq] = []
+            return self._load_seq
+
+    def finish_load(self, load_id, snapshot):
+        """
+        Кладет загруженный снимок в кэш, повторив на нем изменения,
+        примененные через apply() во время загрузки
+
+        Args:
+            load_id: номер из begin_load()
+            snapshot: загруженный снимок или None если загрузка не удалась
+
+        Returns:
+            BoardSnapshot: снимок в кэше после загрузки или None при ошибке
+        """
+        with self._lock:
+            updates = self._loading.pop(load_id, [])
+            if snapshot is None:
+                return None
+            # Загрузка, начатая позже, уже положила более свежий снимок
+            if load_id < self._loaded_id:
+                return self._snapshot
+            for update in updates:
+                snapshot = update(snapshot)
+            self._loaded_id = load_id
+            self._put(snapshot)
+            return snapshot
+
+    def _put(self, snapshot):
+        self._version += 1
+        snapshot.version = self._version
+        self._snapshot = snapshot
+        self._fetched_at = time.monotonic()
+        return self._version
+
+    def _load(self):
+        load_id = self.begin_load()
+        try:
+            snapshot = self._loader(self.board_name)
+        except Exception as e:
+            # Все ожидающие потоки получат одну и ту же быструю ошибку
+            self.last_error = str(e) or e.__class__.__name__
+            snapshot = None
+        else:
+            if snapshot is None:
+                self.last_error = "Данные доски не получены"
+            else:
+                self.last_error = None
+        return self.finish_load(load_id, snapshot)
@@ -0,0 +1,193 @@
+# ==============================================
+# ИНДЕКСИРОВАННЫЙ СНИМОК ДОСКИ JIRA
+# ==============================================
+# Строится один раз на каждый полученный ответ Jira.
+# Вместо линейных проходов по columnsData/issuesData
+# все поиски идут через готовые словари
+
+class BoardSnapshot:
+    """
+    Снимок доски с индексами:
+    - колонка по имени
+    - колонка по statusId
+    - задача по ключу
+    - упорядоченный список задач каждой колонки
+    """
+
+    def __init__(self, api_data, version=0):
+        """
+        Args:
+            api_data: разобранный JSON ответа Jira (columnsData + issuesData)
+            version: номер версии снимка (назначается кэшем досок)
+        """
+        self.version = version
+        self.columns = list(api_data['columnsData']['columns'])
+        self._project_keys = None
+
+        self.column_by_name = {}
+        self.column_by_status = {}
+        self.issues_by_column = {}
+        for column in self.columns:
+            self.column_by_name[column['name']] = column
+            self.issues_by_column[column['name']] = []
+            for status_id in column['statusIds']:
+                self.column_by_status[status_id] = column
+
+        # Один проход по задачам: порядок внутри колонки совпадает с порядком на доске
+        self.issue_by_key = {}
+        for issue in api_data['issuesData']['issues']:
+            self.issue_by_key[issue['key']] = issue
+            column = self.column_by_status.get(issue['statusId'])
+            if column is not None:
+                self.issues_by_column[column['name']].append(issue)
+
+    def column(self, column_name):
+        """Возвращает колонку по имени или None"""
+        return self.column_by_name.get(column_name)
+
+    def issue(self, task_key):
+        """Возвращает задачу по ключу или None"""
+        return self.issue_by_key.get(task_key)
+
+    def issues_in(self, column_name):
+        """Возвращает задачи колонки в порядке доски (пустой список если колонки нет)"""
+        return self.issues_by_column.get(column_name, [])
+
+    def issue_keys_in(self, column_name):
+        """Возвращает ключи задач колонки в порядке доски"""
+        return [issue['key'] for issue in self.issues_in(column_name)]
+
+    def column_of(self, task_key):
+        """Возвращает колонку, в которой сейчас находится задача, или None"""
+        issue = self.issue_by_key.get(task_key)
+        if issue is None:
+            return None
+        return self.column_by_status.get(issue['statusId'])
+
+    def issues_in_column_by_keys(self, column_name, task_keys):
+        """
+        Возвращает задачи из task_keys, которые сейчас находятся в колонке
+
+        Стоимость O(len(task_keys)) - доска целиком не просматривается
+        """
+        issues = []
+        for task_key in task_keys:
+            column = self.column_of(task_key)
+            if column is not None and column['name'] == column_name:
+                issues.append(self.issue_by_key[task_key])
+        return issues
+
+    def project_keys(self):
+        """Возвращает ключи проектов задач доски (UGC для UGC-123)"""
+        if self._project_keys is None:
+            self._project_keys = {task_key.rsplit('-', 1)[0] for task_key in self.issue_by_key}
+        return self._project_keys
+
+    def with_issue(self, issue):
+        """
+        Возвращает новый снимок, в котором задача добавлена или заменена
+
+        Изменившаяся задача остается на своем месте, новая добавляется в конец.
+        Счетчики задач колонок пересчитываются. Текущий снимок не меняется
+        """
+        return self.with_issues([issue])
+
+    def with_issues(self, new_issues):
+        """
+        Возвращает новый снимок с добавленными или замененными задачами
+
+        Стоимость O(задач на доске + len(new_issues)) - один проход по доске
+        """
+        updates = {issue['key']: issue for issue in new_issues}
+        if not updates:
+            return self
+
+        issues = []
+        moves = []
+        for item in self.issue_by_key.values():
+            new_issue = updates.pop(item['key'], None)
+            if new_issue is None:
+                issues.append(item)
+            else:
+                issues.append(new_issue)
+                moves.append((item, new_issue))
+        for new_issue in updates.values():
+            issues.append(new_issue)
+            moves.append((None, new_issue))
+        return self._replaced(issues, moves)
+
+    def without_issue(self, task_key):
+        """Возвращает новый снимок без задачи (или этот же, если задачи нет)"""
+        old_issue = self.issue_by_key.get(task_key)
+        if old_issue is None:
+            return self
+        issues = [item for item in self.issue_by_key.values() if item is not old_issue]
+        return self._replaced(issues, [(old_issue, None)])
+
+    def _replaced(self, issues, moves):
+        # Изменение счетчика каждой колонки: +1 пришедшим, -1 ушедшим задачам
+        deltas = {}
+        for old_issue, new_issue in moves:
+            old_column = self.column_by_status.get(old_issue['statusId']) if old_issue else None
+            new_column = self.column_by_status.get(new_issue['statusId']) if new_issue else None
+            if old_column is new_column:
+                continue
+            if old_column is not None:
+                deltas[old_column['name']] = deltas.get(old_column['name'], 0) - 1
+            if new_column is not None:
+                deltas[new_column['name']] = deltas.get(new_column['name'], 0) + 1
+
+        columns = []
+        for column in self.columns:
+            delta = deltas.get(column['name'])
+            if delta:
+                column = dict(column, statisticsFieldValue=int(column.get('statisticsFieldValue', 0)) + delta)
+            columns.append(column)
+        return BoardSnapshot({
+            'columnsData': {'columns': columns},
+            'issuesData': {'issues': issues}
+        }, self.version)
+
+
+def issue_from_jira(issue):
+    """
+    Переводит задачу из REST API Jira (поиск, вебхук) в формат задачи доски
+
+    Args:
+        issue: {'key', 'fields': {'summary', 'status', 'assignee', 'description'}}
+
+    Returns:
+        dict: задача с полями как в ответе доски (board_stream.ISSUE_FIELDS)
+    """
+    fields = issue.get('fields') or {}
+    status = fields.get('status') or {}
+    assignee = fields.get('assignee') or {}
+
+    board_issue = {
+        'key': issue['key'],
+        'summary': fields.get('summary') or '',
+        'statusId': str(status.get('id', ''))
+    }
+    if assignee.get('displayName'):
+        board_issue['assigneeName'] = assignee['displayName']
+    if fields.get('description'):
+        board_issue['description'] = fields['description']
+    return board_issue
+
+
+def diff_issue_keys(old_keys, new_keys):
+    """
+    Сравнивает два состояния колонки по ключам задач за O(n)
+
+    Args:
+        old_keys: ключи задач при предыдущей проверке
+        new_keys: ключи задач сейчас
+
+    Returns:
+        tuple: (добавленные ключи в порядке new_keys, убранные ключи в порядке old_keys)
+    """
+    old_set = set(old_keys)
+    new_set = set(new_keys)
+    added = [key for key in new_keys if key not in old_set]
+    removed = [key for key in old_keys if key not in new_set]
+    return added, removed
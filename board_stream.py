@@ -0,0 +1,296 @@
+# ==============================================
+# ПОТОКОВЫЙ РАЗБОР ОТВЕТА ДОСКИ JIRA
+# ==============================================
+# response.json() строит в памяти весь документ доски, хотя нам нужны
+# только несколько полей колонок и задач. Этот модуль читает тело ответа
+# кусками и сохраняет только нужные поля:
+# - структура документа (объекты, ключи, массивы) разбирается
+#   собственным инкрементальным токенизатором
+# - каждая отдельная колонка/задача декодируется стандартным json
+#   и сразу сокращается до нужных полей
+# - ненужные значения пропускаются сканером без построения объектов
+# В памяти одновременно находится только текущий кусок ответа и одна задача
+
+import re
+import json
+import codecs
+
+# Поля, которые используются ботом
+COLUMN_FIELDS = ('name', 'statusIds', 'statisticsFieldValue')
+ISSUE_FIELDS = ('key', 'summary', 'statusId', 'assigneeName', 'description')
+
+# Пропускаемое значение
+SKIP = None
+
+_WHITESPACE = ' \t\n\r'
+# Что может стоять после законченного числа, true, false или null
+_SCALAR_END = _WHITESPACE + ',]}'
+# Следующий значимый символ вне строки / внутри строки при пропуске значения
+_SKIP_STRUCTURE_RE = re.compile(r'["\[\]{}]')
+_SKIP_STRING_RE = re.compile(r'["\\]')
+
+
+class _Records:
+    """Описание массива, каждый элемент которого сокращается до fields"""
+
+    def __init__(self, fields, target):
+        self.fields = fields
+        self.target = target
+
+
+class BoardStreamParser:
+    """
+    Инкрементальный разбор ответа доски
+
+    Использование:
+        parser = BoardStreamParser()
+        for chunk in response.iter_content(65536):
+            parser.feed(chunk)
+        data = parser.close()
+    """
+
+    def __init__(self):
+        self.columns = []
+        self.issues = []
+        # Какие части документа разбирать, остальное пропускается
+        self._spec = {
+            'columnsData': {'columns': _Records(COLUMN_FIELDS, self.columns)},
+            'issuesData': {'issues': _Records(ISSUE_FIELDS, self.issues)}
+        }
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+        self._done = False
+        # Стек разбора: [вид, описание, состояние]
+        self._stack = [['value', self._spec, None]]
+        # Состояние пропуска значения между кусками: [глубина, внутри строки, экранирование]
+        self._skip = None
+
+    def feed(self, chunk):
+        """Передает очередной кусок тела ответа (bytes или str)"""
+        if isinstance(chunk, bytes):
+            chunk = self._decoder.decode(chunk)
+        if chunk:
+            self._buf = self._buf[self._pos:] + chunk
+            self._pos = 0
+            self._parse()
+
+    def close(self):
+        """
+        Завершает разбор
+
+        Returns:
+            dict: {'columnsData': {'columns': [...]}, 'issuesData': {'issues': [...]}}
+                  с сокращенными колонками и задачами
+
+        Raises:
+            ValueError: если документ оборван или некорректен
+        """
+        tail = self._decoder.decode(b'', final=True)
+        self._buf = self._buf[self._pos:] + tail
+        self._pos = 0
+        self._eof = True
+        self._parse()
+        if not self._done:
+            raise ValueError("Ответ доски оборван или некорректен")
+        return {
+            'columnsData': {'columns': self.columns},
+            'issuesData': {'issues': self.issues}
+        }
+
+    # ============== ТОКЕНИЗАТОР ==============
+
+    def _skip_ws(self):
+        buf = self._buf
+        pos = self._pos
+        while pos < len(buf) and buf[pos] in _WHITESPACE:
+            pos += 1
+        self._pos = pos
+        return pos < len(buf)
+
+    def _error(self, expected):
+        near = self._buf[self._pos:self._pos + 20]
+        raise ValueError(f"Ответ доски некорректен: ожидалось {expected}, получено {near!r}")
+
+    def _decode_value(self):
+        """
+        Декодирует одно значение целиком
+
+        Returns:
+            tuple: (True, значение) или (False, None) если данных пока не хватает
+        """
+        try:
+            value, end = self._json.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError:
+            if self._eof:
+                raise
+            return False, None
+        # Число в конце куска может продолжиться в следующем куске: "12." + "5",
+        # "1e" + "3" - скаляр закончен, только если за ним виден разделитель
+        if not self._eof and self._buf[self._pos] not in '{["':
+            if end == len(self._buf) or self._buf[end] not in _SCALAR_END:
+                return False, None
+        self._pos = end
+        return True, value
+
+    def _skip_value(self):
+        """
+        Пропускает значение, не строя объектов
+
+        Returns:
+            bool: True если значение пропущено целиком
+        """
+        buf = self._buf
+        if self._skip is None:
+            if buf[self._pos] not in '{["':
+                complete, _ = self._decode_value()
+                return complete
+            self._skip = [0, False, False]
+
+        depth, in_string, escaped = self._skip
+        pos = self._pos
+        while True:
+            if in_string:
+                if escaped:
+                    if pos >= len(buf):
+                        break
+                    pos += 1
+                    escaped = False
+                match = _SKIP_STRING_RE.search(buf, pos)
+                if match is None:
+                    pos = len(buf)
+                    break
+                pos = match.end()
+                if match.group() == '\\':
+                    escaped = True
+                    continue
+                in_string = False
+                if depth == 0:
+                    self._pos = pos
+                    self._skip = None
+                    return True
+            else:
+                match = _SKIP_STRUCTURE_RE.search(buf, pos)
+                if match is None:
+                    pos = len(buf)
+                    break
+                pos = match.end()
+                char = match.group()
+                if char == '"':
+                    in_string = True
+                elif char in '{[':
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        self._pos = pos
+                        self._skip = None
+                        return True
+
+        self._pos = pos
+        self._skip = [depth, in_string, escaped]
+        return False
+
+    # ============== РАЗБОР СТРУКТУРЫ ==============
+
+    def _parse(self):
+        stack = self._stack
+        while stack:
+            # Внутри пропускаемой строки пробелы значимы - их не пропускаем
+            if self._skip is None:
+                if not self._skip_ws():
+                    break
+            elif self._pos >= len(self._buf):
+                break
+
+            frame = stack[-1]
+            kind, spec, state = frame
+            char = self._buf[self._pos]
+
+            if kind == 'value':
+                if spec is SKIP:
+                    if not self._skip_value():
+                        return
+                    stack.pop()
+                elif isinstance(spec, dict):
+                    if char != '{':
+                        self._error("'{'")
+                    self._pos += 1
+                    stack[-1] = ['object', spec, 'key_or_end']
+                else:
+                    if char != '[':
+                        self._error("'['")
+                    self._pos += 1
+                    stack[-1] = ['records', spec, 'value_or_end']
+
+            elif kind == 'object':
+                if state in ('key_or_end', 'key'):
+                    if char == '}' and state == 'key_or_end':
+                        self._pos += 1
+                        stack.pop()
+                        continue
+                    if char != '"':
+                        self._error("ключ объекта")
+                    complete, key = self._decode_value()
+                    if not complete:
+                        return
+                    frame[2] = ('colon', key)
+                elif state == 'comma_or_end':
+                    self._pos += 1
+                    if char == ',':
+                        frame[2] = 'key'
+                    elif char == '}':
+                        stack.pop()
+                    else:
+                        self._error("',' или '}'")
+                else:
+                    # state = ('colon', key)
+                    if char != ':':
+                        self._error("':'")
+                    self._pos += 1
+                    frame[2] = 'comma_or_end'
+                    stack.append(['value', spec.get(state[1], SKIP), None])
+
+            else:
+                # kind == 'records': массив колонок или задач
+                if state in ('value_or_end', 'value'):
+                    if char == ']' and state == 'value_or_end':
+                        self._pos += 1
+                        stack.pop()
+                        continue
+                    complete, item = self._decode_value()
+                    if not complete:
+                        return
+                    spec.target.append({
+                        field: item[field] for field in spec.fields if field in item
+                    })
+                    frame[2] = 'comma_or_end'
+                else:
+                    self._pos += 1
+                    if char == ',':
+                        frame[2] = 'value'
+                    elif char == ']':
+                        stack.pop()
+                    else:
+                        self._error("',' или ']'")
+
+        if not stack:
+            self._done = True
+
+
+def parse_board_stream(chunks):
+    """
+    Разбирает ответ доски, переданный кусками
+
+    Args:
+        chunks: итерируемые куски тела ответа (например response.iter_content())
+
+    Returns:
+        dict: данные доски только с используемыми полями
+    """
+    parser = BoardStreamParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.close()
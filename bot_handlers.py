@@ -5,19 +5,161 @@
 # Каждая функция отвечает за определенное действие пользователя
 
 from telebot import types
-from get_desk_api import url, get_column_count_task, get_desk_api
-from config import DEBUG_MODE
+from get_desk_api import url, format_column_page, get_board_data, peek_board_data, get_board_error
+from view_cache import ViewCache, RenderedView
+from handler_executor import HandlerExecutor
+from callback_codec import (
+    callback_codec, CallbackRouter, RENDER_OPS, OP_BOARD, OP_COLUMN, OP_BACK_TO_COLUMNS, OP_TASK,
+    OP_BACK_TO_REMINDER, OP_TAKE, OP_READ, OP_DELETE
+)
+from config import DEBUG_MODE, VIEW_CACHE_SIZE, VIEW_TRACKED_MESSAGES, HANDLER_WORKERS, HANDLER_QUEUE_SIZE
 from datetime import datetime
 import time  # Добавлен импорт time
 
+# Доска для кнопок из старых сообщений, в которых доска не указана
+DEFAULT_BOARD = "ARM_QA"
+
+# Готовые экраны досок и колонок и то, что показывает каждое сообщение
+views = ViewCache(VIEW_CACHE_SIZE, VIEW_TRACKED_MESSAGES)
+
+# Обработчики выполняются по очереди для каждого сообщения с кнопками (и чата для команд)
+handler_executor = HandlerExecutor(HANDLER_WORKERS, HANDLER_QUEUE_SIZE)
+
+def parse_board_callback(data):
+    """
+    Разбирает данные кнопки вида "<доска>:<колонка>"
+    
+    Returns:
+        tuple: (доска, колонка или None); для старых кнопок без доски - DEFAULT_BOARD
+    """
+    board_name, separator, column_name = data.partition(":")
+    if separator and board_name in url:
+        return board_name, column_name or None
+    if data in url:
+        return data, None
+    return DEFAULT_BOARD, data or None
+
+def parse_legacy_callback(data):
+    """
+    Разбирает данные кнопок старого формата (column_..., task_..., take_... и т.д.)
+    в уже отправленных сообщениях
+    
+    Returns:
+        tuple: (код операции, поля) или None, если формат неизвестен
+    """
+    if data in url:
+        return OP_BOARD, [data]
+    if data.startswith("column_"):
+        # column_<доска>:<колонка>[#<страница>]
+        rest, separator, page = data[len("column_"):].rpartition("#")
+        if not separator or not page.isdigit():
+            rest, page = data[len("column_"):], None
+        board_name, column_name = parse_board_callback(rest)
+        fields = [board_name, column_name or ""]
+        return OP_COLUMN, fields + [page] if page is not None else fields
+    if data.startswith("back_to_columns"):
+        board_name, _ = parse_board_callback(data[len("back_to_columns"):].lstrip(":"))
+        return OP_BACK_TO_COLUMNS, [board_name]
+    if data.startswith("back_to_reminder_"):
+        return OP_BACK_TO_REMINDER, [data[len("back_to_reminder_"):]]
+    if data.startswith("task_"):
+        # task_<ключ>[_from_reminder_<id>] - доска в старых кнопках не указана
+        task_key, _, reminder_id = data[len("task_"):].partition("_from_reminder_")
+        return OP_TASK, [task_key, ""] + ([reminder_id] if reminder_id else [])
+    if data.startswith("take_"):
+        # take_<ключ>_reminder_<id>
+        task_key, _, reminder_id = data[len("take_"):].partition("_reminder_")
+        return OP_TAKE, [task_key, reminder_id]
+    if data.startswith("read_"):
+        return OP_READ, [data[len("read_"):]]
+    if data.startswith("delete_"):
+        return OP_DELETE, [data[len("delete_"):]]
+    return None
+
 def setup_handlers(bot):
     """
     Главная функция - настраивает все обработчики для бота
     Вызывается один раз при запуске из main.py
     """
     
+    def show_view(call, view):
+        """Показывает экран в сообщении с кнопкой (не редактирует, если он уже показан)"""
+        # После этого нажатия на сообщение уже нажали снова - показывать будет новый экран
+        if handler_executor.is_superseded():
+            handle_superseded(call)
+            return
+        views.show(bot, call.message.chat.id, call.message.message_id, view)
+    
+    def show_text(call, text, markup=None):
+        """Показывает в сообщении с кнопкой текст и кнопки, построенные заново"""
+        show_view(call, RenderedView(text, markup))
+    
+    def on_send_failure(result, handle_error):
+        """
+        Вызывает handle_error(ошибка), если сообщение не отправлено
+        
+        Через очередь отправки вызов бота возвращает Future, и ошибка приходит
+        позже из потока отправки; обычный бот выбрасывает ее сразу
+        """
+        if not hasattr(result, 'add_done_callback'):
+            return
+        
+        def on_done(future):
+            if future.exception() is not None:
+                handle_error(future.exception())
+        result.add_done_callback(on_done)
+    
+    def handle_unknown_button(call):
+        """Кнопка не распознана или ее данные уже забыты (например после перезапуска)"""
+        if DEBUG_MODE:
+            print(f"⚠️ Неизвестная кнопка: {call.data}")
+        bot.answer_callback_query(call.id, "⚠️ Кнопка устарела, отправьте /start")
+    
+    def handle_superseded(call):
+        """Экран нажатия не показан: на сообщение уже нажали снова"""
+        if DEBUG_MODE:
+            print(f"⏭️ Экран для сообщения {call.message.message_id} уже не нужен")
+        # Без ответа Telegram показывает часики на кнопке до таймаута
+        bot.answer_callback_query(call.id)
+    
+    def handle_busy(call):
+        """Очередь обработчиков переполнена"""
+        if DEBUG_MODE:
+            print(f"⏳ Очередь обработчиков переполнена, нажатие {call.data} отклонено")
+        bot.answer_callback_query(call.id, "⏳ Бот занят, попробуйте через несколько секунд")
+    
+    # ============== МАРШРУТИЗАЦИЯ НАЖАТИЙ ==============
+    # Одна регистрация в telebot: данные кнопки разбираются один раз,
+    # обработчик выбирается по коду операции и выполняется в очереди сообщения
+    router = CallbackRouter(
+        callback_codec,
+        legacy_parser=parse_legacy_callback,
+        on_unknown=handle_unknown_button
+    )
+    handler_executor.start()
+    
+    @bot.callback_query_handler(func=lambda call: True)
+    def enqueue_callback(call):
+        """
+        Ставит нажатие в очередь сообщения с кнопкой
+        Нажатие, которое только показывает экран, отменяет еще не показанные экраны
+        """
+        decoded = router.decode(call.data)
+        accepted = handler_executor.submit(
+            (call.message.chat.id, call.message.message_id),
+            router.dispatch, call, decoded,
+            supersede=decoded is not None and decoded[0] in RENDER_OPS,
+            on_drop=lambda: handle_superseded(call)
+        )
+        if not accepted:
+            handle_busy(call)
+    
     # ============== КОМАНДА /START ==============
     @bot.message_handler(commands=['start'])
+    def enqueue_start(message):
+        """Ставит команду /start в очередь чата"""
+        handler_executor.submit((message.chat.id,), start_message, message)
+    
     def start_message(message):
         """
         Обрабатывает команду /start
@@ -33,7 +175,7 @@ def setup_handlers(bot):
         for board_name in url.keys():
             board_button = types.InlineKeyboardButton(
                 text=board_name,  # Текст на кнопке
-                callback_data=board_name  # Данные для обработки нажатия
+                callback_data=callback_codec.encode(OP_BOARD, board_name)  # Данные для обработки нажатия
             )
             markup.add(board_button)
         
@@ -45,119 +187,89 @@ def setup_handlers(bot):
         )
 
     # ============== НАЖАТИЕ НА ДОСКУ ==============
-    @bot.callback_query_handler(func=lambda call: call.data in url.keys())
-    def handle_board_selection(call):
+    @router.route(OP_BOARD)
+    def handle_board_selection(call, board_name):
         """
         Обрабатывает нажатие на кнопку доски (например, ARM_QA)
-        Показывает колонки с количеством задач в каждой
+        """
+        if board_name not in url:
+            handle_unknown_button(call)
+            return
+        show_board_columns(call, board_name)
+
+    def show_board_columns(call, board_name):
+        """
+        Показывает колонки доски с количеством задач в каждой
         """
         if DEBUG_MODE:
-            print(f"📋 Выбрана доска: {call.data}")
+            print(f"📋 Выбрана доска: {board_name}")
         
         try:
-            # Получаем данные с API
-            response = get_desk_api()
-            if response.status_code != 200:
-                bot.edit_message_text(
-                    chat_id=call.message.chat.id,
-                    message_id=call.message.message_id,
-                    text="❌ Ошибка получения данных с сервера"
-                )
+            # Получаем данные доски из общего кэша
+            snapshot = get_board_data(board_name)
+            if not snapshot:
+                show_text(call, f"❌ {get_board_error(board_name)}")
                 return
             
-            response_data = response.json()
-            markup = types.InlineKeyboardMarkup()
-            
-            # Создаем кнопку для каждой колонки
-            for column_data in response_data['columnsData']['columns']:
-                column_name = column_data['name']
-                task_count = int(column_data['statisticsFieldValue'])
-                
-                # Текст кнопки: "Название колонки X задач(а)"
-                button_text = f"{column_name} ({task_count} задач)"
-                
-                column_button = types.InlineKeyboardButton(
-                    text=button_text,
-                    callback_data=f"column_{column_name}"
-                )
-                markup.add(column_button)
+            # Экран строится один раз на версию снимка доски
+            view = views.render(
+                (board_name, snapshot.version, 'columns', 0),
+                lambda: render_board_columns(board_name, snapshot)
+            )
             
             # Обновляем сообщение с новыми кнопками
-            bot.edit_message_text(
-                chat_id=call.message.chat.id,
-                message_id=call.message.message_id,
-                text="📂 Выберите колонку для просмотра задач:",
-                reply_markup=markup
-            )
+            show_view(call, view)
             
         except Exception as e:
             if DEBUG_MODE:
                 print(f"❌ Ошибка при получении колонок: {e}")
-            bot.edit_message_text(
-                chat_id=call.message.chat.id,
-                message_id=call.message.message_id,
-                text="❌ Произошла ошибка при загрузке данных"
-            )
+            show_text(call, "❌ Произошла ошибка при загрузке данных")
 
     # ============== НАЖАТИЕ НА КОЛОНКУ ==============
-    @bot.callback_query_handler(func=lambda call: call.data.startswith("column_"))
-    def handle_column_selection(call):
+    @router.route(OP_COLUMN)
+    def handle_column_selection(call, board_name, column_name, page=None):
         """
-        Обрабатывает нажатие на кнопку колонки
-        Показывает список всех задач из выбранной колонки
+        Обрабатывает нажатие на кнопку колонки и кнопки страниц
+        Показывает страницу списка задач выбранной колонки
         """
-        # Извлекаем название колонки из данных кнопки
-        column_name = call.data.replace("column_", "")
-        
         if DEBUG_MODE:
-            print(f"📂 Выбрана колонка: {column_name}")
+            print(f"📂 Выбрана колонка: {column_name} ({board_name}), страница {page or 0}")
         
         try:
-            # Получаем задачи из выбранной колонки
-            tasks_text = get_column_count_task(selected_column=column_name)
-            
-            # Создаем кнопку "Назад"
-            markup = types.InlineKeyboardMarkup()
-            back_button = types.InlineKeyboardButton(
-                text="⬅️ Назад к колонкам",
-                callback_data="back_to_columns"
-            )
-            markup.add(back_button)
+            # Листание страниц показывает уже загруженный снимок - без запроса к Jira
+            snapshot = peek_board_data(board_name) if page is not None else None
+            if not snapshot:
+                snapshot = get_board_data(board_name)
+            if not snapshot:
+                show_text(call, f"❌ {get_board_error(board_name)}")
+                return
             
-            # Показываем список задач
-            bot.edit_message_text(
-                chat_id=call.message.chat.id,
-                message_id=call.message.message_id,
-                text=tasks_text,
-                reply_markup=markup
+            # Показываем страницу задач (экран строится один раз на версию снимка и страницу)
+            page = int(page or 0)
+            view = views.render(
+                (board_name, snapshot.version, 'column', column_name, page),
+                lambda: render_column_tasks(board_name, column_name, snapshot, page)
             )
+            show_view(call, view)
             
         except Exception as e:
             if DEBUG_MODE:
                 print(f"❌ Ошибка при получении задач: {e}")
-            bot.edit_message_text(
-                chat_id=call.message.chat.id,
-                message_id=call.message.message_id,
-                text="❌ Ошибка при загрузке задач"
-            )
+            show_text(call, "❌ Ошибка при загрузке задач")
 
     # ============== ПЕРЕХОД В JIRA ИЗ УВЕДОМЛЕНИЙ ==============
-    @bot.callback_query_handler(func=lambda call: call.data.startswith("task_"))
-    def handle_task_view(call):
+    @router.route(OP_TASK)
+    def handle_task_view(call, task_key, board_name="", reminder_id=None):
         """
-        Обрабатывает клик по задаче:
-        - Из уведомлений: НЕ ИСПОЛЬЗУЕТСЯ (убрали кнопки задач)
-        - Из колонок: показывает детали
+        Обрабатывает клик по задаче из уведомления или напоминания:
+        показывает детали задачи и кнопку возврата
         """
-        # Это обычная задача из колонки - показываем детали как раньше
-        task_key = call.data.replace("task_", "")
-        
         if DEBUG_MODE:
             print(f"🔍 Просмотр деталей задачи: {task_key}")
         
         try:
             # Получаем детали задачи из API
-            task_details = get_task_details_from_api(task_key)
+            task_details, board_name = get_task_details_from_api(task_key, board_name)
             
             if task_details:
                 details_text = f"🔹 {task_details['key']} — {task_details['summary']}\n\n"
@@ -172,20 +284,21 @@ def setup_handlers(bot):
             else:
                 details_text = f"❌ Не удалось загрузить данные задачи {task_key}"
             
-            # Кнопка возврата к колонкам
+            # Кнопка возврата к напоминанию или к колонкам
             markup = types.InlineKeyboardMarkup()
-            back_button = types.InlineKeyboardButton(
-                text="⬅️ Назад к колонкам", 
-                callback_data="back_to_columns"
-            )
+            if reminder_id:
+                back_button = types.InlineKeyboardButton(
+                    text="⬅️ Назад к напоминанию",
+                    callback_data=callback_codec.encode(OP_BACK_TO_REMINDER, reminder_id)
+                )
+            else:
+                back_button = types.InlineKeyboardButton(
+                    text="⬅️ Назад к колонкам", 
+                    callback_data=callback_codec.encode(OP_BACK_TO_COLUMNS, board_name)
+                )
             markup.add(back_button)
             
-            bot.edit_message_text(
-                chat_id=call.message.chat.id,
-                message_id=call.message.message_id,
-                text=details_text,
-                reply_markup=markup
-            )
+            show_text(call, details_text, markup)
             
         except Exception as e:
             if DEBUG_MODE:
@@ -193,20 +306,18 @@ def setup_handlers(bot):
             bot.answer_callback_query(call.id, "❌ Ошибка загрузки задачи")
 
     # ============== ВОЗВРАТ К НАПОМИНАНИЮ ==============
-    @bot.callback_query_handler(func=lambda call: call.data.startswith("back_to_reminder_"))
-    def handle_back_to_reminder(call):
+    @router.route(OP_BACK_TO_REMINDER)
+    def handle_back_to_reminder(call, reminder_id):
         """
         Возвращает к исходному сообщению с напоминанием
         """
-        reminder_id = call.data.replace("back_to_reminder_", "")
-        
         if DEBUG_MODE:
             print(f"⬅️ Возврат к напоминанию {reminder_id}")
         
         try:
             # Безопасный импорт функций из monitor.py
             try:
-                from monitor import active_reminders, reminder_readers, find_monitored_column
+                from monitor import reminders, find_monitored_column, get_still_waiting_tasks
             except ImportError as e:
                 if DEBUG_MODE:
                     print(f"❌ Ошибка импорта из monitor.py: {e}")
@@ -214,47 +325,40 @@ def setup_handlers(bot):
                 return
             
             # Проверяем что напоминание еще активно
-            if reminder_id not in active_reminders or not active_reminders[reminder_id]['active']:
+            reminder = reminders.get_active(reminder_id)
+            if not reminder:
                 bot.answer_callback_query(call.id, "❌ Напоминание больше не активно")
                 return
             
             # Получаем актуальные данные задач
-            response = get_desk_api()
-            if not response or response.status_code != 200:
-                bot.answer_callback_query(call.id, "❌ Ошибка получения данных")
+            current_data = get_board_data(reminder['board'])
+            if not current_data:
+                bot.answer_callback_query(call.id, f"❌ {get_board_error(reminder['board'])}")
                 return
             
-            current_data = response.json()
-            target_column = find_monitored_column(current_data)
+            target_column = find_monitored_column(current_data, reminder['column'])
             
             if not target_column:
                 bot.answer_callback_query(call.id, "❌ Колонка не найдена")
                 return
             
             # Получаем задачи которые всё ещё в колонке
-            still_waiting_tasks = []
-            status_ids = target_column['statusIds']
-            
-            for issue in current_data['issuesData']['issues']:
-                if (issue['statusId'] in status_ids and 
-                    issue['key'] in active_reminders[reminder_id]['task_keys']):
-                    still_waiting_tasks.append({
-                        'key': issue['key'],
-                        'summary': issue['summary']
-                    })
+            still_waiting_tasks = get_still_waiting_tasks(
+                current_data, reminder['task_keys'], reminder['column']
+            )
             
             # Формируем сообщение напоминания заново
-            elapsed_minutes = int((time.time() - active_reminders[reminder_id]['start_time']) / 60)
+            elapsed_minutes = int((time.time() - reminder['start_time']) / 60)
             
             message = f"⚠️ Возьмите задачу в работу!\n\n"
-            message += f"Задачи ожидают тестирования уже {elapsed_minutes} минут:\n"
+            message += f"Задачи в колонке '{reminder['column']}' уже {elapsed_minutes} минут:\n"
             
             for task in still_waiting_tasks:
                 message += f"📋 {task['key']} - {task['summary']}\n"
             
             # Добавляем информацию о прочитавших если есть
-            if reminder_id in reminder_readers and reminder_readers[reminder_id]:
-                readers_list = ", ".join(reminder_readers[reminder_id])
+            if reminder['readers']:
+                readers_list = ", ".join(reminder['readers'].values())
                 message += f"\n✅ Прочитали: {readers_list}"
             
             # Создаем кнопки
@@ -264,28 +368,23 @@ def setup_handlers(bot):
                 task_text = task['summary'][:40] + "..." if len(task['summary']) > 40 else task['summary']
                 task_button = types.InlineKeyboardButton(
                     text=f"📋 {task['key']} - {task_text}",
-                    callback_data=f"task_{task['key']}_from_reminder_{reminder_id}"
+                    callback_data=callback_codec.encode(OP_TASK, task['key'], reminder['board'], reminder_id)
                 )
                 markup.add(task_button)
             
             # Кнопки "Прочитано" и "Удалить"
             read_button = types.InlineKeyboardButton(
                 text="✅ Прочитано",
-                callback_data=f"read_{reminder_id}"
+                callback_data=callback_codec.encode(OP_READ, reminder_id)
             )
             delete_button = types.InlineKeyboardButton(
                 text="🗑️ Удалить",
-                callback_data=f"delete_{reminder_id}"
+                callback_data=callback_codec.encode(OP_DELETE, reminder_id)
             )
             markup.add(read_button, delete_button)
             
             # Обновляем сообщение
-            bot.edit_message_text(
-                chat_id=call.message.chat.id,
-                message_id=call.message.message_id,
-                text=message,
-                reply_markup=markup
-            )
+            show_text(call, message, markup)
             
         except Exception as e:
             if DEBUG_MODE:
@@ -293,27 +392,22 @@ def setup_handlers(bot):
             bot.answer_callback_query(call.id, "❌ Ошибка возврата")
 
     # ============== КНОПКА "НАЗАД" ==============
-    @bot.callback_query_handler(func=lambda call: call.data == "back_to_columns")
-    def handle_back_button(call):
+    @router.route(OP_BACK_TO_COLUMNS)
+    def handle_back_button(call, board_name):
         """
         Обрабатывает нажатие кнопки "Назад к колонкам"
-        Возвращает пользователя к списку колонок
+        Возвращает пользователя к списку колонок доски
         """
         if DEBUG_MODE:
-            print("⬅️ Возврат к списку колонок")
+            print(f"⬅️ Возврат к списку колонок {board_name}")
         
-        # Просто вызываем функцию показа колонок
-        handle_board_selection(call)
+        # Показываем колонки той же доски
+        show_board_columns(call, board_name)
 
     # ============== КНОПКА "ВЗЯЛ ЗАДАЧУ" ==============
-    @bot.callback_query_handler(func=lambda call: call.data.startswith("take_"))
-    def handle_take_task(call):
+    @router.route(OP_TAKE)
+    def handle_take_task(call, task_key, reminder_id):
         """Обрабатывает нажатие кнопки 'Взял [номер задачи]' в напоминании"""
-        # Парсим: take_UGC-8006_reminder_abc123
-        callback_parts = call.data.replace("take_", "").split("_reminder_")
-        task_key = callback_parts[0]
-        reminder_id = callback_parts[1]
-        
         if DEBUG_MODE:
             print(f"💼 Пользователь взял задачу {task_key} из напоминания {reminder_id}")
         
@@ -324,7 +418,7 @@ def setup_handlers(bot):
             
             # Безопасный импорт функций из monitor.py
             try:
-                from monitor import active_reminders, reminder_readers, find_monitored_column, stop_reminder
+                from monitor import reminders, find_monitored_column, get_still_waiting_tasks, stop_reminder, mark_task_taken
             except ImportError as e:
                 if DEBUG_MODE:
                     print(f"❌ Ошибка импорта из monitor.py: {e}")
@@ -332,44 +426,44 @@ def setup_handlers(bot):
                 return
             
             # Проверяем что напоминание еще активно
-            if reminder_id not in active_reminders or not active_reminders[reminder_id]['active']:
+            reminder = reminders.get_active(reminder_id)
+            if not reminder:
                 bot.answer_callback_query(call.id, "❌ Напоминание больше не активно")
                 return
             
-            # Инициализируем структуру для хранения взятых задач
-            if reminder_id not in reminder_readers:
-                reminder_readers[reminder_id] = {}
+            # Кто какие задачи взял (словарь: задача -> кто взял)
+            takers = reminder['takers']
             
             # Проверяем не взял ли кто-то уже эту задачу
-            if task_key in reminder_readers[reminder_id]:
-                existing_taker = reminder_readers[reminder_id][task_key]
+            if task_key in takers:
+                existing_taker = takers[task_key]
                 bot.answer_callback_query(call.id, f"⚠️ Задачу уже взял {existing_taker}")
                 return
             
             # Отмечаем что пользователь взял эту задачу
-            reminder_readers[reminder_id][task_key] = f"{user_name} ({current_time})"
+            mark_task_taken(reminder_id, task_key, f"{user_name} ({current_time})")
             
             # Формируем ссылку на задачу в Jira и отправляем
             jira_url = f"https://jira.zxz.su/browse/{task_key}"
-            bot.send_message(
+            sent = bot.send_message(
                 call.message.chat.id,
                 f"🔗 **{task_key}** - открыть в Jira:\n{jira_url}",
                 parse_mode='Markdown',
                 disable_web_page_preview=False
             )
+            on_send_failure(sent, lambda e: print(f"❌ Ссылка на {task_key} не отправлена: {e}"))
             
             # Показываем подтверждение
             bot.answer_callback_query(call.id, f"💼 Взяли задачу {task_key}!")
             
             # Получаем актуальные данные задач для обновления сообщения
-            response = get_desk_api()
-            if not response or response.status_code != 200:
+            current_data = get_board_data(reminder['board'])
+            if not current_data:
                 if DEBUG_MODE:
-                    print(f"❌ Ошибка получения данных для обновления напоминания {reminder_id}")
+                    print(f"❌ Ошибка получения данных для обновления напоминания {reminder_id}: {get_board_error(reminder['board'])}")
                 return
             
-            current_data = response.json()
-            target_column = find_monitored_column(current_data)
+            target_column = find_monitored_column(current_data, reminder['column'])
             
             if not target_column:
                 if DEBUG_MODE:
@@ -377,20 +471,13 @@ def setup_handlers(bot):
                 return
             
             # Получаем задачи которые всё ещё в колонке
-            still_waiting_tasks = []
-            status_ids = target_column['statusIds']
-            
-            for issue in current_data['issuesData']['issues']:
-                if (issue['statusId'] in status_ids and 
-                    issue['key'] in active_reminders[reminder_id]['task_keys']):
-                    still_waiting_tasks.append({
-                        'key': issue['key'],
-                        'summary': issue['summary']
-                    })
+            still_waiting_tasks = get_still_waiting_tasks(
+                current_data, reminder['task_keys'], reminder['column']
+            )
             
             # Проверяем все ли задачи взяты
             all_tasks_taken = all(
-                task['key'] in reminder_readers[reminder_id] 
+                task['key'] in takers
                 for task in still_waiting_tasks
             )
             
@@ -401,47 +488,42 @@ def setup_handlers(bot):
                     print(f"🛑 Все задачи взяты - напоминание {reminder_id} остановлено")
             
             # Формируем обновленное сообщение
-            elapsed_minutes = int((time.time() - active_reminders[reminder_id]['start_time']) / 60)
+            elapsed_minutes = int((time.time() - reminder['start_time']) / 60)
             
             message = f"⚠️ Возьмите задачу в работу!\n\n"
-            message += f"Задачи ожидают тестирования уже {elapsed_minutes} минут:\n"
+            message += f"Задачи в колонке '{reminder['column']}' уже {elapsed_minutes} минут:\n"
             
             for task in still_waiting_tasks:
                 message += f"📋 {task['key']} - {task['summary']}\n"
             
             # Добавляем информацию о взятых задачах
-            if reminder_readers[reminder_id]:
+            if takers:
                 message += f"\n💼 Взяли в работу:\n"
-                for taken_task, taker in reminder_readers[reminder_id].items():
+                for taken_task, taker in takers.items():
                     message += f"- {taken_task}: {taker}\n"
             
             # Создаем кнопки только для НЕ взятых задач
             markup = types.InlineKeyboardMarkup()
             
             for task in still_waiting_tasks:
-                if task['key'] not in reminder_readers[reminder_id]:
+                if task['key'] not in takers:
                     # Задача еще не взята - показываем кнопку
                     task_text = task['summary'][:20] + "..." if len(task['summary']) > 20 else task['summary']
                     take_button = types.InlineKeyboardButton(
                         text=f"💼 Взять {task['key']}",
-                        callback_data=f"take_{task['key']}_reminder_{reminder_id}"
+                        callback_data=callback_codec.encode(OP_TAKE, task['key'], reminder_id)
                     )
                     markup.add(take_button)
             
             # Кнопка "Удалить" остается всегда
             delete_button = types.InlineKeyboardButton(
                 text="🗑️ Удалить",
-                callback_data=f"delete_{reminder_id}"
+                callback_data=callback_codec.encode(OP_DELETE, reminder_id)
             )
             markup.add(delete_button)
             
             # Обновляем сообщение
-            bot.edit_message_text(
-                chat_id=call.message.chat.id,
-                message_id=call.message.message_id,
-                text=message,
-                reply_markup=markup
-            )
+            show_text(call, message, markup)
             
             if DEBUG_MODE:
                 print(f"✅ Напоминание {reminder_id} обновлено - {user_name} взял {task_key}")
@@ -451,12 +533,31 @@ def setup_handlers(bot):
                 print(f"❌ Ошибка при обработке взятия задачи {task_key}: {e}")
             bot.answer_callback_query(call.id, "❌ Ошибка при обработке")
 
+    # ============== КНОПКА "ПРОЧИТАНО" ==============
+    @router.route(OP_READ)
+    def handle_read_reminder(call, reminder_id):
+        """Обрабатывает нажатие кнопки 'Прочитано': отмечает пользователя и обновляет напоминание"""
+        if DEBUG_MODE:
+            print(f"📖 Пользователь прочитал напоминание {reminder_id}")
+        
+        try:
+            from monitor import add_reader_to_reminder
+        except ImportError as e:
+            if DEBUG_MODE:
+                print(f"❌ Ошибка импорта из monitor.py: {e}")
+            bot.answer_callback_query(call.id, "❌ Ошибка системы")
+            return
+        
+        user_name = call.from_user.first_name or "Пользователь"
+        add_reader_to_reminder(reminder_id, call.from_user.id, user_name, datetime.now().strftime("%H:%M"))
+        
+        # Показываем напоминание заново - уже со списком прочитавших
+        handle_back_to_reminder(call, reminder_id)
+
     # ============== КНОПКА "УДАЛИТЬ УВЕДОМЛЕНИЕ" ==============
-    @bot.callback_query_handler(func=lambda call: call.data.startswith("delete_"))
-    def handle_delete_reminder(call):
+    @router.route(OP_DELETE)
+    def handle_delete_reminder(call, reminder_id):
         """Обрабатывает нажатие кнопки 'Удалить' в напоминании"""
-        reminder_id = call.data.replace("delete_", "")
-        
         if DEBUG_MODE:
             print(f"🗑️ Пользователь нажал 'Удалить' для напоминания {reminder_id}")
         
@@ -466,7 +567,7 @@ def setup_handlers(bot):
         try:
             # Безопасный импорт функций из monitor.py
             try:
-                from monitor import stop_reminder, active_reminders
+                from monitor import stop_reminder
             except ImportError as e:
                 if DEBUG_MODE:
                     print(f"❌ Ошибка импорта из monitor.py: {e}")
@@ -478,61 +579,128 @@ def setup_handlers(bot):
             # Получаем информацию о пользователе для логирования
             user_name = call.from_user.first_name or "Пользователь"
             
+            # Сообщение больше не показывает экран: если удалить не выйдет,
+            # экран с ошибкой не будет пропущен как уже показанный
+            views.forget(call.message.chat.id, call.message.message_id)
+            
             # Удаляем сообщение полностью
-            bot.delete_message(
+            deleted = bot.delete_message(
                 chat_id=call.message.chat.id,
                 message_id=call.message.message_id
             )
+            on_send_failure(deleted, lambda e: delete_failed(call, reminder_id, e))
             
             if DEBUG_MODE:
                 print(f"🗑️ Напоминание {reminder_id} удалено пользователем {user_name}")
                 
+        except Exception as e:
+            delete_failed(call, reminder_id, e)
+    
+    def delete_failed(call, reminder_id, error):
+        """Сообщение напоминания не удалено - показываем в нем ошибку"""
+        if DEBUG_MODE:
+            print(f"❌ Ошибка при удалении напоминания {reminder_id}: {error}")
+        try:
+            show_text(call, "❌ Ошибка при удалении уведомления")
         except Exception as e:
             if DEBUG_MODE:
-                print(f"❌ Ошибка при удалении напоминания {reminder_id}: {e}")
-            # Если не получилось удалить - показываем ошибку
-            try:
-                bot.edit_message_text(
-                    chat_id=call.message.chat.id,
-                    message_id=call.message.message_id,
-                    text="❌ Ошибка при удалении уведомления"
-                )
-            except:
-                pass
+                print(f"❌ Не удалось показать ошибку удаления: {e}")
+
+    # ============== ЭКРАНЫ ДОСОК И КОЛОНОК ==============
+    def render_board_columns(board_name, snapshot):
+        """
+        Экран доски: кнопка для каждой колонки с количеством задач
+        
+        Returns:
+            tuple: (текст, кнопки)
+        """
+        markup = types.InlineKeyboardMarkup()
+        
+        # Создаем кнопку для каждой колонки
+        for column_data in snapshot.columns:
+            column_name = column_data['name']
+            task_count = int(column_data['statisticsFieldValue'])
+            
+            # Текст кнопки: "Название колонки X задач(а)"
+            button_text = f"{column_name} ({task_count} задач)"
+            
+            column_button = types.InlineKeyboardButton(
+                text=button_text,
+                callback_data=callback_codec.encode(OP_COLUMN, board_name, column_name)
+            )
+            markup.add(column_button)
+        
+        return "📂 Выберите колонку для просмотра задач:", markup
+    
+    def render_column_tasks(board_name, column_name, snapshot, page=0):
+        """
+        Экран колонки: страница списка задач, кнопки страниц и кнопка "Назад"
+        
+        Returns:
+            tuple: (текст, кнопки)
+        """
+        text, page, pages = format_column_page(snapshot, column_name, page)
+        markup = types.InlineKeyboardMarkup()
+        
+        # Кнопки соседних страниц
+        page_buttons = []
+        if page > 0:
+            page_buttons.append(types.InlineKeyboardButton(
+                text="◀️ Предыдущая",
+                callback_data=callback_codec.encode(OP_COLUMN, board_name, column_name, page - 1)
+            ))
+        if page < pages - 1:
+            page_buttons.append(types.InlineKeyboardButton(
+                text="Следующая ▶️",
+                callback_data=callback_codec.encode(OP_COLUMN, board_name, column_name, page + 1)
+            ))
+        if page_buttons:
+            markup.row(*page_buttons)
+        
+        # Создаем кнопку "Назад"
+        back_button = types.InlineKeyboardButton(
+            text="⬅️ Назад к колонкам",
+            callback_data=callback_codec.encode(OP_BACK_TO_COLUMNS, board_name)
+        )
+        markup.add(back_button)
+        
+        return text, markup
 
     # ============== ВСПОМОГАТЕЛЬНАЯ ФУНКЦИЯ ==============
-    def get_task_details_from_api(task_key):
+    def get_task_details_from_api(task_key, board_name=""):
         """
-        Получает детали задачи из API Jira
+        Получает детали задачи из снимков досок
+        
+        Сначала смотрит снимки, уже лежащие в общем кэше, и только если задачи
+        там нет - загружает доску (не чаще BOARD_CACHE_TTL)
         
         Args:
             task_key: ключ задачи (например UGC-7913)
+            board_name: доска задачи из данных кнопки (пусто у старых кнопок - ищем на всех досках)
             
         Returns:
-            dict: данные задачи или None если не найдена
+            tuple: (данные задачи или None если не найдена, доска задачи)
         """
         try:
-            # Получаем данные из API
-            response = get_desk_api()
-            if response and response.status_code == 200:
-                api_data = response.json()
-                
-                # Ищем задачу среди всех задач
-                for issue in api_data['issuesData']['issues']:
-                    if issue['key'] == task_key:
+            boards = [board_name] if board_name in url else list(url)
+            for load in (peek_board_data, get_board_data):
+                for name in boards:
+                    snapshot = load(name)
+                    issue = snapshot.issue(task_key) if snapshot else None
+                    if issue:
                         return {
                             'key': issue['key'],
                             'summary': issue['summary'],
                             'assignee': issue.get('assigneeName', 'не назначен'),
                             'description': issue.get('description', 'Описание отсутствует')
-                        }
+                        }, name
             
-            return None
+            return None, board_name if board_name in url else DEFAULT_BOARD
             
         except Exception as e:
             if DEBUG_MODE:
                 print(f"❌ Ошибка получения деталей задачи {task_key}: {e}")
-            return None
+            return None, DEFAULT_BOARD
 
     if DEBUG_MODE:
         print("✅ Обработчики команд настроены")
\ No newline at end of file
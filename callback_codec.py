@@ -0,0 +1,183 @@
+# ==============================================
+# ДАННЫЕ КНОПОК И МАРШРУТИЗАЦИЯ НАЖАТИЙ
+# ==============================================
+# Telegram ограничивает callback_data 64 байтами, а кириллица занимает
+# по 2 байта на символ. Данные кнопки кодируются так:
+#     <код операции>|<поле>|<поле>...
+# Короткие ASCII-поля (ключи задач, id напоминаний, номера страниц)
+# хранятся как есть, остальные (названия колонок) заменяются токеном
+# ~XXXXXXXX - 8 символов base64 от хэша значения. Значения токенов хранятся
+# в ограниченной таблице на сервере. Токен зависит только от значения,
+# поэтому кнопки, построенные до перезапуска, снова работают, как только
+# то же значение будет закодировано еще раз.
+#
+# Нажатие разбирается один раз и передается обработчику по коду
+# операции (поиск в словаре) вместо перебора цепочки startswith
+
+import re
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+
+# Коды операций (один байт)
+OP_BOARD = 'b'              # доска: (доска)
+OP_COLUMN = 'c'             # колонка: (доска, колонка, страница)
+OP_BACK_TO_COLUMNS = 'k'    # назад к колонкам: (доска)
+OP_TASK = 't'               # задача: (ключ, доска[, id напоминания])
+OP_BACK_TO_REMINDER = 'r'   # назад к напоминанию: (id напоминания)
+OP_TAKE = 'g'               # взять задачу: (ключ, id напоминания)
+OP_READ = 'v'               # прочитано: (id напоминания)
+OP_DELETE = 'd'             # удалить напоминание: (id напоминания)
+
+# Операции, которые только показывают экран: более новое нажатие
+# на том же сообщении отменяет еще не показанный экран
+RENDER_OPS = frozenset((OP_BOARD, OP_COLUMN, OP_BACK_TO_COLUMNS, OP_TASK, OP_BACK_TO_REMINDER))
+
+SEPARATOR = '|'
+TOKEN_PREFIX = '~'
+# Самые длинные данные кнопки, которые принимает Telegram (байты)
+MAX_CALLBACK_BYTES = 64
+
+# Поля, которые не нужно заменять токеном
+_RAW_FIELD = re.compile(r'[A-Za-z0-9_.-]{0,16}')
+
+
+class CallbackCodec:
+    """
+    Кодирование данных кнопок с таблицей токенов
+
+    Использование:
+        data = codec.encode(OP_COLUMN, "ARM_QA", "Ожидают тестирования", 0)
+        op, fields = codec.decode(data)   # ('c', ['ARM_QA', 'Ожидают тестирования', '0'])
+    """
+
+    def __init__(self, max_tokens=4096):
+        """
+        Args:
+            max_tokens: сколько значений токенов хранить (давно не нужные удаляются первыми)
+        """
+        self.max_tokens = max_tokens
+        self._lock = threading.Lock()
+        self._values = OrderedDict()
+
+    def token(self, value):
+        """Токен значения (запоминает значение в таблице)"""
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=6).digest()
+        token = TOKEN_PREFIX + base64.urlsafe_b64encode(digest).decode('ascii').rstrip('=')
+        with self._lock:
+            self._values[token] = value
+            self._values.move_to_end(token)
+            while len(self._values) > self.max_tokens:
+                self._values.popitem(last=False)
+        return token
+
+    def encode(self, op, *fields):
+        """
+        Данные кнопки для операции op
+
+        Raises:
+            ValueError: если данные не помещаются в MAX_CALLBACK_BYTES
+        """
+        parts = [op]
+        for field in fields:
+            field = str(field)
+            if _RAW_FIELD.fullmatch(field) and not field.startswith(TOKEN_PREFIX):
+                parts.append(field)
+            else:
+                parts.append(self.token(field))
+        data = SEPARATOR.join(parts)
+        if len(data.encode('utf-8')) > MAX_CALLBACK_BYTES:
+            raise ValueError(f"Данные кнопки длиннее {MAX_CALLBACK_BYTES} байт: {data}")
+        return data
+
+    def decode(self, data):
+        """
+        Разбирает данные кнопки
+
+        Returns:
+            tuple: (код операции, список полей) или None, если данные не в этом
+                   формате или токен уже неизвестен (кнопка устарела)
+        """
+        if len(data) < 2 or data[1] != SEPARATOR:
+            return None
+        parts = data.split(SEPARATOR)
+        fields = parts[1:]
+        # Большинство кнопок (задачи, напоминания) без токенов - без блокировки
+        if TOKEN_PREFIX not in data:
+            return parts[0], fields
+        with self._lock:
+            for index, field in enumerate(fields):
+                if field.startswith(TOKEN_PREFIX):
+                    value = self._values.get(field)
+                    if value is None:
+                        return None
+                    fields[index] = value
+        return parts[0], fields
+
+
+class CallbackRouter:
+    """
+    Передает нажатие кнопки обработчику по коду операции
+
+    Использование:
+        router = CallbackRouter(codec)
+
+        @router.route(OP_TAKE)
+        def handle_take(call, task_key, reminder_id): ...
+
+        bot.callback_query_handler(func=lambda call: True)(router.dispatch)
+    """
+
+    def __init__(self, codec, legacy_parser=None, on_unknown=None):
+        """
+        Args:
+            codec: CallbackCodec
+            legacy_parser: legacy_parser(data) -> (код операции, поля) или None
+                           для кнопок старого формата в уже отправленных сообщениях
+            on_unknown: on_unknown(call) для нераспознанных и устаревших кнопок
+        """
+        self._codec = codec
+        self._legacy_parser = legacy_parser
+        self._on_unknown = on_unknown
+        self._handlers = {}
+
+    def route(self, op):
+        """Декоратор: регистрирует обработчик handler(call, *поля) для кода операции"""
+        def decorator(handler):
+            self._handlers[op] = handler
+            return handler
+        return decorator
+
+    def decode(self, data):
+        """
+        Разбирает данные нажатия (новый формат или старый через legacy_parser)
+
+        Returns:
+            tuple: (код операции, поля) или None
+        """
+        decoded = self._codec.decode(data)
+        if decoded is None and self._legacy_parser is not None:
+            decoded = self._legacy_parser(data)
+        return decoded
+
+    def dispatch(self, call, decoded=None):
+        """
+        Вызывает обработчик нажатия
+
+        Args:
+            call: нажатие кнопки
+            decoded: уже разобранные данные (иначе разбираются здесь)
+        """
+        if decoded is None:
+            decoded = self.decode(call.data)
+        handler = self._handlers.get(decoded[0]) if decoded else None
+        if handler is None:
+            if self._on_unknown is not None:
+                self._on_unknown(call)
+            return None
+        return handler(call, *decoded[1])
+
+
+# Общий кодировщик кнопок для обработчиков и уведомлений мониторинга
+callback_codec = CallbackCodec()
@@ -0,0 +1,92 @@
+# ==============================================
+# АВТОМАТ ЗАЩИТЫ (CIRCUIT BREAKER) ДЛЯ ЗАПРОСОВ К JIRA
+# ==============================================
+# Если Jira подряд несколько раз не ответила или вернула 5xx,
+# следующие запросы сразу завершаются ошибкой, не дожидаясь таймаутов.
+# Через reset_timeout секунд пропускается один пробный запрос:
+# если он успешен - работа восстанавливается
+
+import time
+import threading
+
+CLOSED = "closed"        # Нормальная работа
+OPEN = "open"            # Jira недоступна - запросы не выполняются
+HALF_OPEN = "half_open"  # Пробный запрос после паузы
+
+
+class CircuitBreaker:
+    """
+    Считает подряд идущие сбои и временно блокирует запросы
+    """
+
+    def __init__(self, failure_threshold, reset_timeout, clock=time.monotonic):
+        """
+        Args:
+            failure_threshold: сколько сбоев подряд открывают автомат
+            reset_timeout: через сколько секунд пропустить пробный запрос
+            clock: источник времени (подменяется в тестах)
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_progress = False
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state
+
+    def allow(self):
+        """
+        Можно ли выполнять запрос сейчас
+
+        Returns:
+            bool: False если автомат открыт или пробный запрос уже выполняется
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+
+            if self._state == OPEN:
+                if self._clock() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = HALF_OPEN
+                self._trial_in_progress = False
+
+            # HALF_OPEN: пропускаем только один пробный запрос
+            if self._trial_in_progress:
+                return False
+            self._trial_in_progress = True
+            return True
+
+    def retry_after(self):
+        """Через сколько секунд автомат пропустит пробный запрос"""
+        with self._lock:
+            if self._state != OPEN:
+                return 0
+            return max(0.0, self.reset_timeout - (self._clock() - self._opened_at))
+
+    def record_success(self):
+        """Запрос выполнен - Jira доступна"""
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._trial_in_progress = False
+
+    def release(self):
+        """Запрос не дошел до Jira (например истек срок) - ни успех, ни сбой"""
+        with self._lock:
+            self._trial_in_progress = False
+
+    def record_failure(self):
+        """Запрос не выполнен из-за недоступности Jira"""
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = OPEN
+                self._opened_at = self._clock()
+            self._trial_in_progress = False
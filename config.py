@@ -43,34 +43,206 @@ BOT_TOKEN = os.getenv("BOT_TOKEN")
 # ID рабочего чата для уведомлений
 WORK_CHAT_ID = int(os.getenv("WORK_CHAT_ID"))
 
+# Ограничения частоты отправки (Telegram отвечает 429 при превышении)
+# Всего сообщений в секунду (у Telegram ~30, оставляем запас)
+TELEGRAM_GLOBAL_PER_SECOND = 25
+# Сообщений в секунду в один чат
+TELEGRAM_CHAT_PER_SECOND = 1
+# Сообщений в минуту в одну группу
+TELEGRAM_GROUP_PER_MINUTE = 20
+# Сколько сообщений может ждать отправки (при переполнении первыми выбрасываются сводки)
+TELEGRAM_SEND_QUEUE_SIZE = 1000
+# Сколько раз повторять сообщение после ответа 429
+TELEGRAM_SEND_RETRIES = 5
+
+# Обработка команд и кнопок: сколько обработчиков выполнять одновременно
+# (нажатия на одно сообщение и команды одного чата выполняются по очереди)
+HANDLER_WORKERS = 8
+# Сколько нажатий может ждать обработки (остальным отвечаем "Бот занят")
+HANDLER_QUEUE_SIZE = 500
+
 # ============== JIRA НАСТРОЙКИ ==============
 # Логин и пароль для Jira
 JIRA_LOGIN = os.getenv("JIRA_LOGIN")
 JIRA_PASSWORD = os.getenv("JIRA_PASSWORD")
 
+# Запросы к Jira
+# Таймаут одного HTTP-запроса (секунды)
+JIRA_REQUEST_TIMEOUT = 15
+# Общий срок на запрос со всеми повторами (секунды)
+JIRA_CALL_DEADLINE = 45
+# Сколько раз повторять запрос при 5xx/429/таймауте/обрыве соединения
+JIRA_MAX_RETRIES = 3
+# Пауза перед повтором: случайная в пределах BASE * 2^попытка, но не больше MAX (секунды)
+JIRA_BACKOFF_BASE = 1
+JIRA_BACKOFF_MAX = 10
+# Сколько неудачных запросов подряд означают, что Jira недоступна
+CIRCUIT_FAILURE_THRESHOLD = 5
+# Сколько секунд не обращаться к недоступной Jira до пробного запроса
+CIRCUIT_RESET_TIMEOUT = 60
+
+# Пул keep-alive соединений к Jira
+# Сколько разных хостов держать в пуле
+JIRA_POOL_CONNECTIONS = 4
+# Сколько одновременных соединений держать к одному хосту
+JIRA_POOL_SIZE = 10
+
+# Обновление куков при 401
+# Сколько секунд поток ждет вход в Jira, уже запущенный другим потоком
+REFRESH_WAIT_TIMEOUT = 120
+# Пауза после неудачного входа (секунды), удваивается при каждой следующей неудаче
+REFRESH_COOLDOWN_BASE = 30
+# Максимальная пауза между неудачными попытками входа (секунды)
+REFRESH_COOLDOWN_MAX = 600
+
+# Способы входа в Jira в порядке попыток:
+# "http" - быстрый вход без браузера, "selenium" - через headless Chrome
+AUTH_BACKENDS = ["http", "selenium"]
+# Таймаут одного запроса при HTTP-входе (секунды)
+HTTP_LOGIN_TIMEOUT = 10
+
+# Фоновое поддержание сессии Jira
+# Как часто проверять сессию (секунды)
+SESSION_CHECK_INTERVAL = 600
+# За сколько секунд до истечения куков обновлять их заранее
+SESSION_REFRESH_AHEAD = 1800
+# Обновлять куки старше этого возраста, даже если Jira не сообщила срок (секунды, None - не ограничивать)
+SESSION_MAX_AGE = None
+# Таймаут проверочного запроса сессии (секунды)
+SESSION_PROBE_TIMEOUT = 10
+
 # ============== МОНИТОРИНГ НАСТРОЙКИ ==============
 # Интервал проверки новых задач (в секундах)
 # 60 = каждую минуту, 300 = каждые 5 минут
 CHECK_INTERVAL = 300
 
+# Адаптивный интервал проверки (False - всегда CHECK_INTERVAL)
+# CHECK_INTERVAL используется как интервал в нерабочее время
+POLL_ADAPTIVE = True
+# Интервал сразу после изменений на доске (секунды)
+POLL_MIN_INTERVAL = 30
+# Сколько секунд после изменения опрашивать доску с POLL_MIN_INTERVAL
+POLL_RECENT_CHANGE_WINDOW = 600
+# Интервал в рабочие часы (секунды)
+POLL_WORKING_INTERVAL = 60
+# Рабочие часы (с, до) и дни недели (0 - понедельник); None - без рабочих часов
+POLL_WORKING_HOURS = (10, 19)
+POLL_WORKING_DAYS = (0, 1, 2, 3, 4)
+# Если доска не меняется, интервал умножается на POLL_BACKOFF_FACTOR
+# каждые POLL_IDLE_POLLS_PER_STEP проверок; при ошибках Jira - после каждой ошибки
+POLL_BACKOFF_FACTOR = 2
+POLL_IDLE_POLLS_PER_STEP = 3
+# Предельный интервал при простое и ошибках (секунды)
+POLL_MAX_INTERVAL = 1800
+# Сколько проверок досок в минуту разрешено всего (None - без ограничения)
+JIRA_POLL_RPM_BUDGET = 30
+
+# Сколько секунд снимок доски в общем кэше считается свежим
+# Мониторинг обновляет кэш при каждой проверке, поэтому кнопки
+# обычно показывают данные без дополнительных запросов к Jira
+BOARD_CACHE_TTL = CHECK_INTERVAL
+
+# Разбор ответа доски:
+# "stream" - читать ответ кусками и хранить только используемые поля (меньше памяти)
+# "json" - response.json() целиком
+BOARD_PARSE_MODE = "stream"
+# Размер куска при потоковом чтении ответа (байты)
+BOARD_STREAM_CHUNK_SIZE = 64 * 1024
+
+# Синхронизация доски:
+# "full" - каждая проверка загружает доску целиком
+# "delta" - загружаются только задачи, измененные с прошлой проверки (поиск Jira),
+#           для досок с фильтром JIRA_JQL_<ДОСКА> в .env
+BOARD_SYNC_MODE = "full"
+# Как часто в режиме "delta" загружать доску целиком и сверять с ней дельту (секунды)
+BOARD_FULL_RESYNC_INTERVAL = 3600
+# Запас окна дельты на расхождение часов и задержку индексации Jira (секунды)
+BOARD_DELTA_OVERLAP = 120
+# Сколько задач запрашивать за одну страницу поиска
+BOARD_DELTA_PAGE_SIZE = 100
+# Поля задач, которые запрашиваются в дельте (то же, что хранит снимок доски)
+BOARD_DELTA_FIELDS = "summary,status,assignee,description"
 
 # Интервал напоминаний (секунды)
 REMINDER_INTERVAL = 300  # 5 минут
+# Напоминания, срок которых наступает в пределах одного тика, проверяются
+# вместе по одному снимку доски (секунды)
+REMINDER_TICK = 30
+# Сколько тиков напоминаний обрабатывать одновременно
+REMINDER_WORKERS = 2
+# Сколько напоминаний может быть активно одновременно (новые сверх этого не создаются)
+REMINDER_MAX_ACTIVE = 500
+# Сколько секунд хранить завершенное напоминание для кнопок уже отправленных сообщений
+REMINDER_FINISHED_TTL = 3600
+# Сколько завершенных напоминаний хранить самое большее (лишние удаляются, давно не нужные первыми)
+REMINDER_MAX_FINISHED = 1000
+# Сколько прочитавших хранить у одного напоминания (остальные не добавляются)
+REMINDER_MAX_READERS = 20
+# Как часто удалять завершенные напоминания старше REMINDER_FINISHED_TTL (секунды)
+REMINDER_COMPACT_INTERVAL = 600
+
+# Файл базы, в которой сохраняется состояние колонок и напоминаний между перезапусками
+STATE_DB_FILE = "bot_state.db"
+# Как часто записывать накопленные изменения состояния в базу (секунды)
+STATE_FLUSH_INTERVAL = 1
 
 # Название колонки которую отслеживаем
 MONITORED_COLUMN = "Ожидают тестирования"
 
+# Какие колонки отслеживать на каждой доске: {доска: [колонки]}
+# Доска - ключ из get_desk_api.url (ссылка берется из переменной окружения JIRA_API_<ДОСКА>)
+MONITORED_BOARDS = {
+    "ARM_QA": [MONITORED_COLUMN]
+}
+# Сколько досок проверять одновременно
+MONITOR_WORKERS = 8
+
+# ============== ВЕБХУКИ JIRA ==============
+# Принимать вебхуки Jira (jira:issue_created/updated/deleted) вместо частого опроса
+WEBHOOK_ENABLED = False
+# Адрес и путь встроенного HTTP-сервера вебхуков
+WEBHOOK_HOST = "0.0.0.0"
+WEBHOOK_PORT = 8085
+WEBHOOK_PATH = "/jira-webhook"
+# Секрет, который Jira передает в ?secret= или заголовке X-Webhook-Secret
+# (обязателен: без него бот не запустит прием вебхуков)
+WEBHOOK_SECRET = os.getenv("JIRA_WEBHOOK_SECRET")
+# Интервал сверки опросом доски при включенных вебхуках (секунды)
+WEBHOOK_RECONCILE_INTERVAL = 1800
+
 # ============== СООБЩЕНИЯ ==============
+# Самое длинное сообщение Telegram (символы)
+TELEGRAM_MESSAGE_LIMIT = 4096
+# Сколько задач показывать на одной странице списка задач колонки
+COLUMN_PAGE_SIZE = 20
+# Сколько готовых экранов досок и колонок хранить
+VIEW_CACHE_SIZE = 256
+# Для скольких сообщений помнить, какой экран они показывают
+VIEW_TRACKED_MESSAGES = 1024
+
 # Текст уведомления о новых задачах
 NOTIFICATION_TEMPLATE = """🔔 Новые задачи на тестирование!
 
+📋 Доска: {board}, колонка: {column}
 📈 Добавлено: {difference} задач(и)
 📊 Всего в колонке: {total_count}
 📅 Время: {timestamp}"""
 
+# Сколько секунд собирать изменения колонки в одно уведомление (0 - отправлять сразу)
+NOTIFICATION_COALESCE_WINDOW = 60
+# Сколько задач показывать кнопками в уведомлении (об остальных - одна строка)
+NOTIFICATION_MAX_TASKS = 10
+
 # Сообщение при запуске бота
 STARTUP_MESSAGE = "🤖 Бот запущен! Мониторинг активен."
 
+# ============== РЕЖИМ РАБОТЫ ==============
+# "threads" - TeleBot и фоновые потоки
+# "asyncio" - AsyncTeleBot, aiohttp и один цикл событий (нужен пакет aiohttp)
+RUNTIME = "threads"
+# Пул потоков для синхронного кода в режиме asyncio (обработка снимков досок, передача нажатий в очередь обработчиков)
+ASYNC_HANDLER_WORKERS = 16
+
 # ============== ОТЛАДКА ==============
 # Включить подробные логи в консоли (True/False)
 DEBUG_MODE = True
@@ -1,11 +1,10 @@
 # ==============================================
 # АВТОМАТИЧЕСКИЙ МЕНЕДЖЕР КУКОВ JIRA
 # ==============================================
-# Этот модуль автоматически обновляет куки при получении 401 ошибки
-# используя Selenium для входа в аккаунт
+# Этот модуль автоматически обновляет куки при получении 401 ошибки.
+# Вход выполняется через HTTP без браузера, Selenium остается запасным вариантом
 
 import time
-import json
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -13,7 +12,18 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import WebDriverException, NoSuchElementException
 from selenium.webdriver.chrome.options import Options
 from auth_config import JIRA_URL, JIRA_LOGIN, JIRA_PASSWORD
-from config import DEBUG_MODE
+from config import (
+    DEBUG_MODE,
+    REFRESH_WAIT_TIMEOUT,
+    REFRESH_COOLDOWN_BASE,
+    REFRESH_COOLDOWN_MAX,
+    AUTH_BACKENDS,
+    HTTP_LOGIN_TIMEOUT
+)
+from refresh_coordinator import RefreshCoordinator
+from auth_backends import AuthBackend, HttpAuthBackend, earliest_expiry
+from jira_session import set_session_cookies
+from cookie_store import cookie_store
 
 def setup_chrome_driver():
     """
@@ -178,29 +188,43 @@ def click_join(driver):
 
 def extract_cookies_from_driver(driver):
     """
-    Извлекает куки из браузера
+    Извлекает куки из браузера вместе со сроком действия сессии
+    
+    Returns:
+        tuple: (куки {имя: значение}, unix time истечения сессии или None)
     """
     try:
         cookies = {}
+        expiries = {}
         for cookie in driver.get_cookies():
             cookies[cookie['name']] = cookie['value']
+            expiries[cookie['name']] = cookie.get('expiry')
         
+        expires_at = earliest_expiry(expiries)
         if DEBUG_MODE:
             print(f"🍪 Извлечено {len(cookies)} куков")
-        return cookies
+            if expires_at:
+                print(f"⏳ Сессия действует до {time.strftime('%H:%M:%S %d.%m.%Y', time.localtime(expires_at))}")
+        return cookies, expires_at
     except Exception as e:
         if DEBUG_MODE:
             print(f"❌ Ошибка извлечения куков: {e}")
-        return {}
+        return {}, None
 
-def save_cookies_to_file(cookies):
+def save_cookies_to_file(cookies, expires_at=None):
     """
     Сохраняет куки в файл cookies.json
+    
+    Args:
+        cookies: словарь {имя: значение}
+        expires_at: когда истекает сессия (unix time) или None
     """
     try:
-        data = {"cookies": cookies}
-        with open('cookies.json', 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        # Атомарная запись + обновление кэша куков в памяти
+        cookie_store.save(cookies, expires_at)
+        
+        # Обновляем cookie jar общей HTTP-сессии на месте
+        set_session_cookies(cookies)
         
         if DEBUG_MODE:
             print("💾 Куки сохранены в cookies.json")
@@ -210,65 +234,127 @@ def save_cookies_to_file(cookies):
             print(f"❌ Ошибка сохранения куков: {e}")
         return False
 
+class SeleniumAuthBackend(AuthBackend):
+    """
+    Вход через headless Chrome - запасной вариант, если HTTP-вход не сработал
+    (например, если перед формой логина появилась дополнительная страница)
+    """
+    
+    name = "selenium"
+    
+    def login(self):
+        driver = setup_chrome_driver()
+        if not driver:
+            return {}, None
+        
+        try:
+            # Проверяем доступность страницы
+            if not examination_join(driver):
+                return {}, None
+            
+            # Выполняем авторизацию
+            if not continued_authorization(driver):
+                return {}, None
+            
+            # Входим в систему
+            if not click_join(driver):
+                return {}, None
+            
+            # Даем время для установки всех куков
+            time.sleep(3)
+            
+            # Извлекаем куки
+            return extract_cookies_from_driver(driver)
+        finally:
+            # Закрываем браузер
+            driver.quit()
+
+def create_auth_backends():
+    """
+    Создает способы входа в порядке AUTH_BACKENDS из config.py
+    """
+    available = {
+        HttpAuthBackend.name: lambda: HttpAuthBackend(JIRA_URL, JIRA_LOGIN, JIRA_PASSWORD, timeout=HTTP_LOGIN_TIMEOUT),
+        SeleniumAuthBackend.name: SeleniumAuthBackend
+    }
+    
+    backends = []
+    for name in AUTH_BACKENDS:
+        if name in available:
+            backends.append(available[name]())
+        else:
+            print(f"⚠️ Неизвестный способ входа '{name}' в AUTH_BACKENDS - пропускаю")
+    return backends
+
+auth_backends = create_auth_backends()
+
 def login_and_get_cookies():
     """
     Главная функция - выполняет вход и получает новые куки
+    Пробует способы входа по очереди, пока один из них не вернет куки
     """
     if DEBUG_MODE:
         print("🔄 Начинаю процесс получения новых куков...")
     
-    driver = setup_chrome_driver()
-    if not driver:
-        return False
-    
-    try:
-        # Проверяем доступность страницы
-        if not examination_join(driver):
-            return False
-        
-        # Выполняем авторизацию
-        if not continued_authorization(driver):
-            return False
-        
-        # Входим в систему
-        if not click_join(driver):
-            return False
+    for backend in auth_backends:
+        if DEBUG_MODE:
+            print(f"🔑 Вход через '{backend.name}'...")
         
-        # Даем время для установки всех куков
-        time.sleep(3)
+        try:
+            cookies, expires_at = backend.login()
+        except Exception as e:
+            if DEBUG_MODE:
+                print(f"❌ Ошибка входа через '{backend.name}': {e}")
+            continue
         
-        # Извлекаем куки
-        cookies = extract_cookies_from_driver(driver)
         if not cookies:
-            return False
+            if DEBUG_MODE:
+                print(f"⚠️ Вход через '{backend.name}' не удался")
+            continue
         
         # Сохраняем куки в файл
-        if not save_cookies_to_file(cookies):
+        if not save_cookies_to_file(cookies, expires_at):
             return False
         
         if DEBUG_MODE:
-            print("✅ Куки успешно обновлены!")
+            print(f"✅ Куки успешно обновлены через '{backend.name}'!")
         return True
-        
-    except Exception as e:
-        if DEBUG_MODE:
-            print(f"❌ Ошибка в процессе получения куков: {e}")
-        return False
-    finally:
-        # Закрываем браузер
-        driver.quit()
+    
+    return False
+
+# Один вход в Jira на все потоки, получившие 401 одновременно
+refresh_coordinator = RefreshCoordinator(
+    login_and_get_cookies,
+    wait_timeout=REFRESH_WAIT_TIMEOUT,
+    cooldown_base=REFRESH_COOLDOWN_BASE,
+    cooldown_max=REFRESH_COOLDOWN_MAX
+)
+
+def get_cookie_generation():
+    """
+    Возвращает номер поколения текущих куков
+    Запоминается перед запросом и передается в refresh_cookies_on_401
+    """
+    return refresh_coordinator.generation
 
-def refresh_cookies_on_401():
+def refresh_cookies_on_401(seen_generation=None):
     """
     Обновляет куки при получении 401 ошибки
+    
+    Если вход уже выполняется в другом потоке - ждет его результат
+    вместо запуска второго браузера
+    
+    Args:
+        seen_generation: поколение куков, с которыми был получен 401
     """
     if DEBUG_MODE:
         print("🔄 Получена 401 ошибка - обновляю куки...")
     
-    success = login_and_get_cookies()
+    success = refresh_coordinator.refresh(seen_generation)
     
-    if success and DEBUG_MODE:
-        print("✅ Куки обновлены, можно продолжать работу")
+    if success:
+        if DEBUG_MODE:
+            print("✅ Куки обновлены, можно продолжать работу")
     else:
         print("❌ Не удалось обновить куки")
     
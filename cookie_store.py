@@ -0,0 +1,157 @@
+# ==============================================
+# ХРАНИЛИЩЕ КУКОВ JIRA В ПАМЯТИ
+# ==============================================
+# Разобранные и проверенные куки из cookies.json держатся в памяти.
+# Файл перечитывается только если его записали заново:
+# через save() или внешним скриптом (например get_cookies.py),
+# что определяется по изменению mtime/inode/размера файла.
+# Запись атомарная: временный файл + rename, поэтому читатели
+# никогда не видят наполовину записанный файл
+
+import os
+import json
+import time
+import tempfile
+import threading
+
+COOKIES_FILE = 'cookies.json'
+
+# Хотя бы один из этих куков должен быть, иначе сессия точно не работает
+IMPORTANT_COOKIES = ['JSESSIONID', 'seraph.rememberme.cookie', 'atlassian.xsrf.token']
+
+def write_json_atomic(path, data):
+    """
+    Атомарно записывает JSON в файл: пишет во временный файл рядом и переименовывает
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'.{os.path.basename(path)}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+class CookieStore:
+    """
+    Кэш куков из файла, инвалидируемый по изменению файла
+    """
+
+    def __init__(self, path=COOKIES_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        # (mtime_ns, inode, size) файла, из которого взяты закэшированные куки
+        self._file_key = None
+        self._cookies = None
+        # Когда куки получены и когда истекают (unix time)
+        self._meta = {}
+
+    def _stat_key(self):
+        st = os.stat(self.path)
+        return (st.st_mtime_ns, st.st_ino, st.st_size)
+
+    def load(self):
+        """
+        Возвращает проверенные куки из памяти или перечитывает файл, если он изменился
+
+        Returns:
+            dict: куки {имя: значение} или None если файла нет или куки некорректны
+        """
+        try:
+            file_key = self._stat_key()
+        except FileNotFoundError:
+            print(f"❌ Файл {self.path} не найден")
+            with self._lock:
+                self._file_key = None
+                self._cookies = None
+                self._meta = {}
+            return None
+
+        with self._lock:
+            if file_key == self._file_key:
+                return self._cookies
+
+        cookies, meta = self._read_and_validate()
+
+        with self._lock:
+            self._file_key = file_key
+            self._cookies = cookies
+            self._meta = meta
+        return cookies
+
+    def save(self, cookies, expires_at=None):
+        """
+        Атомарно сохраняет куки в файл и сразу обновляет кэш в памяти
+
+        Args:
+            cookies: словарь {имя: значение}
+            expires_at: когда истекает сессия (unix time) или None если неизвестно
+        """
+        meta = {"issued_at": time.time(), "expires_at": expires_at}
+        with self._lock:
+            write_json_atomic(self.path, {"cookies": cookies, "meta": meta})
+            self._file_key = self._stat_key()
+            self._cookies = dict(cookies)
+            self._meta = meta
+
+    def metadata(self):
+        """
+        Возвращает сведения о текущих куках: issued_at и expires_at
+        Для файлов, записанных внешними скриптами, сведений может не быть
+        """
+        self.load()
+        with self._lock:
+            return dict(self._meta)
+
+    def invalidate(self):
+        """Сбрасывает кэш - следующий load() перечитает файл"""
+        with self._lock:
+            self._file_key = None
+            self._cookies = None
+            self._meta = {}
+
+    def _read_and_validate(self):
+        """
+        Returns:
+            tuple: (куки или None, сведения о куках)
+        """
+        try:
+            with open(self.path, "r", encoding='utf-8') as cookie_file:
+                content = cookie_file.read().strip()
+        except FileNotFoundError:
+            print(f"❌ Файл {self.path} не найден")
+            return None, {}
+
+        # Проверяем что файл не пустой
+        if not content:
+            print(f"⚠️ Файл {self.path} пустой")
+            return None, {}
+
+        try:
+            data = json.loads(content)
+        except json.JSONDecodeError as e:
+            print(f"❌ Ошибка парсинга {self.path}: {e}")
+            return None, {}
+
+        if not isinstance(data, dict) or not isinstance(data.get('cookies'), dict) or not data['cookies']:
+            print(f"⚠️ Некорректная структура {self.path}")
+            return None, {}
+
+        cookies = data['cookies']
+
+        # Проверяем что есть хотя бы один важный кук
+        if not any(cookie in cookies for cookie in IMPORTANT_COOKIES):
+            print("⚠️ Отсутствуют важные куки")
+            return None, {}
+
+        meta = data.get('meta')
+        return cookies, meta if isinstance(meta, dict) else {}
+
+# Общее хранилище куков для всего процесса
+cookie_store = CookieStore()
@@ -0,0 +1,139 @@
+# ==============================================
+# ИНКРЕМЕНТАЛЬНАЯ СИНХРОНИЗАЦИЯ ДОСКИ (DELTA SYNC)
+# ==============================================
+# Вместо полной загрузки доски на каждой проверке запрашиваются только
+# задачи, измененные с прошлой синхронизации (JQL updated >= -Nm), и
+# вливаются в текущий снимок. Объем ответа и время разбора зависят от
+# числа изменений, а не от размера доски.
+#
+# Поиск не сообщает об удаленных задачах и задачах, вышедших из фильтра
+# доски, поэтому раз в full_interval доска загружается целиком. Перед
+# полной загрузкой снимок доводится до текущего момента дельтой и
+# сравнивается с полным - расхождения считаются и выводятся в консоль
+
+import time
+
+
+def compare_snapshots(expected, actual):
+    """
+    Сравнивает состав колонок двух снимков доски
+
+    Returns:
+        list: [(колонка, задачи только в expected, задачи только в actual)]
+              для колонок, состав которых различается
+    """
+    mismatches = []
+    names = [column['name'] for column in actual.columns]
+    names += [column['name'] for column in expected.columns if actual.column(column['name']) is None]
+    for name in names:
+        expected_keys = set(expected.issue_keys_in(name))
+        actual_keys = set(actual.issue_keys_in(name))
+        if expected_keys != actual_keys:
+            mismatches.append((name, sorted(expected_keys - actual_keys), sorted(actual_keys - expected_keys)))
+    return mismatches
+
+
+class DeltaSync:
+    """
+    Загрузчик снимка доски для BoardCache: дельта по возможности, полная загрузка по расписанию
+
+    Использование:
+        sync = DeltaSync("ARM_QA", load_board_data, load_board_delta, cache.peek, 3600, 120)
+        cache = BoardCache("ARM_QA", sync, ttl)
+    """
+
+    def __init__(self, board_name, full_loader, delta_loader, current_snapshot,
+                 full_interval, overlap, clock=time.monotonic):
+        """
+        Args:
+            board_name: название доски
+            full_loader: full_loader(board_name) -> BoardSnapshot (полная загрузка)
+            delta_loader: delta_loader(board_name, since_seconds) -> (задачи в формате доски, байт получено)
+            current_snapshot: функция без аргументов -> текущий снимок (BoardCache.peek)
+            full_interval: как часто загружать доску целиком (секунды)
+            overlap: запас окна дельты на расхождение часов и задержку индексации Jira (секунды)
+            clock: источник времени
+        """
+        self.board_name = board_name
+        self.full_interval = full_interval
+        self.overlap = overlap
+        self._full_loader = full_loader
+        self._delta_loader = delta_loader
+        self._current_snapshot = current_snapshot
+        self._clock = clock
+        # Время начала последней успешной синхронизации и полной загрузки
+        self._synced_at = None
+        self._full_at = None
+
+        self.full_syncs = 0
+        self.delta_syncs = 0
+        self.last_mode = None
+        self.last_issues = 0
+        self.last_bytes = 0
+        self.last_duration = 0.0
+        self.checks = 0
+        self.mismatches = 0
+        self.last_mismatch = None
+
+    def __call__(self, board_name):
+        """Загружает снимок доски (сигнатура загрузчика BoardCache)"""
+        now = self._clock()
+        base = self._current_snapshot()
+
+        if base is None or self._synced_at is None or now - self._full_at >= self.full_interval:
+            snapshot = self._full_sync(base)
+            self._full_at = now
+        else:
+            issues, size = self._delta_loader(board_name, now - self._synced_at + self.overlap)
+            snapshot = base.with_issues(issues)
+            self.delta_syncs += 1
+            self.last_mode = "delta"
+            self.last_issues = len(issues)
+            self.last_bytes = size
+
+        # Окно следующей дельты отсчитывается от начала этой загрузки:
+        # изменения, сделанные во время запроса, попадут в следующую дельту
+        self._synced_at = now
+        self.last_duration = self._clock() - now
+        return snapshot
+
+    def _full_sync(self, base):
+        expected = None
+        if base is not None and self._synced_at is not None:
+            # Проверка корректности: дельта до текущего момента должна дать то же, что полная загрузка.
+            # Ошибка поиска не должна мешать полной загрузке - это и есть путь восстановления
+            try:
+                issues, _ = self._delta_loader(self.board_name, self._clock() - self._synced_at + self.overlap)
+                expected = base.with_issues(issues)
+            except Exception as e:
+                print(f"⚠️ Проверка дельты доски {self.board_name} пропущена: {e}")
+
+        snapshot = self._full_loader(self.board_name)
+        self.full_syncs += 1
+        self.last_mode = "full"
+        self.last_issues = len(snapshot.issue_by_key)
+        self.last_bytes = 0
+
+        if expected is not None:
+            self.checks += 1
+            mismatches = compare_snapshots(expected, snapshot)
+            if mismatches:
+                self.mismatches += 1
+                self.last_mismatch = mismatches
+                for column_name, missing, extra in mismatches:
+                    print(f"⚠️ Дельта доски {self.board_name} разошлась с полной загрузкой в колонке "
+                          f"'{column_name}': лишние {missing}, пропущены {extra}")
+        return snapshot
+
+    def status(self):
+        """Счетчики синхронизации для get_monitoring_status()"""
+        return {
+            'mode': self.last_mode,
+            'full_syncs': self.full_syncs,
+            'delta_syncs': self.delta_syncs,
+            'last_issues': self.last_issues,
+            'last_bytes': self.last_bytes,
+            'last_duration': self.last_duration,
+            'checks': self.checks,
+            'mismatches': self.mismatches
+        }
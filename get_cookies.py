@@ -1,6 +1,6 @@
 import re
-import json
 from datetime import datetime
+from cookie_store import write_json_atomic
 
 def extract_cookies_from_curl(curl_command):
     # Тот же код извлечения cookies
@@ -41,8 +41,8 @@ try:
             "cookies": cookies
         }
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        # Атомарная запись: запущенный бот не увидит наполовину записанный файл
+        write_json_atomic(output_file, data)
         
         print(f"Сохранено {len(cookies)} cookie в файл {output_file}")
 except Exception as e:
@@ -1,8 +1,38 @@
-import requests
-import json
 import os
+import math
+import time
+import random
+import requests
+from contextlib import closing
 from dotenv import load_dotenv
-from cookie_manager import refresh_cookies_on_401
+from cookie_manager import refresh_cookies_on_401, get_cookie_generation
+from cookie_store import cookie_store
+from board_cache import BoardCache
+from board_snapshot import BoardSnapshot, issue_from_jira
+from board_stream import parse_board_stream
+from circuit_breaker import CircuitBreaker
+from delta_sync import DeltaSync
+from auth_config import JIRA_URL
+from jira_session import get_session, set_session_cookies
+from config import (
+    BOARD_CACHE_TTL,
+    BOARD_PARSE_MODE,
+    BOARD_STREAM_CHUNK_SIZE,
+    BOARD_SYNC_MODE,
+    BOARD_FULL_RESYNC_INTERVAL,
+    BOARD_DELTA_OVERLAP,
+    BOARD_DELTA_PAGE_SIZE,
+    BOARD_DELTA_FIELDS,
+    COLUMN_PAGE_SIZE,
+    TELEGRAM_MESSAGE_LIMIT,
+    JIRA_REQUEST_TIMEOUT,
+    JIRA_CALL_DEADLINE,
+    JIRA_MAX_RETRIES,
+    JIRA_BACKOFF_BASE,
+    JIRA_BACKOFF_MAX,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT
+)
 
 # Загружаем переменные окружения
 load_dotenv()
@@ -11,123 +41,428 @@ load_dotenv()
 url = {
     "ARM_QA": os.getenv("JIRA_API_ARM_QA")
 }
+# Дополнительные доски: каждая переменная окружения JIRA_API_<ДОСКА> добавляет доску <ДОСКА>
+for env_name, env_value in sorted(os.environ.items()):
+    if env_name.startswith("JIRA_API_") and env_value:
+        url.setdefault(env_name[len("JIRA_API_"):], env_value)
+
+# JQL-фильтр задач доски для инкрементальной синхронизации: переменная JIRA_JQL_<ДОСКА>
+# (например "project = UGC"). Доски без фильтра всегда загружаются целиком
+board_jql = {
+    board_name: os.getenv(f"JIRA_JQL_{board_name}")
+    for board_name in url
+    if os.getenv(f"JIRA_JQL_{board_name}")
+}
+
+# Общий автомат защиты: пока Jira недоступна, запросы сразу завершаются ошибкой
+circuit_breaker = CircuitBreaker(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT)
 
-def get_desk_api():
+# ============== РЕЗУЛЬТАТ ЗАПРОСА ==============
+# Виды ошибок запроса к Jira
+ERROR_CIRCUIT_OPEN = "circuit_open"
+ERROR_TIMEOUT = "timeout"
+ERROR_CONNECTION = "connection"
+ERROR_HTTP = "http"
+ERROR_AUTH = "auth"
+
+class JiraResult:
+    """
+    Результат запроса к Jira: либо успешный ответ, либо описание ошибки
+    """
+    
+    def __init__(self, response=None, error=None, status_code=None):
+        self.response = response
+        self.error = error
+        self.status_code = status_code if status_code is not None else getattr(response, 'status_code', None)
+    
+    @property
+    def ok(self):
+        return self.error is None
+    
+    @property
+    def error_message(self):
+        """Текст ошибки для показа пользователю"""
+        if self.error is None:
+            return ""
+        if self.error == ERROR_CIRCUIT_OPEN:
+            return "Jira временно недоступна, повторите позже"
+        if self.error == ERROR_TIMEOUT:
+            return "Jira не ответила вовремя"
+        if self.error == ERROR_CONNECTION:
+            return "Нет соединения с Jira"
+        if self.error == ERROR_AUTH:
+            return "Не удалось авторизоваться в Jira"
+        return f"Jira вернула ошибку {self.status_code}"
+
+class JiraError(Exception):
+    """Исключение с результатом неудачного запроса к Jira"""
+    
+    def __init__(self, result):
+        super().__init__(result.error_message)
+        self.result = result
+
+def _backoff_delay(attempt):
+    """Экспоненциальная пауза с ограничением и случайным разбросом (full jitter)"""
+    return random.uniform(0, min(JIRA_BACKOFF_MAX, JIRA_BACKOFF_BASE * 2 ** attempt))
+
+def get_desk_api(board_name="ARM_QA", deadline=None, stream=False, request_url=None, params=None):
     """
     Получает данные из Jira API с автоматическим обновлением куков при 401 ошибке
+    
+    - 401: один раз обновляет куки и повторяет запрос
+    - 5xx, 429, таймаут, обрыв соединения: повторяет с растущей паузой,
+      но не больше JIRA_MAX_RETRIES раз и не дольше deadline
+    - пока автомат защиты открыт, сразу возвращает ошибку
+    
+    Args:
+        board_name: название доски из словаря url
+        deadline: крайний срок по time.monotonic() (по умолчанию через JIRA_CALL_DEADLINE секунд)
+        stream: не читать тело ответа заранее (для потокового разбора через iter_content)
+        request_url: другой адрес Jira API вместо ссылки на доску (например поиск задач)
+        params: параметры строки запроса
+    
+    Returns:
+        JiraResult: ответ или описание ошибки
     """
+    if deadline is None:
+        deadline = time.monotonic() + JIRA_CALL_DEADLINE
+    
+    if not circuit_breaker.allow():
+        print(f"⛔ Jira недоступна - запрос пропущен (повтор через {int(circuit_breaker.retry_after())} сек)")
+        return JiraResult(error=ERROR_CIRCUIT_OPEN)
+    
     try:
-        # Проверяем существование файла
-        try:
-            with open('cookies.json', "r") as cookie_file:
-                content = cookie_file.read().strip()
-                
-                # Проверяем что файл не пустой
-                if not content:
-                    print("⚠️ Файл cookies.json пустой - создаю новые куки...")
-                    if refresh_cookies_on_401():
-                        return get_desk_api()  # Рекурсивный вызов после создания куков
-                    return None
-                
-                # Парсим JSON
-                data = json.loads(content)
-                if not data.get('cookies') or not isinstance(data['cookies'], dict):
-                    print("⚠️ Некорректная структура cookies.json - создаю новые куки...")
-                    if refresh_cookies_on_401():
-                        return get_desk_api()  # Рекурсивный вызов после создания куков
-                    return None
-                
-                cookies = data['cookies']
-                
-                # Проверяем что есть хотя бы один важный кук
-                important_cookies = ['JSESSIONID', 'seraph.rememberme.cookie', 'atlassian.xsrf.token']
-                if not any(cookie in cookies for cookie in important_cookies):
-                    print("⚠️ Отсутствуют важные куки - создаю новые куки...")
-                    if refresh_cookies_on_401():
-                        return get_desk_api()  # Рекурсивный вызов после создания куков
-                    return None
-                    
-        except (json.JSONDecodeError, KeyError) as e:
-            print(f"❌ Ошибка парсинга cookies.json: {e} - создаю новые куки...")
-            if refresh_cookies_on_401():
-                return get_desk_api()  # Рекурсивный вызов после создания куков
-            return None
+        return _request_with_retries(board_name, deadline, stream, request_url, params)
+    except BaseException:
+        # Непредвиденная ошибка не должна навсегда занять пробный запрос автомата
+        circuit_breaker.release()
+        raise
+
+def _request_with_retries(board_name, deadline, stream, request_url, params):
+    """Запросы к Jira с повторами для get_desk_api() (автомат защиты уже пропустил вызов)"""
+    cookies_refreshed = False
+    attempt = 0
+    # Был ли отправлен хоть один запрос: сбой засчитывается Jira только тогда
+    requested = False
+    
+    while True:
+        # Запоминаем поколение куков: если другой поток уже обновит их,
+        # повторный вход в Jira не понадобится
+        generation = get_cookie_generation()
         
-        # Выполняем запрос
-        response = requests.get(url=url["ARM_QA"], cookies=cookies)
+        # Куки берем из памяти - файл перечитывается только если он изменился
+        cookies = cookie_store.load()
+        if cookies is None:
+            print("⚠️ Нет корректных куков - создаю новые куки...")
+            if cookies_refreshed or not refresh_cookies_on_401(generation):
+                circuit_breaker.record_success()  # Jira тут ни при чем
+                return JiraResult(error=ERROR_AUTH)
+            cookies_refreshed = True
+            continue
         
-        # Проверяем статус ответа
-        print("Статус:", response.status_code)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            result = JiraResult(error=ERROR_TIMEOUT)
+            break
         
-        # Если получена 401 ошибка - обновляем куки и повторяем запрос
-        if response.status_code == 401:
-            print("🔄 Получена 401 ошибка - обновляю куки...")
+        # Выполняем запрос через общую keep-alive сессию
+        set_session_cookies(cookies)
+        requested = True
+        try:
+            response = get_session().get(
+                url=request_url or url[board_name],
+                params=params,
+                timeout=min(remaining, JIRA_REQUEST_TIMEOUT),
+                stream=stream
+            )
+        except requests.Timeout as e:
+            print(f"⏱️ Таймаут запроса к Jira: {e}")
+            result = JiraResult(error=ERROR_TIMEOUT)
+        except requests.ConnectionError as e:
+            print(f"🔌 Ошибка соединения с Jira: {e}")
+            result = JiraResult(error=ERROR_CONNECTION)
+        except requests.RequestException as e:
+            # TooManyRedirects, ChunkedEncodingError и другие ошибки запроса
+            print(f"❌ Ошибка запроса к Jira: {e}")
+            result = JiraResult(error=ERROR_CONNECTION)
+        else:
+            # Проверяем статус ответа
+            print("Статус:", response.status_code)
+            
+            # Тело неуспешного ответа не нужно - сразу возвращаем соединение в пул
+            if stream and response.status_code != 200:
+                response.close()
+            
+            if response.status_code == 401:
+                # Если получена 401 ошибка - один раз обновляем куки и повторяем запрос
+                # (cookie_manager сам обновляет cookie jar общей сессии)
+                if cookies_refreshed:
+                    circuit_breaker.record_success()
+                    return JiraResult(response, error=ERROR_AUTH)
+                print("🔄 Получена 401 ошибка - обновляю куки...")
+                cookies_refreshed = True
+                if not refresh_cookies_on_401(generation):
+                    circuit_breaker.record_success()
+                    return JiraResult(response, error=ERROR_AUTH)
+                continue
             
-            # Пытаемся обновить куки
-            if refresh_cookies_on_401():
-                # Читаем обновленные куки
-                with open('cookies.json', "r") as cookie_file:
-                    data = json.load(cookie_file)
-                    cookies = data['cookies']
-                
-                # Повторяем запрос с новыми куками
-                response = requests.get(url=url["ARM_QA"], cookies=cookies)
-                print(f"🔄 Повторный запрос - статус: {response.status_code}")
-            else:
-                print("❌ Не удалось обновить куки")
+            if response.status_code < 500 and response.status_code != 429:
+                # Jira ответила - ошибки 4xx повторять бессмысленно
+                circuit_breaker.record_success()
+                if response.status_code == 200:
+                    return JiraResult(response)
+                return JiraResult(response, error=ERROR_HTTP)
+            
+            result = JiraResult(response, error=ERROR_HTTP)
         
-        return response
+        # Повторяем временные ошибки с паузой, пока позволяют попытки и срок
+        attempt += 1
+        if attempt > JIRA_MAX_RETRIES:
+            break
+        delay = _backoff_delay(attempt)
+        if time.monotonic() + delay >= deadline:
+            break
+        print(f"🔁 Повтор запроса к Jira через {delay:.1f} сек (попытка {attempt}/{JIRA_MAX_RETRIES})")
+        time.sleep(delay)
+    
+    if requested:
+        circuit_breaker.record_failure()
+    else:
+        # Срок истек до первого запроса - Jira тут ни при чем
+        circuit_breaker.release()
+    return result
+
+def load_board_data(board_name="ARM_QA"):
+    """
+    Загружает данные доски напрямую из Jira и строит индексированный снимок
+    
+    Returns:
+        BoardSnapshot: снимок доски
+    
+    Raises:
+        JiraError: если данные получить не удалось
+    """
+    stream = BOARD_PARSE_MODE == "stream"
+    result = get_desk_api(board_name, stream=stream)
+    if not result.ok:
+        raise JiraError(result)
+    
+    if stream:
+        # Читаем тело кусками и сохраняем только используемые поля
+        with closing(result.response) as response:
+            api_data = parse_board_stream(response.iter_content(chunk_size=BOARD_STREAM_CHUNK_SIZE))
+    else:
+        api_data = result.response.json()
+    
+    return BoardSnapshot(api_data)
+
+def load_board_delta(board_name, since_seconds):
+    """
+    Загружает задачи доски, измененные за последние since_seconds секунд
+
+    Использует поиск Jira (JQL из board_jql + updated >= -Nm) и запрашивает
+    только поля, которые нужны снимку доски
+
+    Returns:
+        tuple: (список задач в формате доски, байт получено)
+
+    Raises:
+        JiraError: если данные получить не удалось
+    """
+    # Относительное время в JQL считает сервер Jira - часовые пояса не важны
+    minutes = max(1, math.ceil(since_seconds / 60))
+    jql = f"({board_jql[board_name]}) AND updated >= -{minutes}m"
+    issues = []
+    size = 0
+    start_at = 0
+    deadline = time.monotonic() + JIRA_CALL_DEADLINE
+
+    while True:
+        result = get_desk_api(
+            board_name,
+            deadline=deadline,
+            request_url=f"{JIRA_URL}/rest/api/2/search",
+            params={
+                'jql': jql,
+                'fields': BOARD_DELTA_FIELDS,
+                'startAt': start_at,
+                'maxResults': BOARD_DELTA_PAGE_SIZE
+            }
+        )
+        if not result.ok:
+            raise JiraError(result)
+
+        size += len(result.response.content)
+        page = result.response.json()
+        found = page.get('issues', [])
+        issues.extend(issue_from_jira(issue) for issue in found)
+        start_at += len(found)
+        if not found or start_at >= page.get('total', 0):
+            return issues, size
+
+def _board_loader(board_name):
+    """Загрузчик снимков для кэша доски: полная загрузка или DeltaSync"""
+    if BOARD_SYNC_MODE != "delta" or board_name not in board_jql:
+        return load_board_data
+    # Кэш доски создается ниже - текущий снимок берем из него при каждой загрузке
+    board_syncs[board_name] = DeltaSync(
+        board_name,
+        load_board_data,
+        load_board_delta,
+        lambda: board_caches[board_name].peek(),
+        BOARD_FULL_RESYNC_INTERVAL,
+        BOARD_DELTA_OVERLAP
+    )
+    return board_syncs[board_name]
+
+# Инкрементальная синхронизация досок в режиме "delta": {доска: DeltaSync}
+board_syncs = {}
+
+# Общий кэш снимков для каждой доски
+board_caches = {
+    board_name: BoardCache(board_name, _board_loader(board_name), BOARD_CACHE_TTL)
+    for board_name in url
+}
+
+def get_sync_status(board_name="ARM_QA"):
+    """
+    Счетчики инкрементальной синхронизации доски (None если доска загружается целиком)
+    """
+    sync = board_syncs.get(board_name)
+    return sync.status() if sync else None
+
+def get_board_data(board_name="ARM_QA", max_age=None):
+    """
+    Возвращает данные доски из общего кэша
+    Запрос к Jira выполняется только если снимок старше max_age (по умолчанию BOARD_CACHE_TTL)
+    
+    Returns:
+        BoardSnapshot: снимок доски или None при ошибке
+    """
+    return board_caches[board_name].get(max_age)
+
+def refresh_board_data(board_name="ARM_QA"):
+    """
+    Принудительно загружает свежие данные доски и обновляет общий кэш
+    
+    Returns:
+        BoardSnapshot: снимок доски или None при ошибке
+    """
+    return board_caches[board_name].refresh()
+
+def peek_board_data(board_name="ARM_QA"):
+    """
+    Возвращает снимок доски из общего кэша без запроса к Jira (даже устаревший)
+    
+    Returns:
+        BoardSnapshot: снимок доски или None если его еще нет
+    """
+    return board_caches[board_name].peek()
+
+def get_board_error(board_name="ARM_QA"):
+    """
+    Возвращает текст последней ошибки загрузки доски для показа пользователю
+    """
+    return board_caches[board_name].last_error or "Ошибка получения данных с сервера"
+
+def format_column_tasks(snapshot, selected_column=None):
+    """
+    Текст со списком задач колонки (или всех колонок) снимка доски
+    """
+    # Выбранную колонку берем из индекса, а не перебором всех колонок
+    if selected_column:
+        column = snapshot.column(selected_column)
+        columns = [column] if column else []
+    else:
+        columns = snapshot.columns
+    
+    result = ""
+    for column in columns:
+        name_column = column['name']
+        task_in_desk = column['statisticsFieldValue']
+            
+        result += f'на доске: {name_column} - {int(task_in_desk)} задач(a)\n'
+        count = 0
         
-    except FileNotFoundError:
-        print("❌ Файл cookies.json не найден - создаю новые куки...")
-        # Пытаемся создать куки с нуля
-        if refresh_cookies_on_401():
-            return get_desk_api()  # Рекурсивный вызов после создания куков
-        return None
-    except Exception as e:
-        print(f"❌ Ошибка в get_desk_api: {e}")
-        return None
+        for issue in snapshot.issues_in(name_column):
+            count += 1
+            result += f"{count:>2}. [{issue['key']}] {issue['summary']} (👤 {issue.get('assigneeName', 'не назначен')})\n"
+        
+        if count == 0:
+            result += "Нет задач в этой колонке.\n"
+    
+    return result
+
+def _telegram_length(text):
+    """Длина текста так, как ее считает Telegram (в UTF-16: эмодзи - два символа)"""
+    return len(text.encode('utf-16-le')) // 2
+
+def _truncate(text, limit):
+    """Обрезает текст до limit символов Telegram, заканчивая многоточием"""
+    if _telegram_length(text) <= limit:
+        return text
+    # Половинка суррогатной пары при обрезке отбрасывается
+    return text.encode('utf-16-le')[:(limit - 1) * 2].decode('utf-16-le', errors='ignore') + "…"
+
+def format_column_page(snapshot, column_name, page=0, page_size=COLUMN_PAGE_SIZE):
+    """
+    Страница списка задач колонки
+    
+    На странице page_size задач по порядку доски, поэтому границы страниц
+    не зависят от длины названий задач. Длинные названия обрезаются так,
+    чтобы страница всегда помещалась в одно сообщение Telegram
+    
+    Args:
+        snapshot: снимок доски
+        column_name: колонка
+        page: номер страницы с 0 (за пределами - ближайшая существующая)
+        page_size: задач на странице
+        
+    Returns:
+        tuple: (текст, номер показанной страницы, всего страниц)
+    """
+    column = snapshot.column(column_name)
+    if column is None:
+        return f"Колонка '{column_name}' не найдена на доске.\n", 0, 1
+    
+    issues = snapshot.issues_in(column_name)
+    pages = max(1, math.ceil(len(issues) / page_size))
+    page = min(max(page, 0), pages - 1)
+    
+    result = f"на доске: {column_name} - {int(column['statisticsFieldValue'])} задач(a)\n"
+    # Запас на номер страницы; длины считаются как в Telegram
+    line_limit = (TELEGRAM_MESSAGE_LIMIT - _telegram_length(result) - 64) // page_size
+    
+    start = page * page_size
+    for number, issue in enumerate(issues[start:start + page_size], start + 1):
+        prefix = f"{number:>2}. [{issue['key']}] "
+        # Имя исполнителя занимает не больше половины строки
+        assignee = _truncate(str(issue.get('assigneeName', 'не назначен')), max(10, line_limit // 2))
+        suffix = f" (👤 {assignee})\n"
+        summary_limit = max(10, line_limit - _telegram_length(prefix) - _telegram_length(suffix))
+        result += prefix + _truncate(issue['summary'], summary_limit) + suffix
+    
+    if not issues:
+        result += "Нет задач в этой колонке.\n"
+    footer = f"\n📄 Страница {page + 1} из {pages}" if pages > 1 else ""
+    
+    # Последняя страховка от переполнения: обрезается список, а не номер страницы
+    return _truncate(result, TELEGRAM_MESSAGE_LIMIT - _telegram_length(footer)) + footer, page, pages
 
 #получаем по доске колонки и количество задач в них
-def get_column_count_task(selected_column=None, names_only=False):
+def get_column_count_task(selected_column=None, names_only=False, board_name="ARM_QA"):
     try:
-        response = get_desk_api()
-        
-        # Проверяем что ответ получен и успешен
-        if not response or response.status_code != 200:
-            return "❌ Ошибка получения данных с сервера"
+        snapshot = get_board_data(board_name)
         
-        response_json = response.json()
+        # Проверяем что данные получены
+        if not snapshot:
+            return f"❌ {get_board_error(board_name)}"
         
         if names_only:
-            columns = []
-            for column in response_json['columnsData']['columns']:
-                columns.append(column['name'])
-            return columns
-        
-        result = ""
-        for column in response_json['columnsData']['columns']:
-            name_column = column['name']
-            task_in_desk = column['statisticsFieldValue']
-            
-            if selected_column and name_column != selected_column:
-                continue
-                
-            result += f'на доске: {name_column} - {int(task_in_desk)} задач(a)\n'
-            statusIDs = column['statusIds']
-            count = 0
-            
-            for issue in response_json['issuesData']['issues']:
-                if issue['statusId'] in statusIDs:
-                    count += 1
-                    result += f"{count:>2}. [{issue['key']}] {issue['summary']} (👤 {issue.get('assigneeName', 'не назначен')})\n"
-            
-            if count == 0:
-                result += "Нет задач в этой колонке.\n"
+            return [column['name'] for column in snapshot.columns]
         
-        return result
+        return format_column_tasks(snapshot, selected_column)
         
     except Exception as e:
         print(f"❌ Ошибка в get_column_count_task: {e}")
         return "❌ Ошибка обработки данных"
-
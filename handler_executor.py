@@ -0,0 +1,239 @@
+# ==============================================
+# ВЫПОЛНЕНИЕ ОБРАБОТЧИКОВ КОМАНД И КНОПОК
+# ==============================================
+# Обработчики выполняются ограниченным пулом потоков, но по очереди
+# для каждого ключа (чат или сообщение с кнопками):
+# - медленный запрос к Jira занимает один поток, а не всех обработчиков
+# - два быстрых нажатия на одно сообщение выполняются по порядку,
+#   и старый экран не перезаписывает новый
+# - нажатие, которое только показывает экран, отменяет еще не выполненные
+#   такие же нажатия на том же сообщении, а выполняющемуся сообщает
+#   через is_superseded(), что его результат уже не нужен
+# Очередь ограничена: при переполнении новое нажатие отклоняется
+
+import time
+import threading
+import traceback
+from collections import deque
+
+
+class _Task:
+    """Вызов обработчика в очереди ключа"""
+
+    __slots__ = ('handler', 'args', 'supersede', 'on_drop', 'cancelled', 'submitted_at')
+
+    def __init__(self, handler, args, supersede, on_drop, submitted_at):
+        self.handler = handler
+        self.args = args
+        self.supersede = supersede
+        self.on_drop = on_drop
+        self.cancelled = False
+        self.submitted_at = submitted_at
+
+
+class HandlerExecutor:
+    """
+    Ограниченный пул потоков с очередью на каждый ключ
+
+    Использование:
+        executor = HandlerExecutor(max_workers=8, max_pending=500)
+        executor.start()
+        executor.submit((chat_id, message_id), router.dispatch, call, supersede=True)
+    """
+
+    def __init__(self, max_workers=8, max_pending=500, clock=time.monotonic):
+        """
+        Args:
+            max_workers: сколько обработчиков выполнять одновременно
+            max_pending: сколько обработчиков может ждать выполнения
+            clock: функция текущего времени (для тестов)
+        """
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self._threads = []
+        self._stop = False
+        # Ожидающие обработчики: {ключ: deque(_Task)}
+        self._queues = {}
+        # Выполняющиеся обработчики: {ключ: _Task}
+        self._running = {}
+        # Ключи, чьи обработчики можно запускать (есть ожидающие, ни один не выполняется)
+        self._ready = deque()
+        self._pending = 0
+        self.max_pending_seen = 0
+        self.submitted = 0
+        self.completed = 0
+        self.superseded = 0
+        self.rejected = 0
+        self.errors = 0
+        self.wait_sum = 0.0
+        self.wait_max = 0.0
+
+    def submit(self, key, handler, *args, supersede=False, on_drop=None):
+        """
+        Ставит handler(*args) в очередь ключа
+
+        Args:
+            key: ключ порядка (например (chat_id, message_id))
+            handler: обработчик
+            supersede: обработчик только показывает экран - отменяет
+                       ожидающие и выполняющийся такие же обработчики ключа
+            on_drop: вызывается вместо handler, если обработчик отменен
+                     более новым, не дождавшись выполнения (например чтобы
+                     ответить Telegram на нажатие)
+
+        Returns:
+            bool: False если очередь переполнена и обработчик отклонен
+        """
+        dropped = []
+        with self._cond:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                return False
+
+            queue = self._queues.get(key)
+            if queue is None:
+                queue = self._queues[key] = deque()
+            if supersede:
+                dropped = self._supersede(key, queue)
+
+            queue.append(_Task(handler, args, supersede, on_drop, self._clock()))
+            self._pending += 1
+            self.submitted += 1
+            self.max_pending_seen = max(self.max_pending_seen, self._pending)
+            # Первый ожидающий свободного ключа - ключ готов к запуску
+            if len(queue) == 1 and key not in self._running:
+                self._ready.append(key)
+                # notify_all: на условии ждут и потоки, и wait_idle
+                self._cond.notify_all()
+
+        # Вне блокировки: on_drop может обращаться к сети
+        for task in dropped:
+            if task.on_drop is not None:
+                self._call(task.on_drop)
+        return True
+
+    def is_superseded(self):
+        """
+        True если выполняющийся в этом потоке обработчик отменен более новым нажатием
+        (вызывается из обработчика перед показом результата)
+        """
+        task = getattr(self._local, 'task', None)
+        return task is not None and task.cancelled
+
+    def start(self):
+        """Запускает потоки обработчиков"""
+        with self._cond:
+            if self._threads:
+                return
+            self._stop = False
+            self._threads = [
+                threading.Thread(target=self._loop, daemon=True, name=f"handler-{index}")
+                for index in range(self.max_workers)
+            ]
+            threads = list(self._threads)
+        for thread in threads:
+            thread.start()
+
+    def stop(self):
+        """Останавливает потоки (ожидающие обработчики остаются в очереди)"""
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+            threads = self._threads
+            self._threads = []
+        for thread in threads:
+            thread.join()
+
+    def wait_idle(self, timeout=None):
+        """
+        Ждет, пока не останется ожидающих и выполняющихся обработчиков
+
+        Returns:
+            bool: True если очередь пуста
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._running, timeout)
+
+    def stats(self):
+        """Счетчики для get_monitoring_status()"""
+        with self._cond:
+            started = self.completed + len(self._running)
+            return {
+                'workers': self.max_workers,
+                'pending': self._pending,
+                'running': len(self._running),
+                'keys': len(self._queues),
+                'max_pending': self.max_pending_seen,
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'superseded': self.superseded,
+                'rejected': self.rejected,
+                'errors': self.errors,
+                'wait_avg': self.wait_sum / started if started else None,
+                'wait_max': self.wait_max
+            }
+
+    def _supersede(self, key, queue):
+        """
+        Отменяет ожидающие и выполняющийся экраны ключа
+
+        Returns:
+            list: ожидающие обработчики, убранные из очереди
+        """
+        # Ожидающие экраны больше не нужны, остальные обработчики сохраняют порядок
+        kept = [task for task in queue if not task.supersede]
+        dropped = [task for task in queue if task.supersede]
+        if dropped:
+            queue.clear()
+            queue.extend(kept)
+            self._pending -= len(dropped)
+            self.superseded += len(dropped)
+            if not queue and key not in self._running:
+                self._ready.remove(key)
+        running = self._running.get(key)
+        if running is not None and running.supersede and not running.cancelled:
+            running.cancelled = True
+            self.superseded += 1
+        return dropped
+
+    def _call(self, function, *args):
+        """Вызывает обработчик; ошибка не останавливает поток, а печатается с трассировкой"""
+        try:
+            function(*args)
+        except Exception:
+            with self._cond:
+                self.errors += 1
+            print(f"❌ Ошибка в обработчике {getattr(function, '__name__', function)}:")
+            traceback.print_exc()
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._stop or self._ready)
+                if self._stop:
+                    return
+                key = self._ready.popleft()
+                task = self._queues[key].popleft()
+                self._pending -= 1
+                self._running[key] = task
+                waited = self._clock() - task.submitted_at
+                self.wait_sum += waited
+                self.wait_max = max(self.wait_max, waited)
+
+            self._local.task = task
+            try:
+                self._call(task.handler, *task.args)
+            finally:
+                self._local.task = None
+
+            with self._cond:
+                del self._running[key]
+                self.completed += 1
+                if self._queues[key]:
+                    self._ready.append(key)
+                else:
+                    del self._queues[key]
+                self._cond.notify_all()
@@ -0,0 +1,81 @@
+# ==============================================
+# ОБЩАЯ HTTP-СЕССИЯ ДЛЯ ЗАПРОСОВ К JIRA
+# ==============================================
+# Одна requests.Session на весь процесс: соединения с Jira
+# переиспользуются (keep-alive), поэтому TCP+TLS рукопожатие
+# не повторяется при каждой проверке, напоминании и нажатии кнопки
+
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from config import JIRA_POOL_CONNECTIONS, JIRA_POOL_SIZE
+
+_session = None
+_session_lock = threading.Lock()
+# Куки, которые сейчас лежат в cookie jar сессии
+_applied_cookies = None
+
+def _create_session():
+    """
+    Создает сессию с пулом keep-alive соединений
+    """
+    session = requests.Session()
+
+    # pool_connections - сколько хостов держать в пуле,
+    # pool_maxsize - сколько соединений держать к одному хосту.
+    # pool_block=True - при нехватке соединений поток ждёт,
+    # а не открывает лишнее соединение мимо пула
+    adapter = HTTPAdapter(
+        pool_connections=JIRA_POOL_CONNECTIONS,
+        pool_maxsize=JIRA_POOL_SIZE,
+        pool_block=True
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Connection": "keep-alive"})
+    return session
+
+def get_session():
+    """
+    Возвращает общую сессию, создавая её при первом обращении
+    """
+    global _session
+
+    with _session_lock:
+        if _session is None:
+            _session = _create_session()
+        return _session
+
+def set_session_cookies(cookies):
+    """
+    Заменяет cookie jar общей сессии новым
+    Вызывается при чтении куков и после их обновления в cookie_manager
+
+    Новый jar собирается целиком и подставляется одним присваиванием:
+    запрос из другого потока уходит со старыми или с новыми куками,
+    но никогда с пустым jar (иначе 401 и лишнее обновление куков)
+
+    Args:
+        cookies: словарь {имя: значение}
+    """
+    global _applied_cookies
+
+    session = get_session()
+    with _session_lock:
+        if cookies == _applied_cookies:
+            return
+
+        session.cookies = requests.cookies.cookiejar_from_dict(cookies)
+        _applied_cookies = dict(cookies)
+
+def close_session():
+    """
+    Закрывает общую сессию и все соединения пула
+    """
+    global _session, _applied_cookies
+
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        _applied_cookies = None
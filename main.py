@@ -5,9 +5,10 @@
 # Импортирует все модули и соединяет их вместе
 
 import telebot
-from config import BOT_TOKEN, WORK_CHAT_ID, STARTUP_MESSAGE, DEBUG_MODE
+from config import BOT_TOKEN, WORK_CHAT_ID, STARTUP_MESSAGE, DEBUG_MODE, RUNTIME, WEBHOOK_ENABLED, WEBHOOK_SECRET
 from bot_handlers import setup_handlers
-from monitor import start_monitoring 
+from monitor import start_monitoring, start_telegram_sender
+from session_keeper import start_session_keeper
 
 def main():
     """
@@ -19,12 +20,19 @@ def main():
     print("🤖 JIRA MONITORING TELEGRAM BOT")
     print("=" * 50)
     
+    # ============== АСИНХРОННЫЙ РЕЖИМ ==============
+    if RUNTIME == "asyncio":
+        main_async()
+        return
+    
     # ============== СОЗДАНИЕ БОТА ==============
     if DEBUG_MODE:
         print("⚙️ Создаю объект Telegram бота...")
     
     try:
         bot = telebot.TeleBot(BOT_TOKEN)
+        # Сообщения отправляются через очередь с ограничением частоты
+        bot = start_telegram_sender(bot)
         if DEBUG_MODE:
             print("✅ Бот создан успешно")
     except Exception as e:
@@ -69,6 +77,13 @@ def main():
         print(f"❌ Ошибка запуска мониторинга: {e}")
         return
     
+    # ============== ФОНОВОЕ ПОДДЕРЖАНИЕ СЕССИИ ==============
+    try:
+        start_session_keeper()
+    except Exception as e:
+        print(f"❌ Ошибка запуска проверки сессии: {e}")
+        return
+    
     # ============== ЗАПУСК БОТА ==============
     print("🚀 Бот запущен и готов к работе!")
     print("📋 Доступные команды: /start")
@@ -86,6 +101,29 @@ def main():
         print(f"❌ Критическая ошибка: {e}")
         print("🔄 Перезапустите бота")
 
+def main_async():
+    """
+    Запускает бота в асинхронном режиме (RUNTIME = "asyncio")
+    Бот, мониторинг и напоминания работают в одном цикле событий
+    """
+    # Импорт здесь: aiohttp нужен только в асинхронном режиме
+    import asyncio
+    from async_runtime import run_bot_async
+    
+    print("⚙️ Режим работы: asyncio")
+    print("🚀 Бот запущен и готов к работе!")
+    print("⏹️ Для остановки нажмите Ctrl+C")
+    print("=" * 50)
+    
+    try:
+        asyncio.run(run_bot_async())
+    except KeyboardInterrupt:
+        print("\n⏹️ Получен сигнал остановки...")
+        print("🛑 Бот остановлен")
+    except Exception as e:
+        print(f"❌ Критическая ошибка: {e}")
+        print("🔄 Перезапустите бота")
+
 def check_config():
     """
     Проверяет корректность конфигурации перед запуском
@@ -102,6 +140,11 @@ def check_config():
         print("❌ Не указан ID рабочего чата в config.py")
         return False
     
+    # Сервер вебхуков слушает все адреса - без секрета события мог бы прислать кто угодно
+    if WEBHOOK_ENABLED and not WEBHOOK_SECRET:
+        print("❌ Вебхуки включены (WEBHOOK_ENABLED), но не задан JIRA_WEBHOOK_SECRET")
+        return False
+    
     return True
 
 if __name__ == "__main__":
@@ -1,212 +1,546 @@
 # ==============================================
 # СИСТЕМА МОНИТОРИНГА ЗАДАЧ JIRA
 # ==============================================
-# Этот файл отвечает за отслеживание изменений в колонке Jira
-# и отправку уведомлений в Telegram чат
+# Этот файл отвечает за отслеживание изменений в колонках досок Jira
+# и отправку уведомлений в Telegram чат.
+# Какие колонки каких досок отслеживать - MONITORED_BOARDS в config.py
 
 import time
+import math
 import threading
 from telebot import types
-from get_desk_api import get_desk_api
+from get_desk_api import url, board_caches, get_board_data, refresh_board_data, get_board_error, get_sync_status
+from board_snapshot import diff_issue_keys
+from monitoring_engine import BoardState, MonitoringEngine
+from adaptive_polling import AdaptivePollPolicy, RequestBudget
+from timer_scheduler import TimerScheduler
+from reminder_registry import ReminderRegistry, STOPPED, COMPLETED
+from notification_coalescer import NotificationCoalescer
+from state_store import StateStore
+from webhook_server import WebhookServer, issue_event_update
+from callback_codec import callback_codec, OP_TASK, OP_TAKE, OP_DELETE
+from bot_handlers import handler_executor
+from session_keeper import get_session_keeper_stats
+from telegram_sender import TelegramSender, QueuedBot, PRIORITY_NOTIFICATION, PRIORITY_REMINDER, PRIORITY_DIGEST
+from concurrent.futures import ThreadPoolExecutor
 from config import (
     WORK_CHAT_ID, 
+    TELEGRAM_GLOBAL_PER_SECOND,
+    TELEGRAM_CHAT_PER_SECOND,
+    TELEGRAM_GROUP_PER_MINUTE,
+    TELEGRAM_SEND_QUEUE_SIZE,
+    TELEGRAM_SEND_RETRIES,
     CHECK_INTERVAL, 
     MONITORED_COLUMN, 
+    MONITORED_BOARDS,
+    MONITOR_WORKERS,
+    POLL_ADAPTIVE,
+    POLL_MIN_INTERVAL,
+    POLL_WORKING_INTERVAL,
+    POLL_MAX_INTERVAL,
+    POLL_BACKOFF_FACTOR,
+    POLL_IDLE_POLLS_PER_STEP,
+    POLL_RECENT_CHANGE_WINDOW,
+    POLL_WORKING_HOURS,
+    POLL_WORKING_DAYS,
+    JIRA_POLL_RPM_BUDGET,
     NOTIFICATION_TEMPLATE,
     DEBUG_MODE,
     SHOW_CHECK_STATUS,
-    REMINDER_INTERVAL 
+    REMINDER_INTERVAL,
+    REMINDER_TICK,
+    REMINDER_WORKERS,
+    REMINDER_MAX_ACTIVE,
+    REMINDER_FINISHED_TTL,
+    REMINDER_MAX_FINISHED,
+    REMINDER_MAX_READERS,
+    REMINDER_COMPACT_INTERVAL,
+    NOTIFICATION_COALESCE_WINDOW,
+    NOTIFICATION_MAX_TASKS,
+    STATE_DB_FILE,
+    STATE_FLUSH_INTERVAL,
+    WEBHOOK_ENABLED,
+    WEBHOOK_HOST,
+    WEBHOOK_PORT,
+    WEBHOOK_PATH,
+    WEBHOOK_SECRET,
+    WEBHOOK_RECONCILE_INTERVAL
 )
 
-# Глобальная переменная для хранения последнего состояния
-last_column_state = {}
-# Глобальная переменная для активных напоминаний
-active_reminders = {}
-# Глобальная переменная для хранения кто прочитал напоминания
-reminder_readers = {}
+# Состояние мониторинга каждой доски: {доска: BoardState}
+board_states = {}
+# Движок опроса досок
+monitoring_engine = None
+# Напоминания вместе со взявшими задачи и прочитавшими
+# Завершенные напоминания удаляются периодическим сжатием (compact_reminders)
+reminders = ReminderRegistry(REMINDER_MAX_ACTIVE, REMINDER_FINISHED_TTL, REMINDER_MAX_FINISHED, REMINDER_MAX_READERS)
+# Один планировщик для всех напоминаний вместо спящего потока на каждое
+reminder_scheduler = TimerScheduler(
+    executor=ThreadPoolExecutor(max_workers=REMINDER_WORKERS, thread_name_prefix="reminder")
+)
+# Напоминания, сгруппированные по тикам: {время тика: set(reminder_id)}
+# Все напоминания одного тика проверяются по одному снимку доски
+reminder_ticks = {}
+reminder_ticks_lock = threading.Lock()
+# Состояние колонок и напоминаний сохраняется между перезапусками
+# (база открывается при запуске мониторинга в open_state_store, а не при импорте)
+state_store = None
+# Изменения колонок за окно NOTIFICATION_COALESCE_WINDOW уходят одной сводкой
+# (сводку по окончании окна отправляет планировщик напоминаний)
+notification_coalescer = NotificationCoalescer(
+    NOTIFICATION_COALESCE_WINDOW,
+    reminder_scheduler,
+    lambda batch: flush_notification(batch)
+)
+# Очередь исходящих сообщений в Telegram (создается в start_telegram_sender)
+telegram_sender = None
+# Прием вебхуков Jira (None если выключен)
+webhook_server = None
+# Статистика вебхуков: задержка от получения события до конца обработки (включая отправку в Telegram)
+webhook_stats = {'events': 0, 'applied': 0, 'latency_sum': 0.0, 'latency_max': 0.0}
+webhook_stats_lock = threading.Lock()
 
 def start_monitoring(bot):
     """
-    Запускает систему мониторинга в отдельном потоке
+    Запускает мониторинг всех досок из MONITORED_BOARDS
+    
+    Доски проверяются параллельно (не больше MONITOR_WORKERS одновременно),
+    проверки разнесены по интервалу CHECK_INTERVAL
     
     Args:
         bot: объект Telegram бота для отправки сообщений
     """
+    if monitoring_engine is not None:
+        return
+    
+    engine = create_monitoring_engine(bot)
+    engine.start()
+    reminder_scheduler.start()
+    start_webhook_receiver(bot)
+    
+    if DEBUG_MODE:
+        print("✅ Поток мониторинга запущен")
+
+def start_telegram_sender(bot):
+    """
+    Запускает очередь отправки сообщений и возвращает бота, который отправляет через нее
+    
+    Все bot.send_message / edit_message_text / delete_message обработчиков и
+    мониторинга после этого не ждут Telegram и соблюдают его ограничения частоты
     
-    def monitor_loop():
-        """
-        Основной цикл мониторинга
-        Выполняется в отдельном потоке каждые CHECK_INTERVAL секунд
-        """
-        global last_column_state
+    Args:
+        bot: TeleBot (или SyncBotBridge в асинхронном режиме)
         
+    Returns:
+        QueuedBot: бот для setup_handlers и start_monitoring
+    """
+    global telegram_sender
+    
+    telegram_sender = TelegramSender(
+        bot,
+        global_per_second=TELEGRAM_GLOBAL_PER_SECOND,
+        chat_per_second=TELEGRAM_CHAT_PER_SECOND,
+        group_per_minute=TELEGRAM_GROUP_PER_MINUTE,
+        max_queue=TELEGRAM_SEND_QUEUE_SIZE,
+        max_retries=TELEGRAM_SEND_RETRIES
+    )
+    telegram_sender.start()
+    return QueuedBot(bot, telegram_sender)
+
+def open_state_store():
+    """
+    Открывает базу состояния STATE_DB_FILE (при первом вызове)
+    
+    Returns:
+        StateStore: хранилище состояния колонок и напоминаний
+    """
+    global state_store
+    
+    if state_store is None:
+        state_store = StateStore(STATE_DB_FILE, STATE_FLUSH_INTERVAL)
+    return state_store
+
+def create_monitoring_engine(bot, engine_class=MonitoringEngine, poll_func=None):
+    """
+    Восстанавливает сохраненное состояние и создает движок опроса досок
+    
+    Используется обоими режимами работы: с потоками (start_monitoring)
+    и асинхронным (async_runtime.py)
+    
+    Args:
+        bot: объект Telegram бота для отправки сообщений
+        engine_class: MonitoringEngine или AsyncMonitoringEngine
+        poll_func: функция проверки доски (по умолчанию poll_board)
+        
+    Returns:
+        MonitoringEngine: созданный, но еще не запущенный движок
+    """
+    global monitoring_engine
+    
+    # Сохраненные ключи колонок становятся базой для первой проверки:
+    # задачи, появившиеся пока бот не работал, попадут в уведомление
+    stored_columns = open_state_store().load_column_states()
+    
+    for board_name, columns in MONITORED_BOARDS.items():
+        if board_name not in url:
+            print(f"⚠️ Доска '{board_name}' не настроена (нет JIRA_API_{board_name}) - пропускаю")
+            continue
+        state = BoardState(board_name, columns)
+        for column_name, task_keys in stored_columns.get(board_name, {}).items():
+            if column_name in state.columns:
+                state.column_keys[column_name] = task_keys
+        board_states[board_name] = state
+    
+    restore_reminders(bot)
+    reminder_scheduler.schedule(REMINDER_COMPACT_INTERVAL, compact_reminders)
+    state_store.start()
+    
+    policy = None
+    interval = CHECK_INTERVAL
+    if WEBHOOK_ENABLED:
+        # Изменения приходят вебхуками - опрос нужен только для редкой сверки
+        interval = WEBHOOK_RECONCILE_INTERVAL
+    elif POLL_ADAPTIVE:
+        policy = AdaptivePollPolicy(
+            base_interval=CHECK_INTERVAL,
+            min_interval=POLL_MIN_INTERVAL,
+            working_interval=POLL_WORKING_INTERVAL,
+            max_interval=POLL_MAX_INTERVAL,
+            backoff_factor=POLL_BACKOFF_FACTOR,
+            idle_polls_per_step=POLL_IDLE_POLLS_PER_STEP,
+            recent_change_window=POLL_RECENT_CHANGE_WINDOW,
+            working_hours=POLL_WORKING_HOURS,
+            working_days=POLL_WORKING_DAYS
+        )
+    budget = RequestBudget(JIRA_POLL_RPM_BUDGET) if JIRA_POLL_RPM_BUDGET else None
+    
+    monitoring_engine = engine_class(
+        list(board_states.values()),
+        poll_func or (lambda state: poll_board(state, bot)),
+        interval,
+        MONITOR_WORKERS,
+        policy=policy,
+        budget=budget
+    )
+    
+    if DEBUG_MODE:
+        for state in board_states.values():
+            print(f"🔍 Мониторинг доски '{state.board_name}': {', '.join(state.columns)}")
+        print(f"⏱️ Интервал проверки: {interval} секунд")
+    
+    return monitoring_engine
+
+def poll_board(state, bot):
+    """
+    Проверяет одну доску: загружает свежий снимок и обрабатывает все её колонки
+    
+    Args:
+        state: BoardState доски
+        bot: объект Telegram бота
+        
+    Returns:
+        bool: True если данные доски получены
+    """
+    if SHOW_CHECK_STATUS:
+        print(f"⏰ Проверка доски {state.board_name} в {time.strftime('%H:%M:%S')}")
+    
+    # Получаем свежие данные из Jira API и обновляем общий кэш
+    webhook_seq = state.webhook_seq
+    snapshot = refresh_board_data(state.board_name)
+    return process_board_snapshot(state, bot, snapshot, webhook_seq)
+
+def process_board_snapshot(state, bot, snapshot, webhook_seq=None):
+    """
+    Обрабатывает все отслеживаемые колонки доски по полученному снимку
+    
+    Args:
+        state: BoardState доски
+        bot: объект Telegram бота
+        snapshot: BoardSnapshot или None если данные получить не удалось
+        webhook_seq: state.webhook_seq до запроса к Jira; если с тех пор
+                     пришел вебхук, колонки сравниваются по последнему снимку
+                     из кэша (загруженный снимок + события вебхуков)
+        
+    Returns:
+        bool: True если данные доски получены
+    """
+    if not snapshot:
         if DEBUG_MODE:
-            print(f"🔍 Мониторинг колонки '{MONITORED_COLUMN}' запущен")
-            print(f"⏱️ Интервал проверки: {CHECK_INTERVAL} секунд")
+            print(f"❌ Ошибка API ({state.board_name}): {get_board_error(state.board_name)}")
+        return False
+    
+    with state.lock:
+        if webhook_seq is not None and webhook_seq != state.webhook_seq:
+            # Колонки уже сравнивались по событию вебхука - загруженный снимок без
+            # него дал бы ложное "задача ушла" и повторное "новая задача"
+            snapshot = board_caches[state.board_name].peek() or snapshot
+            if DEBUG_MODE:
+                print(f"🔀 Во время проверки {state.board_name} пришел вебхук - сравнение по последнему снимку")
+        process_board_columns(state, bot, snapshot)
+    
+    return True
+
+def process_board_columns(state, bot, snapshot):
+    """Сравнивает все отслеживаемые колонки доски (вызывается под state.lock)"""
+    for column_name in state.columns:
+        target_column = find_monitored_column(snapshot, column_name)
+        if target_column:
+            process_column_data(state, target_column, bot, snapshot)
+        elif DEBUG_MODE:
+            print(f"⚠️ Колонка '{column_name}' не найдена на доске {state.board_name}")
+
+def start_webhook_receiver(bot):
+    """
+    Запускает прием вебхуков Jira, если он включен (WEBHOOK_ENABLED)
+    
+    Returns:
+        WebhookServer или None
         
-        while True:
-            try:
-                if SHOW_CHECK_STATUS:
-                    print(f"⏰ Проверка в {time.strftime('%H:%M:%S')}")
-                
-                # Получаем свежие данные из Jira API
-                response = get_desk_api()
-                
-                if response and response.status_code == 200:
-                    current_data = response.json()
-                    
-                    # Ищем нужную колонку среди всех колонок
-                    target_column = find_monitored_column(current_data)
-                    
-                    if target_column:
-                        process_column_data(target_column, bot, current_data)
-                    else:
-                        if DEBUG_MODE:
-                            print(f"⚠️ Колонка '{MONITORED_COLUMN}' не найдена")
-                else:
-                    if DEBUG_MODE:
-                        print(f"❌ Ошибка API: статус {response.status_code if response else 'нет ответа'}")
-                        
-            except Exception as e:
-                if DEBUG_MODE:
-                    print(f"❌ Ошибка мониторинга: {e}")
-            
-            # Ждем до следующей проверки
-            time.sleep(CHECK_INTERVAL)
+    Raises:
+        ValueError: если не задан WEBHOOK_SECRET
+    """
+    global webhook_server
     
-    # Запускаем мониторинг в отдельном потоке
-    monitor_thread = threading.Thread(target=monitor_loop, daemon=True)
-    monitor_thread.start()
+    if not WEBHOOK_ENABLED or webhook_server is not None:
+        return webhook_server
+    
+    webhook_server = WebhookServer(
+        WEBHOOK_HOST, WEBHOOK_PORT, WEBHOOK_PATH,
+        lambda event: apply_issue_event(bot, event),
+        secret=WEBHOOK_SECRET
+    )
+    webhook_server.start()
     
     if DEBUG_MODE:
-        print("✅ Поток мониторинга запущен")
+        print(f"📡 Вебхуки Jira принимаются на порту {webhook_server.port}, путь {WEBHOOK_PATH}")
+    return webhook_server
+
+def apply_issue_event(bot, event):
+    """
+    Применяет событие вебхука к снимкам досок и сравнивает колонки
+    
+    Какие события относятся к доске - см. issue_event_update().
+    Ошибки такого определения исправит ближайшая сверка опросом
+    
+    Args:
+        bot: объект Telegram бота
+        event: событие из webhook_server.parse_issue_event()
+    """
+    task_key = event['issue']['key']
+    update = issue_event_update(event)
+    applied = False
+    
+    for board_name, state in list(board_states.items()):
+        cache = board_caches[board_name]
+        with state.lock:
+            # Идущая сейчас загрузка доски повторит это событие на своем снимке
+            updated = cache.apply(update)
+            if updated is None:
+                continue
+            state.webhook_seq += 1
+            process_board_columns(state, bot, updated)
+            applied = True
+    
+    latency = time.monotonic() - event['received_at']
+    with webhook_stats_lock:
+        webhook_stats['events'] += 1
+        if applied:
+            webhook_stats['applied'] += 1
+            webhook_stats['latency_sum'] += latency
+            webhook_stats['latency_max'] = max(webhook_stats['latency_max'], latency)
+    
+    if DEBUG_MODE:
+        print(f"📡 Вебхук {event['event']} {task_key}: обработан за {latency * 1000:.0f} мс")
 
-def find_monitored_column(api_data):
+def find_monitored_column(snapshot, column_name=MONITORED_COLUMN):
     """
-    Находит отслеживаемую колонку в данных API
+    Находит отслеживаемую колонку в снимке доски
     
     Args:
-        api_data: данные полученные от Jira API
+        snapshot: BoardSnapshot с данными Jira
+        column_name: название колонки
         
     Returns:
         dict: данные колонки или None если не найдена
     """
-    for column in api_data['columnsData']['columns']:
-        if column['name'] == MONITORED_COLUMN:
-            return column
-    return None
+    return snapshot.column(column_name)
+
+def get_still_waiting_tasks(snapshot, task_keys, column_name=MONITORED_COLUMN):
+    """
+    Возвращает задачи из task_keys, которые всё ещё в отслеживаемой колонке
+    
+    Args:
+        snapshot: BoardSnapshot с данными Jira
+        task_keys: ключи задач напоминания
+        column_name: колонка, в которой ждут задачи
+        
+    Returns:
+        list: задачи в виде {'key', 'summary'}
+    """
+    return [
+        {'key': issue['key'], 'summary': issue['summary']}
+        for issue in snapshot.issues_in_column_by_keys(column_name, task_keys)
+    ]
 
-def process_column_data(column_data, bot, full_api_data):
+def process_column_data(state, column_data, bot, snapshot):
     """
     Обрабатывает данные колонки и отправляет уведомления при изменениях
     
+    Сравнивает множества ключей задач, а не их количество: если за интервал
+    одна задача ушла, а другая пришла, новая задача всё равно будет замечена
+    
     Args:
+        state: BoardState доски
         column_data: данные колонки из API
         bot: объект Telegram бота
-        full_api_data: полные данные API для поиска новых задач
+        snapshot: снимок доски для поиска новых задач
     """
-    global last_column_state
-    
-    current_count = int(column_data['statisticsFieldValue'])
+    column_name = column_data['name']
+    current_keys = snapshot.issue_keys_in(column_name)
+    total_count = int(column_data['statisticsFieldValue'])
     
     if SHOW_CHECK_STATUS:
-        print(f"📊 Задач в колонке '{MONITORED_COLUMN}': {current_count}")
+        print(f"📊 Задач в колонке '{column_name}' ({state.board_name}): {total_count}")
     
     # Проверяем есть ли предыдущее состояние
-    if MONITORED_COLUMN in last_column_state:
-        old_count = last_column_state[MONITORED_COLUMN]
-        
-        if SHOW_CHECK_STATUS:
-            print(f"📈 Было задач: {old_count}")
+    if column_name in state.column_keys:
+        added_keys, removed_keys = diff_issue_keys(state.column_keys[column_name], current_keys)
         
-        # Если количество задач увеличилось - отправляем уведомление
-        if current_count > old_count:
-            # Получаем данные о новых задачах
-            new_tasks = get_new_tasks_data(column_data, full_api_data)
-            send_notification(bot, old_count, current_count, new_tasks)
+        if added_keys or removed_keys:
+            # Доска меняется - движок будет опрашивать ее чаще
+            state.changed = True
+            if SHOW_CHECK_STATUS:
+                print(f"📈 Добавлено: {len(added_keys)}, убрано: {len(removed_keys)}")
+            
+            # Изменения копятся в окне и уходят одной сводкой (flush_notification);
+            # в базу ключи колонки попадут только после отправки сводки
+            new_tasks = get_tasks_data(snapshot, added_keys)
+            notification_coalescer.add(
+                bot, state.board_name, column_name, new_tasks, removed_keys, total_count, current_keys
+            )
             
     else:
         if DEBUG_MODE:
-            print("🆕 Первая проверка - устанавливаю базовое значение")
+            print(f"🆕 Первая проверка '{column_name}' ({state.board_name}) - устанавливаю базовое значение")
+        state_store.save_column(state.board_name, column_name, current_keys)
     
-    # Обновляем сохраненное состояние
-    last_column_state[MONITORED_COLUMN] = current_count
+    state.column_keys[column_name] = current_keys
 
-def get_new_tasks_data(column_data, full_api_data):
+def get_tasks_data(snapshot, task_keys):
     """
-    Получает данные о задачах из отслеживаемой колонки
+    Получает данные о задачах по их ключам
     
     Args:
-        column_data: данные колонки
-        full_api_data: полные данные API
+        snapshot: снимок доски
+        task_keys: ключи задач
         
     Returns:
         list: список задач с их данными
     """
     tasks = []
-    status_ids = column_data['statusIds']
-    
-    # Проходим по всем задачам и находим те что в нужной колонке
-    for issue in full_api_data['issuesData']['issues']:
-        if issue['statusId'] in status_ids:
-            tasks.append({
-                'key': issue['key'],
-                'summary': issue['summary'],
-                'assignee': issue.get('assigneeName', 'не назначен'),
-                'status_id': issue['statusId']
-            })
+    
+    # Задачи берем из индекса снимка по ключу
+    for task_key in task_keys:
+        issue = snapshot.issue(task_key)
+        if issue is None:
+            continue
+        tasks.append({
+            'key': issue['key'],
+            'summary': issue['summary'],
+            'assignee': issue.get('assigneeName', 'не назначен'),
+            'status_id': issue['statusId']
+        })
     
     return tasks
 
-def send_notification(bot, old_count, new_count, new_tasks_data=None):
+def flush_notification(batch):
+    """
+    Отправляет сводку изменений колонки за окно и запускает по ней одно напоминание
+    
+    Args:
+        batch: NotificationBatch из notification_coalescer
+    """
+    # Только ушедшие задачи - уведомлять не о чем
+    if batch.added:
+        if DEBUG_MODE and batch.events > 1:
+            print(f"📦 Сводка {batch.board_name}/{batch.column_name}: {batch.events} изменений в одном уведомлении")
+        send_notification(
+            batch.bot, list(batch.added.values()), batch.total_count,
+            batch.board_name, batch.column_name, removed_count=len(batch.removed),
+            priority=PRIORITY_DIGEST
+        )
+    
+    # Сводка отправлена - теперь состояние колонки можно сохранить
+    # (при перезапуске до этого момента изменения найдутся снова)
+    if batch.task_keys is not None:
+        state_store.save_column(batch.board_name, batch.column_name, batch.task_keys)
+
+def send_notification(bot, new_tasks_data, total_count, board_name="ARM_QA", column_name=MONITORED_COLUMN, removed_count=0,
+                      priority=PRIORITY_NOTIFICATION):
     """
     Отправляет уведомление о новых задачах с кнопками для просмотра
     
+    Кнопками показываются первые NOTIFICATION_MAX_TASKS задач, остальные
+    перечисляются одной строкой; напоминание запускается для всех задач
+    
     Args:
         bot: объект Telegram бота
-        old_count: предыдущее количество задач
-        new_count: текущее количество задач
-        new_tasks_data: данные о задачах
+        new_tasks_data: данные о задачах, появившихся в колонке
+        total_count: текущее количество задач в колонке
+        board_name: доска
+        column_name: колонка, в которой появились задачи
+        removed_count: сколько задач за то же время ушло из колонки
+        priority: класс приоритета очереди отправки (сводки - PRIORITY_DIGEST)
     """
-    difference = new_count - old_count
+    difference = len(new_tasks_data)
     timestamp = time.strftime('%H:%M:%S %d.%m.%Y')
     
     # Формируем сообщение из шаблона
     message = NOTIFICATION_TEMPLATE.format(
         difference=difference,
-        total_count=new_count,
-        timestamp=timestamp
+        total_count=total_count,
+        timestamp=timestamp,
+        board=board_name,
+        column=column_name
     )
+    if removed_count:
+        message += f"\n📉 Ушло из колонки: {removed_count} задач(и)"
+    
+    shown_tasks = new_tasks_data[:NOTIFICATION_MAX_TASKS]
+    hidden_tasks = new_tasks_data[NOTIFICATION_MAX_TASKS:]
+    if hidden_tasks:
+        hidden_keys = ", ".join(task['key'] for task in hidden_tasks[:NOTIFICATION_MAX_TASKS])
+        if len(hidden_tasks) > NOTIFICATION_MAX_TASKS:
+            hidden_keys += ", ..."
+        message += f"\n➕ И еще {len(hidden_tasks)} задач(и): {hidden_keys}"
     
     if DEBUG_MODE:
         print(f"🚨 НОВЫЕ ЗАДАЧИ! Отправляю уведомление...")
-        print(f"📧 Уведомление: +{difference} задач(и) (всего: {new_count})")
+        print(f"📧 Уведомление: +{difference} задач(и) (всего: {total_count})")
     
     # Создаем кнопки для задач
     markup = types.InlineKeyboardMarkup()
     
-    if new_tasks_data:
-        # Показываем последние добавленные задачи (максимум 5)
-        recent_tasks = new_tasks_data[-difference:] if difference <= len(new_tasks_data) else new_tasks_data[:5]
+    for task in shown_tasks:
+        # Обрезаем длинный текст
+        task_text = task['summary'][:40] + "..." if len(task['summary']) > 40 else task['summary']
         
-        for task in recent_tasks:
-            # Обрезаем длинный текст
-            task_text = task['summary'][:40] + "..." if len(task['summary']) > 40 else task['summary']
-            
-            task_button = types.InlineKeyboardButton(
-                text=f"📋 {task['key']} - {task_text}",
-                callback_data=f"task_{task['key']}"
-            )
-            markup.add(task_button)
+        task_button = types.InlineKeyboardButton(
+            text=f"📋 {task['key']} - {task_text}",
+            callback_data=callback_codec.encode(OP_TASK, task['key'], board_name)
+        )
+        markup.add(task_button)
     
     try:
-        # Отправляем уведомление в рабочий чат
-        bot.send_message(WORK_CHAT_ID, message, reply_markup=markup if new_tasks_data else None)
-         # Запускаем напоминания для новых задач
+        # Ставим уведомление в очередь отправки в рабочий чат
+        bot.with_priority(priority).send_message(
+            WORK_CHAT_ID, message, reply_markup=markup if new_tasks_data else None
+        )
+        # Запускаем напоминания именно для появившихся задач
         if new_tasks_data:
-            start_reminder_for_tasks(bot, [task['key'] for task in recent_tasks])
+            start_reminder_for_tasks(bot, [task['key'] for task in new_tasks_data], board_name, column_name)
         if DEBUG_MODE:
-            print("✅ Уведомление успешно отправлено!")
+            print("✅ Уведомление поставлено в очередь отправки")
             
     except Exception as e:
         if DEBUG_MODE:
@@ -219,17 +553,38 @@ def get_monitoring_status():
     Returns:
         dict: информация о состоянии мониторинга
     """
+    polling = monitoring_engine.status() if monitoring_engine else {}
+    boards = {}
+    for board_name, state in board_states.items():
+        boards[board_name] = {
+            'columns': {
+                column_name: len(state.column_keys.get(column_name, []))
+                for column_name in state.columns
+            },
+            **polling.get(board_name, {}),
+            'sync': get_sync_status(board_name)
+        }
+    
+    applied = webhook_stats['applied']
     return {
-        'monitored_column': MONITORED_COLUMN,
+        'boards': boards,
         'check_interval': CHECK_INTERVAL,
-        'last_known_count': last_column_state.get(MONITORED_COLUMN, 0),
-        'is_active': True
+        'is_active': monitoring_engine is not None,
+        'reminders': reminders.stats(),
+        'telegram': telegram_sender.stats() if telegram_sender else None,
+        'handlers': handler_executor.stats(),
+        'session': get_session_keeper_stats(),
+        'webhook': {
+            'enabled': webhook_server is not None,
+            'events': webhook_stats['events'],
+            'applied': applied,
+            'latency_avg': webhook_stats['latency_sum'] / applied if applied else None,
+            'latency_max': webhook_stats['latency_max']
+        }
     }
 
-def start_reminder_for_tasks(bot, task_keys):
-    """Запускает напоминания для списка задач"""
-    global active_reminders, reminder_readers
-    
+def start_reminder_for_tasks(bot, task_keys, board_name="ARM_QA", column_name=MONITORED_COLUMN):
+    """Запускает напоминания для списка задач, ожидающих в колонке column_name доски board_name"""
     import time
     import uuid
     
@@ -237,74 +592,176 @@ def start_reminder_for_tasks(bot, task_keys):
     reminder_id = str(uuid.uuid4())[:8]
     
     # Сохраняем информацию о напоминании
-    active_reminders[reminder_id] = {
+    added = reminders.add(reminder_id, {
         'task_keys': task_keys,
-        'start_time': time.time(),
-        'active': True
-    }
+        'board': board_name,
+        'column': column_name,
+        'start_time': time.time()
+    })
+    if not added:
+        print(f"⚠️ Напоминание для {len(task_keys)} задач(и) не создано: уже {REMINDER_MAX_ACTIVE} активных напоминаний")
+        return None
     
-    # Инициализируем список взявших задачи для этого напоминания (словарь: задача -> кто взял)
-    reminder_readers[reminder_id] = {}
+    # Планируем первое напоминание
+    schedule_reminder(bot, reminder_id)
     
-    # Запускаем таймер в отдельном потоке
-    def reminder_timer():
-        time.sleep(REMINDER_INTERVAL)
-        if reminder_id in active_reminders and active_reminders[reminder_id]['active']:
-            send_reminder(bot, reminder_id)
+    if DEBUG_MODE:
+        print(f"⏰ Запущено напоминание {reminder_id} для {len(task_keys)} задач(и)")
+    return reminder_id
+
+def schedule_reminder(bot, reminder_id, delay=REMINDER_INTERVAL):
+    """
+    Планирует следующее напоминание примерно через delay секунд
     
-    reminder_thread = threading.Thread(target=reminder_timer, daemon=True)
-    reminder_thread.start()
+    Время округляется вверх до границы тика REMINDER_TICK, поэтому
+    напоминания, срок которых наступает рядом, обрабатываются вместе
+    """
+    reminder = reminders.get_active(reminder_id)
+    if not reminder:
+        return
+    
+    now = time.monotonic()
+    tick_at = math.ceil((now + delay) / REMINDER_TICK) * REMINDER_TICK
+    with reminder_ticks_lock:
+        if tick_at not in reminder_ticks:
+            reminder_ticks[tick_at] = set()
+            reminder_scheduler.schedule(tick_at - now, run_reminder_tick, bot, tick_at)
+        reminder_ticks[tick_at].add(reminder_id)
+        reminder['tick_at'] = tick_at
+    
+    # В базу пишем время по часам системы - оно переживает перезапуск
+    reminder['next_at'] = time.time() + (tick_at - now)
+    state_store.save_reminder(reminder_id, reminder)
+
+def restore_reminders(bot):
+    """
+    Восстанавливает напоминания из базы после перезапуска и заново планирует их
+    
+    Просроченные за время простоя напоминания срабатывают в ближайший тик
+    """
+    restored = 0
+    for saved in state_store.load_reminders():
+        reminder_id = saved['reminder_id']
+        if reminder_id in reminders:
+            continue
+        if saved['board'] not in board_caches:
+            # Доска больше не отслеживается - напоминание по ней не выполнить
+            print(f"⚠️ Напоминание {reminder_id} не восстановлено: доски {saved['board']} нет в настройках")
+            state_store.delete_reminder(reminder_id)
+            continue
+        added = reminders.add(reminder_id, {
+            'task_keys': saved['task_keys'],
+            'board': saved['board'],
+            'column': saved['column'],
+            'start_time': saved['start_time']
+        }, takers=saved['takers'])
+        if not added:
+            print(f"⚠️ Напоминание {reminder_id} не восстановлено: уже {REMINDER_MAX_ACTIVE} активных напоминаний")
+            state_store.delete_reminder(reminder_id)
+            continue
+        
+        delay = REMINDER_INTERVAL
+        if saved['next_at'] is not None:
+            delay = max(0.0, saved['next_at'] - time.time())
+        schedule_reminder(bot, reminder_id, delay)
+        restored += 1
+    
+    if DEBUG_MODE and restored:
+        print(f"♻️ Восстановлено напоминаний: {restored}")
+
+def mark_task_taken(reminder_id, task_key, taker):
+    """Отмечает, что задачу из напоминания взял taker"""
+    if reminders.mark_taken(reminder_id, task_key, taker):
+        state_store.save_taker(reminder_id, task_key, taker)
+
+def run_reminder_tick(bot, tick_at):
+    """
+    Обрабатывает все напоминания тика
+    
+    Снимок каждой доски берется один раз на тик, поэтому нагрузка на Jira
+    не зависит от количества активных напоминаний
+    """
+    with reminder_ticks_lock:
+        reminder_ids = reminder_ticks.pop(tick_at, set())
+    
+    # Группируем напоминания по доскам
+    by_board = {}
+    for reminder_id in reminder_ids:
+        reminder = reminders.get_active(reminder_id)
+        if reminder:
+            by_board.setdefault(reminder['board'], []).append(reminder_id)
+    
+    for board_name, board_reminder_ids in by_board.items():
+        # Ошибка одной доски не должна терять напоминания остальных досок тика
+        try:
+            run_board_reminders(bot, board_name, board_reminder_ids)
+        except Exception as e:
+            print(f"❌ Ошибка тика напоминаний {board_name}: {e}")
+            for reminder_id in board_reminder_ids:
+                schedule_reminder(bot, reminder_id)
+
+def run_board_reminders(bot, board_name, board_reminder_ids):
+    """Обрабатывает напоминания тика по одной доске"""
+    # Получаем актуальные данные (из общего кэша, если он свежий)
+    snapshot = get_board_data(board_name)
     
     if DEBUG_MODE:
-        print(f"⏰ Запущено напоминание {reminder_id} для {len(task_keys)} задач(и)")
+        print(f"⏰ Тик напоминаний {board_name}: {len(board_reminder_ids)} напоминание(й)")
+    
+    for reminder_id in board_reminder_ids:
+        if snapshot:
+            send_reminder(bot, reminder_id, snapshot)
+        else:
+            # Jira недоступна - не теряем напоминание, пробуем в следующий раз
+            if DEBUG_MODE:
+                print(f"❌ Напоминание {reminder_id} отложено: {get_board_error(board_name)}")
+            schedule_reminder(bot, reminder_id)
 
-def send_reminder(bot, reminder_id):
-    """Отправляет напоминание о задачах"""
-    global active_reminders, reminder_readers
+def send_reminder(bot, reminder_id, snapshot):
+    """
+    Отправляет напоминание о задачах
     
-    if reminder_id not in active_reminders or not active_reminders[reminder_id]['active']:
+    Args:
+        bot: объект Telegram бота
+        reminder_id: id напоминания
+        snapshot: снимок доски напоминания, общий для всего тика
+    """
+    reminder = reminders.get_active(reminder_id)
+    if not reminder:
         return
     
     try:
-        # Получаем актуальные данные
-        response = get_desk_api()
-        if not response or response.status_code != 200:
-            return
         
-        current_data = response.json()
-        
-        # Находим колонку "Ожидают тестирования"
-        target_column = find_monitored_column(current_data)
+        # Находим колонку, в которой ждут задачи напоминания
+        target_column = find_monitored_column(snapshot, reminder['column'])
         if not target_column:
+            # Колонки больше нет на доске - задачам некуда вернуться, напоминание завершаем
+            reminders.finish(reminder_id, COMPLETED)
+            state_store.delete_reminder(reminder_id)
+            if DEBUG_MODE:
+                print(f"🛑 Напоминание {reminder_id} остановлено - колонки '{reminder['column']}' нет на доске")
             return
         
         # Получаем задачи которые всё ещё в колонке
-        still_waiting_tasks = []
-        status_ids = target_column['statusIds']
-        
-        for issue in current_data['issuesData']['issues']:
-            if (issue['statusId'] in status_ids and 
-                issue['key'] in active_reminders[reminder_id]['task_keys']):
-                still_waiting_tasks.append({
-                    'key': issue['key'],
-                    'summary': issue['summary']
-                })
+        still_waiting_tasks = get_still_waiting_tasks(
+            snapshot, reminder['task_keys'], reminder['column']
+        )
         
         # Если есть задачи которые всё ещё ждут
         if still_waiting_tasks:
-            elapsed_minutes = int((time.time() - active_reminders[reminder_id]['start_time']) / 60)
+            elapsed_minutes = int((time.time() - reminder['start_time']) / 60)
             
             message = f"⚠️ Возьмите задачу в работу!\n\n"
-            message += f"Задачи ожидают тестирования уже {elapsed_minutes} минут:\n"
+            message += f"Задачи в колонке '{reminder['column']}' уже {elapsed_minutes} минут:\n"
             
             # Добавляем список задач в текст сообщения
             for task in still_waiting_tasks:
                 message += f"📋 {task['key']} - {task['summary']}\n"
             
             # Добавляем информацию о взятых задачах если есть
-            if reminder_id in reminder_readers and reminder_readers[reminder_id]:
+            if reminder['takers']:
                 message += f"\n💼 Взяли в работу:\n"
-                for task_key, taker in reminder_readers[reminder_id].items():
+                for task_key, taker in reminder['takers'].items():
                     message += f"- {task_key}: {taker}\n"
             
             # Создаем кнопки для каждой задачи отдельно
@@ -314,60 +771,68 @@ def send_reminder(bot, reminder_id):
                 task_text = task['summary'][:20] + "..." if len(task['summary']) > 20 else task['summary']
                 take_button = types.InlineKeyboardButton(
                     text=f"💼 Взять {task['key']}",
-                    callback_data=f"take_{task['key']}_reminder_{reminder_id}"
+                    callback_data=callback_codec.encode(OP_TAKE, task['key'], reminder_id)
                 )
                 markup.add(take_button)
             
             # Кнопка "Удалить"
             delete_button = types.InlineKeyboardButton(
                 text="🗑️ Удалить",
-                callback_data=f"delete_{reminder_id}"
+                callback_data=callback_codec.encode(OP_DELETE, reminder_id)
             )
             markup.add(delete_button)
             
-            # Отправляем напоминание
-            bot.send_message(WORK_CHAT_ID, message, reply_markup=markup)
+            # Ставим напоминание в очередь отправки (после ответов на кнопки и уведомлений)
+            bot.with_priority(PRIORITY_REMINDER).send_message(WORK_CHAT_ID, message, reply_markup=markup)
             
             if DEBUG_MODE:
                 print(f"📤 Отправлено напоминание {reminder_id} для {len(still_waiting_tasks)} задач(и)")
             
-            # Запускаем следующий таймер
-            def next_reminder():
-                time.sleep(REMINDER_INTERVAL)
-                if reminder_id in active_reminders and active_reminders[reminder_id]['active']:
-                    send_reminder(bot, reminder_id)
-            
-            reminder_thread = threading.Thread(target=next_reminder, daemon=True)
-            reminder_thread.start()
+            # Планируем следующее напоминание
+            schedule_reminder(bot, reminder_id)
         else:
             # Все задачи ушли из колонки - останавливаем напоминания
-            active_reminders[reminder_id]['active'] = False
+            reminders.finish(reminder_id, COMPLETED)
+            state_store.delete_reminder(reminder_id)
             if DEBUG_MODE:
                 print(f"🛑 Напоминание {reminder_id} остановлено - все задачи взяты в работу")
                 
     except Exception as e:
         if DEBUG_MODE:
             print(f"❌ Ошибка отправки напоминания {reminder_id}: {e}")
+        # Напоминание не теряется: пробуем снова в следующий раз
+        schedule_reminder(bot, reminder_id)
 
-def add_reader_to_reminder(reminder_id, user_name, user_time):
-    """Добавляет пользователя в список прочитавших напоминание"""
-    global reminder_readers
-    
-    if reminder_id not in reminder_readers:
-        reminder_readers[reminder_id] = []
+def compact_reminders():
+    """
+    Периодически удаляет завершенные напоминания старше REMINDER_FINISHED_TTL
     
-    # Проверяем что пользователь еще не добавлен
+    Выполняется планировщиком напоминаний и сам планирует следующий запуск
+    """
+    try:
+        removed = reminders.compact()
+        if DEBUG_MODE and removed:
+            print(f"🧹 Удалено завершенных напоминаний: {removed}")
+    finally:
+        reminder_scheduler.schedule(REMINDER_COMPACT_INTERVAL, compact_reminders)
+
+def add_reader_to_reminder(reminder_id, user_id, user_name, user_time):
+    """Добавляет пользователя в список прочитавших напоминание"""
+    # Повторно пользователь не добавляется (сравнивается id, а не имя и время)
     reader_entry = f"{user_name} ({user_time})"
-    if reader_entry not in reminder_readers[reminder_id]:
-        reminder_readers[reminder_id].append(reader_entry)
+    if reminders.add_reader(reminder_id, user_id, reader_entry):
         if DEBUG_MODE:
             print(f"📖 Добавлен читатель {reader_entry} к напоминанию {reminder_id}")
 
 def stop_reminder(reminder_id):
     """Останавливает напоминание"""
-    global active_reminders
-    
-    if reminder_id in active_reminders:
-        active_reminders[reminder_id]['active'] = False
+    reminder = reminders.finish(reminder_id, STOPPED)
+    if reminder:
+        # Убираем напоминание из ближайшего тика
+        with reminder_ticks_lock:
+            tick = reminder_ticks.get(reminder.get('tick_at'))
+            if tick is not None:
+                tick.discard(reminder_id)
+        state_store.delete_reminder(reminder_id)
         if DEBUG_MODE:
             print(f"🛑 Напоминание {reminder_id} остановлено пользователем")
\ No newline at end of file
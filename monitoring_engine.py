@@ -0,0 +1,303 @@
+# ==============================================
+# ДВИЖОК ОПРОСА НЕСКОЛЬКИХ ДОСОК
+# ==============================================
+# Опрашивает доски параллельно ограниченным пулом потоков.
+# Проверки досок разнесены по времени (staggered): при N досках и
+# интервале T доска i впервые проверяется через i*T/N секунд,
+# поэтому запросы к Jira не приходят одной пачкой,
+# а общее время цикла не растет с количеством досок
+
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BoardState:
+    """
+    Состояние мониторинга одной доски
+    """
+
+    def __init__(self, board_name, columns):
+        """
+        Args:
+            board_name: название доски (ключ из url)
+            columns: названия отслеживаемых колонок
+        """
+        self.board_name = board_name
+        self.columns = list(columns)
+        # Ключи задач каждой колонки при последней проверке
+        self.column_keys = {}
+        # Обработка одной доски выполняется строго последовательно
+        self.lock = threading.Lock()
+        # Проверка выставляет True, если в колонках появились или ушли задачи
+        self.changed = False
+        # Растет с каждым примененным вебхуком: опрос, начатый до вебхука,
+        # не должен перезаписать более свежее состояние колонок
+        self.webhook_seq = 0
+        # Поля ниже меняет только движок
+        self.next_poll_at = 0.0
+        self.in_flight = False
+        self.poll_count = 0
+        self.error_count = 0
+        self.last_poll_at = None
+        self.last_poll_duration = None
+        # Для адаптивного интервала
+        self.current_interval = None
+        self.error_streak = 0
+        self.idle_streak = 0
+        self.last_change_at = None
+        # Задержка обнаружения изменений: не больше промежутка между проверками
+        self.detections = 0
+        self.detection_latency_sum = 0.0
+        self.detection_latency_max = 0.0
+
+
+class MonitoringEngine:
+    """
+    Планировщик опроса досок с ограниченным пулом потоков
+    """
+
+    def __init__(self, states, poll_func, interval, max_workers, clock=time.monotonic,
+                 policy=None, budget=None):
+        """
+        Args:
+            states: список BoardState
+            poll_func: функция poll_func(state) -> True при успешной проверке
+            interval: интервал между проверками одной доски (секунды)
+            max_workers: сколько досок можно опрашивать одновременно
+            clock: источник времени (подменяется в тестах)
+            policy: AdaptivePollPolicy или None - фиксированный интервал
+            budget: RequestBudget общий на все доски или None - без ограничения
+        """
+        self.states = list(states)
+        self.interval = interval
+        self.max_workers = max_workers
+        self._poll_func = poll_func
+        self._clock = clock
+        self.policy = policy
+        self.budget = budget
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._pool = None
+        self._thread = None
+
+    def start(self):
+        """Запускает планировщик и пул опроса"""
+        if self._thread is not None:
+            return
+
+        self._stagger()
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="monitor")
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Останавливает планировщик: текущие проверки досрочно не прерываются,
+        ожидающие очереди в пуле отменяются
+        """
+        self._stop.set()
+        self._notify()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def poll_now(self, board_name):
+        """Просит проверить доску как можно скорее"""
+        with self._lock:
+            for state in self.states:
+                if state.board_name == board_name:
+                    state.next_poll_at = self._clock()
+        self._notify()
+
+    def next_interval(self, state, success):
+        """
+        Через сколько секунд снова проверить доску после проверки
+
+        Args:
+            state: BoardState только что проверенной доски
+            success: успешна ли проверка
+        """
+        if self.policy is not None:
+            return self.policy.next_interval(state, success, self._clock())
+        return self.interval
+
+    def status(self):
+        """
+        Возвращает состояние опроса каждой доски
+
+        Returns:
+            dict: {доска: {poll_count, error_count, last_poll_duration, next_poll_in,
+                  effective_interval, detection_latency_avg, detection_latency_max}}
+        """
+        now = self._clock()
+        with self._lock:
+            return {
+                state.board_name: {
+                    'poll_count': state.poll_count,
+                    'error_count': state.error_count,
+                    'last_poll_duration': state.last_poll_duration,
+                    'next_poll_in': max(0.0, state.next_poll_at - now),
+                    'in_flight': state.in_flight,
+                    'effective_interval': state.current_interval,
+                    'detections': state.detections,
+                    'detection_latency_avg': (
+                        state.detection_latency_sum / state.detections if state.detections else None
+                    ),
+                    'detection_latency_max': state.detection_latency_max
+                }
+                for state in self.states
+            }
+
+    # ============== ОБЩАЯ ЛОГИКА ПЛАНИРОВАНИЯ ==============
+
+    def _stagger(self):
+        # Разносим первые проверки досок равномерно по интервалу
+        now = self._clock()
+        step = self.interval / len(self.states) if self.states else 0
+        for index, state in enumerate(self.states):
+            state.next_poll_at = now + index * step
+
+    def _notify(self):
+        self._wake.set()
+
+    def _take_due(self):
+        """Отмечает и возвращает доски, которые пора проверить"""
+        now = self._clock()
+        with self._lock:
+            due = [
+                state for state in self.states
+                if not state.in_flight and state.next_poll_at <= now
+            ]
+            # Доски сверх бюджета запросов откладываются до появления запроса в бюджете
+            if self.budget is not None:
+                allowed = []
+                for state in due:
+                    if self.budget.try_acquire():
+                        allowed.append(state)
+                    else:
+                        state.next_poll_at = now + self.budget.wait_time()
+                due = allowed
+            for state in due:
+                state.in_flight = True
+            return due
+
+    def _wait_timeout(self):
+        """Сколько ждать до ближайшей проверки (None - все доски сейчас проверяются)"""
+        with self._lock:
+            waiting = [state.next_poll_at for state in self.states if not state.in_flight]
+        return max(0.0, min(waiting) - self._clock()) if waiting else None
+
+    def _begin_poll(self, state):
+        state.changed = False
+        return self._clock()
+
+    def _finish_poll(self, state, started, success):
+        finished = self._clock()
+        with self._lock:
+            previous_poll_at = state.last_poll_at
+            state.poll_count += 1
+            if not success:
+                state.error_count += 1
+                state.error_streak += 1
+            else:
+                state.error_streak = 0
+                if state.changed:
+                    state.idle_streak = 0
+                    state.last_change_at = started
+                    # Изменение произошло где-то между прошлой и этой проверкой
+                    if previous_poll_at is not None:
+                        latency = started - previous_poll_at
+                        state.detections += 1
+                        state.detection_latency_sum += latency
+                        state.detection_latency_max = max(state.detection_latency_max, latency)
+                else:
+                    state.idle_streak += 1
+            state.last_poll_at = started
+            state.last_poll_duration = finished - started
+        interval = self.next_interval(state, success)
+        with self._lock:
+            state.in_flight = False
+            state.current_interval = interval
+            # Отсчет от начала проверки сохраняет разнесение досок по времени
+            state.next_poll_at = max(started + interval, finished)
+        self._notify()
+
+    # ============== РЕЖИМ С ПОТОКАМИ ==============
+
+    def _loop(self):
+        while not self._stop.is_set():
+            for state in self._take_due():
+                self._pool.submit(self._run_poll, state)
+
+            # Спим до ближайшей проверки или до завершения какой-нибудь проверки
+            self._wake.wait(self._wait_timeout())
+            self._wake.clear()
+
+    def _run_poll(self, state):
+        started = self._begin_poll(state)
+        success = False
+        try:
+            success = bool(self._poll_func(state))
+        except Exception as e:
+            print(f"❌ Ошибка проверки доски {state.board_name}: {e}")
+        finally:
+            self._finish_poll(state, started, success)
+
+
+class AsyncMonitoringEngine(MonitoringEngine):
+    """
+    Тот же планировщик для асинхронного режима: проверки досок - задачи
+    в цикле событий, poll_func - корутина poll_func(state) -> bool
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._event_loop = None
+        self._async_wake = None
+        self._semaphore = None
+        self._tasks = set()
+
+    def start(self):
+        """В асинхронном режиме движок запускается через await engine.run()"""
+        raise RuntimeError("AsyncMonitoringEngine запускается через await engine.run()")
+
+    def stop(self):
+        self._stop.set()
+        self._notify()
+
+    def _notify(self):
+        # Может вызываться и из других потоков (например poll_now из обработчика)
+        if self._event_loop is not None:
+            self._event_loop.call_soon_threadsafe(self._async_wake.set)
+
+    async def run(self):
+        """Цикл планировщика; выполняется как задача цикла событий"""
+        self._event_loop = asyncio.get_running_loop()
+        self._async_wake = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(self.max_workers)
+        self._stagger()
+
+        while not self._stop.is_set():
+            for state in self._take_due():
+                task = asyncio.create_task(self._run_poll_async(state))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+            try:
+                await asyncio.wait_for(self._async_wake.wait(), self._wait_timeout())
+            except asyncio.TimeoutError:
+                pass
+            self._async_wake.clear()
+
+    async def _run_poll_async(self, state):
+        async with self._semaphore:
+            started = self._begin_poll(state)
+            success = False
+            try:
+                success = bool(await self._poll_func(state))
+            except Exception as e:
+                print(f"❌ Ошибка проверки доски {state.board_name}: {e}")
+            finally:
+                self._finish_poll(state, started, success)
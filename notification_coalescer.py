@@ -0,0 +1,109 @@
+# ==============================================
+# ОБЪЕДИНЕНИЕ УВЕДОМЛЕНИЙ
+# ==============================================
+# Изменения колонки, найденные за окно window секунд, собираются
+# в одну сводку: когда релиз за две проверки приносит 15 задач,
+# в чат уходит одно уведомление и запускается одно напоминание.
+# Задача, которая успела прийти и уйти в пределах окна, в сводку не попадает.
+# Сводка хранит ключи задач колонки на момент последнего изменения: их
+# сохраняют только после отправки, чтобы после перезапуска посреди окна
+# изменения снова нашлись сравнением с сохраненным состоянием
+
+import threading
+
+
+class NotificationBatch:
+    """
+    Накопленные изменения одной колонки
+    """
+
+    def __init__(self, bot, board_name, column_name):
+        self.bot = bot
+        self.board_name = board_name
+        self.column_name = column_name
+        # Новые задачи в порядке появления: {ключ: данные задачи}
+        self.added = {}
+        # Ушедшие задачи, о которых уже сообщалось раньше
+        self.removed = set()
+        self.total_count = 0
+        # Ключи задач колонки после последнего изменения (None если не переданы)
+        self.task_keys = None
+        self.events = 0
+
+
+class NotificationCoalescer:
+    """
+    Собирает изменения колонок за окно и передает их on_flush одной сводкой
+
+    Использование:
+        coalescer = NotificationCoalescer(60, scheduler, send_digest)
+        coalescer.add(bot, board_name, column_name, new_tasks, removed_keys, total_count)
+        # через 60 секунд: send_digest(batch)
+    """
+
+    def __init__(self, window, scheduler, on_flush):
+        """
+        Args:
+            window: сколько секунд собирать изменения (0 - отправлять сразу)
+            scheduler: TimerScheduler, который выполнит сводку по окончании окна
+            on_flush: функция on_flush(NotificationBatch)
+        """
+        self.window = window
+        self._scheduler = scheduler
+        self._on_flush = on_flush
+        self._lock = threading.Lock()
+        # Открытые окна: {(доска, колонка): NotificationBatch}
+        self._batches = {}
+        self.events = 0
+        self.flushed = 0
+
+    def add(self, bot, board_name, column_name, new_tasks, removed_keys, total_count, task_keys=None):
+        """
+        Добавляет изменения колонки в окно (открывает окно, если его еще нет)
+
+        Args:
+            bot: бот, через который отправить сводку
+            board_name, column_name: колонка
+            new_tasks: данные задач, появившихся в колонке
+            removed_keys: ключи задач, ушедших из колонки
+            total_count: текущее количество задач в колонке
+            task_keys: текущие ключи задач колонки
+        """
+        key = (board_name, column_name)
+        with self._lock:
+            self.events += 1
+            batch = self._batches.get(key)
+            opened = batch is None
+            if opened:
+                batch = NotificationBatch(bot, board_name, column_name)
+                self._batches[key] = batch
+
+            for task in new_tasks:
+                batch.added[task['key']] = task
+                batch.removed.discard(task['key'])
+            for task_key in removed_keys:
+                # Пришла и ушла в пределах окна - сообщать не о чем
+                if batch.added.pop(task_key, None) is None:
+                    batch.removed.add(task_key)
+            batch.total_count = total_count
+            batch.task_keys = task_keys
+            batch.events += 1
+
+        if self.window <= 0:
+            self.flush(board_name, column_name)
+        elif opened:
+            self._scheduler.schedule(self.window, self.flush, board_name, column_name)
+
+    def flush(self, board_name, column_name):
+        """Закрывает окно колонки и передает накопленное в on_flush"""
+        with self._lock:
+            batch = self._batches.pop((board_name, column_name), None)
+            if batch is None:
+                return
+            self.flushed += 1
+        self._on_flush(batch)
+
+    def pending(self):
+        """Сколько окон сейчас открыто"""
+        with self._lock:
+            return len(self._batches)
@@ -0,0 +1,100 @@
+# ==============================================
+# КООРДИНАТОР ОБНОВЛЕНИЯ КУКОВ
+# ==============================================
+# Поток мониторинга и обработчики кнопок могут одновременно получить 401.
+# Координатор гарантирует, что вход в Jira (headless Chrome) выполняется
+# только один раз: остальные потоки ждут его результат.
+# После неудачного входа включается пауза с экспоненциальным ростом,
+# чтобы не запускать браузер в бесконечном цикле
+
+import time
+import threading
+from single_flight import SingleFlight
+
+
+class RefreshCoordinator:
+    """
+    Выполняет не более одного входа в Jira одновременно
+
+    Каждый успешный вход увеличивает номер поколения куков.
+    Поток, получивший 401 на куках поколения N, не запускает новый вход,
+    если к этому моменту кто-то уже получил куки поколения N+1.
+    """
+
+    def __init__(self, login_func, wait_timeout, cooldown_base, cooldown_max, clock=time.monotonic):
+        """
+        Args:
+            login_func: функция входа, возвращает True при успехе
+            wait_timeout: сколько секунд ждать чужой вход
+            cooldown_base: пауза после первой неудачи (секунды)
+            cooldown_max: максимальная пауза после серии неудач (секунды)
+            clock: источник времени (подменяется в тестах)
+        """
+        self._login_func = login_func
+        self.wait_timeout = wait_timeout
+        self.cooldown_base = cooldown_base
+        self.cooldown_max = cooldown_max
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self._generation = 0
+        self._failures = 0
+        self._retry_at = 0.0
+        self.login_count = 0
+
+    @property
+    def generation(self):
+        """Номер поколения текущих куков"""
+        with self._lock:
+            return self._generation
+
+    def refresh(self, seen_generation=None):
+        """
+        Обновляет куки или присоединяется к уже идущему обновлению
+
+        Args:
+            seen_generation: поколение куков, на которых вызывающий получил 401
+
+        Returns:
+            bool: True если свежие куки есть
+        """
+        try:
+            success, _ = self._flight.do(
+                'refresh',
+                lambda: self._run(seen_generation),
+                timeout=self.wait_timeout
+            )
+        except TimeoutError:
+            print(f"⏳ Обновление куков не завершилось за {self.wait_timeout} сек")
+            return False
+        return success
+
+    def _run(self, seen_generation):
+        with self._lock:
+            # Кто-то уже обновил куки после того, как вызывающий их прочитал
+            if seen_generation is not None and self._generation > seen_generation:
+                return True
+
+            # После неудачи выдерживаем паузу, а не запускаем браузер снова
+            wait_left = self._retry_at - self._clock()
+            if wait_left > 0:
+                print(f"⏸️ Обновление куков на паузе ещё {int(wait_left)} сек после неудачи")
+                return False
+
+            self.login_count += 1
+
+        success = False
+        try:
+            success = bool(self._login_func())
+        finally:
+            with self._lock:
+                if success:
+                    self._generation += 1
+                    self._failures = 0
+                    self._retry_at = 0.0
+                else:
+                    self._failures += 1
+                    cooldown = min(self.cooldown_base * 2 ** (self._failures - 1), self.cooldown_max)
+                    self._retry_at = self._clock() + cooldown
+
+        return success
@@ -0,0 +1,187 @@
+# ==============================================
+# РЕЕСТР НАПОМИНАНИЙ
+# ==============================================
+# Хранит напоминания вместе с отметками о взятых задачах и прочитавших.
+# Жизненный цикл: ACTIVE -> STOPPED (остановлено пользователем)
+#                 ACTIVE -> COMPLETED (все задачи ушли из колонки)
+# Завершенные напоминания еще какое-то время доступны кнопкам уже
+# отправленных сообщений, затем удаляются: по сроку finished_ttl при
+# периодическом сжатии (compact) и по LRU, если их больше max_finished.
+# Число активных напоминаний ограничено max_active, прочитавших каждое
+# напоминание - max_readers, поэтому память процесса не растет со временем работы
+
+import time
+import threading
+from collections import OrderedDict
+
+# Состояния напоминания
+ACTIVE = "active"
+STOPPED = "stopped"
+COMPLETED = "completed"
+
+
+class ReminderRegistry:
+    """
+    Напоминания по id: {'task_keys', 'board', 'column', 'start_time', 'state',
+    'takers': {задача: кто взял}, 'readers': {id пользователя: кто прочитал}, ...}
+
+    Использование:
+        registry = ReminderRegistry(max_active=500, finished_ttl=3600, max_finished=1000)
+        registry.add(reminder_id, {'task_keys': [...], 'board': ..., 'column': ..., 'start_time': ...})
+        reminder = registry.get_active(reminder_id)
+        registry.finish(reminder_id, STOPPED)
+        registry.compact()
+    """
+
+    def __init__(self, max_active, finished_ttl, max_finished, max_readers=20, clock=time.monotonic):
+        """
+        Args:
+            max_active: сколько напоминаний может быть активно одновременно
+            finished_ttl: сколько секунд хранить завершенное напоминание
+            max_finished: сколько завершенных напоминаний хранить самое большее
+            max_readers: сколько прочитавших хранить у одного напоминания
+            clock: источник времени
+        """
+        self.max_active = max_active
+        self.finished_ttl = finished_ttl
+        self.max_finished = max_finished
+        self.max_readers = max_readers
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._active = {}
+        # Завершенные напоминания в порядке последнего обращения (в начале - давно не нужные)
+        self._finished = OrderedDict()
+        self.evicted = 0
+        self.rejected = 0
+
+    def __len__(self):
+        """Количество хранимых напоминаний (активных и завершенных)"""
+        with self._lock:
+            return len(self._active) + len(self._finished)
+
+    def __contains__(self, reminder_id):
+        with self._lock:
+            return reminder_id in self._active or reminder_id in self._finished
+
+    def add(self, reminder_id, reminder, takers=None):
+        """
+        Добавляет активное напоминание
+
+        Returns:
+            bool: False если активных напоминаний уже max_active
+        """
+        with self._lock:
+            if reminder_id in self._active:
+                return True
+            if len(self._active) >= self.max_active:
+                self.rejected += 1
+                return False
+            self._finished.pop(reminder_id, None)
+            reminder['state'] = ACTIVE
+            reminder['takers'] = dict(takers or {})
+            reminder['readers'] = {}
+            self._active[reminder_id] = reminder
+            return True
+
+    def get(self, reminder_id):
+        """Напоминание в любом состоянии (None если его нет или оно уже удалено)"""
+        with self._lock:
+            reminder = self._active.get(reminder_id)
+            if reminder is None:
+                reminder = self._finished.get(reminder_id)
+                if reminder is not None:
+                    self._finished.move_to_end(reminder_id)
+            return reminder
+
+    def get_active(self, reminder_id):
+        """Напоминание, если оно активно, иначе None"""
+        with self._lock:
+            return self._active.get(reminder_id)
+
+    def active_ids(self):
+        """Список id активных напоминаний"""
+        with self._lock:
+            return list(self._active)
+
+    def mark_taken(self, reminder_id, task_key, taker):
+        """
+        Отмечает, что задачу взял taker
+
+        Returns:
+            bool: False если напоминания нет
+        """
+        reminder = self.get(reminder_id)
+        if reminder is None:
+            return False
+        reminder['takers'][task_key] = taker
+        return True
+
+    def add_reader(self, reminder_id, reader_id, reader):
+        """
+        Добавляет прочитавшего напоминание
+
+        Один пользователь добавляется один раз, даже если нажал "Прочитано"
+        в другую минуту; сверх max_readers прочитавшие не добавляются
+
+        Args:
+            reader_id: id пользователя Telegram
+            reader: как показать пользователя (например "Иван (10:15)")
+
+        Returns:
+            bool: True если читатель добавлен
+        """
+        with self._lock:
+            reminder = self._active.get(reminder_id)
+            if reminder is None or reader_id in reminder['readers']:
+                return False
+            if len(reminder['readers']) >= self.max_readers:
+                return False
+            reminder['readers'][reader_id] = reader
+            return True
+
+    def finish(self, reminder_id, state=STOPPED):
+        """
+        Переводит активное напоминание в завершенное состояние
+
+        Returns:
+            dict: напоминание или None если оно не было активно
+        """
+        with self._lock:
+            reminder = self._active.pop(reminder_id, None)
+            if reminder is None:
+                return None
+            reminder['state'] = state
+            reminder['finished_at'] = self._clock()
+            self._finished[reminder_id] = reminder
+            while len(self._finished) > self.max_finished:
+                self._finished.popitem(last=False)
+                self.evicted += 1
+            return reminder
+
+    def compact(self):
+        """
+        Удаляет завершенные напоминания старше finished_ttl
+
+        Returns:
+            int: сколько напоминаний удалено
+        """
+        with self._lock:
+            expire_before = self._clock() - self.finished_ttl
+            expired = [
+                reminder_id for reminder_id, reminder in self._finished.items()
+                if reminder['finished_at'] <= expire_before
+            ]
+            for reminder_id in expired:
+                del self._finished[reminder_id]
+            self.evicted += len(expired)
+            return len(expired)
+
+    def stats(self):
+        """Счетчики для get_monitoring_status()"""
+        with self._lock:
+            return {
+                'active': len(self._active),
+                'finished': len(self._finished),
+                'evicted': self.evicted,
+                'rejected': self.rejected
+            }
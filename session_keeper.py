@@ -0,0 +1,203 @@
+# ==============================================
+# ФОНОВОЕ ПОДДЕРЖАНИЕ СЕССИИ JIRA
+# ==============================================
+# Обновляет куки заранее, а не после 401 в момент нажатия кнопки:
+# - если известен срок действия куков - обновляет за SESSION_REFRESH_AHEAD секунд до него
+# - иначе раз в SESSION_CHECK_INTERVAL дешево проверяет сессию запросом /rest/auth/1/session
+# Обновление идет через общий координатор, поэтому не конфликтует с обновлением по 401
+
+import time
+import threading
+from auth_config import JIRA_URL
+from cookie_store import cookie_store
+from cookie_manager import refresh_coordinator
+from jira_session import get_session, set_session_cookies
+from config import (
+    DEBUG_MODE,
+    SESSION_CHECK_INTERVAL,
+    SESSION_REFRESH_AHEAD,
+    SESSION_MAX_AGE,
+    SESSION_PROBE_TIMEOUT
+)
+
+
+class SessionKeeper:
+    """
+    Фоновый поток, который обновляет сессию до того, как она истечет
+    """
+
+    def __init__(self, probe_func, refresh_func, metadata_func,
+                 check_interval, refresh_ahead, max_age=None, clock=time.time):
+        """
+        Args:
+            probe_func: проверка сессии, возвращает False только если сессия точно недействительна
+            refresh_func: обновление куков, возвращает True при успехе
+            metadata_func: возвращает {'issued_at', 'expires_at'} текущих куков
+            check_interval: период проверок (секунды)
+            refresh_ahead: за сколько секунд до истечения обновлять куки
+            max_age: принудительное обновление куков старше max_age (None - не ограничивать)
+            clock: источник времени (подменяется в тестах)
+        """
+        self._probe_func = probe_func
+        self._refresh_func = refresh_func
+        self._metadata_func = metadata_func
+        self.check_interval = check_interval
+        self.refresh_ahead = refresh_ahead
+        self.max_age = max_age
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats = {
+            'probe_count': 0,
+            'probe_failures': 0,
+            'refresh_count': 0,
+            'refresh_failures': 0,
+            'last_refresh_reason': None,
+            'last_refresh_at': None,
+            'last_refresh_duration': None,
+            'total_refresh_duration': 0.0
+        }
+
+    def start(self):
+        """Запускает фоновый поток"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Останавливает фоновый поток"""
+        self._stop.set()
+
+    def stats(self):
+        """
+        Счетчики и длительности обновлений для get_monitoring_status()
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        refreshes = stats['refresh_count'] + stats['refresh_failures']
+        stats['avg_refresh_duration'] = stats['total_refresh_duration'] / refreshes if refreshes else None
+        return stats
+
+    def refresh_reason(self):
+        """
+        Определяет, нужно ли обновить куки сейчас
+
+        Returns:
+            str: причина обновления или None если сессия в порядке
+        """
+        meta = self._metadata_func()
+        now = self._clock()
+
+        expires_at = meta.get('expires_at')
+        if expires_at and expires_at - now <= self.refresh_ahead:
+            return "истекает срок куков"
+
+        issued_at = meta.get('issued_at')
+        if self.max_age and issued_at and now - issued_at >= self.max_age - self.refresh_ahead:
+            return "куки слишком старые"
+
+        with self._lock:
+            self._stats['probe_count'] += 1
+        if not self._probe_func():
+            with self._lock:
+                self._stats['probe_failures'] += 1
+            return "сессия недействительна"
+
+        return None
+
+    def run_once(self):
+        """
+        Одна проверка: при необходимости обновляет куки
+
+        Returns:
+            bool: True если было выполнено обновление
+        """
+        reason = self.refresh_reason()
+        if reason is None:
+            return False
+
+        if DEBUG_MODE:
+            print(f"🔁 Фоновое обновление сессии: {reason}")
+
+        started = time.monotonic()
+        success = self._refresh_func()
+        duration = time.monotonic() - started
+
+        with self._lock:
+            self._stats['refresh_count' if success else 'refresh_failures'] += 1
+            self._stats['last_refresh_reason'] = reason
+            self._stats['last_refresh_at'] = self._clock()
+            self._stats['last_refresh_duration'] = duration
+            self._stats['total_refresh_duration'] += duration
+
+        if DEBUG_MODE:
+            status = "✅ Сессия обновлена" if success else "❌ Не удалось обновить сессию"
+            print(f"{status} за {duration:.1f} сек")
+        return True
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                if DEBUG_MODE:
+                    print(f"❌ Ошибка фоновой проверки сессии: {e}")
+            self._stop.wait(self.check_interval)
+
+
+def probe_session():
+    """
+    Дешевая проверка сессии: GET /rest/auth/1/session без загрузки доски
+
+    Returns:
+        bool: False только если Jira ответила 401 или куков нет.
+              При сетевых ошибках возвращает True - это не повод запускать вход
+    """
+    cookies = cookie_store.load()
+    if cookies is None:
+        return False
+
+    set_session_cookies(cookies)
+    try:
+        response = get_session().get(f"{JIRA_URL}/rest/auth/1/session", timeout=SESSION_PROBE_TIMEOUT)
+    except Exception as e:
+        if DEBUG_MODE:
+            print(f"⚠️ Не удалось проверить сессию: {e}")
+        return True
+
+    return response.status_code != 401
+
+def refresh_session():
+    """Обновляет куки через общий координатор (без паузы на уже идущий вход)"""
+    return refresh_coordinator.refresh(refresh_coordinator.generation)
+
+session_keeper = SessionKeeper(
+    probe_func=probe_session,
+    refresh_func=refresh_session,
+    metadata_func=cookie_store.metadata,
+    check_interval=SESSION_CHECK_INTERVAL,
+    refresh_ahead=SESSION_REFRESH_AHEAD,
+    max_age=SESSION_MAX_AGE
+)
+
+def start_session_keeper():
+    """
+    Запускает фоновое поддержание сессии
+    Вызывается один раз при запуске из main.py
+    """
+    session_keeper.start()
+    if DEBUG_MODE:
+        print(f"✅ Фоновая проверка сессии запущена (каждые {SESSION_CHECK_INTERVAL} секунд)")
+
+def get_session_keeper_stats():
+    """
+    Возвращает статистику обновлений сессии
+
+    Returns:
+        dict: фоновые обновления + общее число входов в Jira (включая обновления по 401)
+    """
+    stats = session_keeper.stats()
+    stats['login_count'] = refresh_coordinator.login_count
+    return stats
@@ -0,0 +1,73 @@
+# ==============================================
+# SINGLE-FLIGHT: ОДНА ОПЕРАЦИЯ НА ВСЕХ ЖДУЩИХ
+# ==============================================
+# Если несколько потоков одновременно запрашивают одно и то же,
+# реальную работу выполняет только первый из них,
+# остальные ждут его завершения и получают тот же результат
+
+import threading
+
+
+class _Flight:
+    """Состояние одной выполняющейся операции"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Объединяет одновременные вызовы с одинаковым ключом в один
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+
+    def do(self, key, func, timeout=None):
+        """
+        Выполняет func() или присоединяется к уже идущему вызову с тем же ключом
+
+        Args:
+            key: ключ операции (например, название доски)
+            func: функция без аргументов, выполняющая реальную работу
+            timeout: сколько ждать чужой вызов (None - без ограничения)
+
+        Returns:
+            tuple: (результат, True если результат получен от чужого вызова)
+
+        Raises:
+            TimeoutError: если чужой вызов не завершился за timeout
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = _Flight()
+                self._flights[key] = flight
+
+        if not is_leader:
+            if not flight.done.wait(timeout):
+                raise TimeoutError(f"Операция '{key}' не завершилась за {timeout} сек")
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result = func()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+        return flight.result, False
+
+    def in_flight(self, key):
+        """Проверяет, выполняется ли сейчас операция с этим ключом"""
+        with self._lock:
+            return key in self._flights
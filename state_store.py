@@ -0,0 +1,207 @@
+# ==============================================
+# ХРАНИЛИЩЕ СОСТОЯНИЯ МОНИТОРИНГА (SQLite)
+# ==============================================
+# Сохраняет между перезапусками:
+# - ключи задач отслеживаемых колонок (базу для сравнения)
+# - активные напоминания и время их следующего срабатывания
+# - кто взял задачи из напоминаний
+# После перезапуска мониторинг сравнивает доску с сохраненным состоянием
+# и замечает задачи, появившиеся пока бот не работал.
+#
+# База в режиме WAL. Изменения копятся в памяти (последнее изменение
+# записи побеждает) и записываются одной транзакцией раз в flush_interval
+
+import json
+import time
+import atexit
+import sqlite3
+import threading
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS column_state (
+    board TEXT NOT NULL,
+    column_name TEXT NOT NULL,
+    task_keys TEXT NOT NULL,
+    PRIMARY KEY (board, column_name)
+);
+CREATE TABLE IF NOT EXISTS reminders (
+    reminder_id TEXT PRIMARY KEY,
+    board TEXT NOT NULL,
+    column_name TEXT NOT NULL,
+    task_keys TEXT NOT NULL,
+    start_time REAL NOT NULL,
+    next_at REAL
+);
+CREATE TABLE IF NOT EXISTS reminder_takers (
+    reminder_id TEXT NOT NULL,
+    task_key TEXT NOT NULL,
+    taker TEXT NOT NULL,
+    PRIMARY KEY (reminder_id, task_key)
+);
+"""
+
+
+class StateStore:
+    """
+    Персистентное состояние мониторинга и напоминаний
+    """
+
+    def __init__(self, path, flush_interval=1.0):
+        """
+        Args:
+            path: файл базы SQLite
+            flush_interval: как часто записывать накопленные изменения (секунды)
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self._db_lock = threading.Lock()
+        # Накопленные изменения: {(таблица, ключ): [(SQL, параметры), ...]}
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        atexit.register(self.flush)
+
+    # ============== ЧТЕНИЕ ПРИ ЗАПУСКЕ ==============
+
+    def load_column_states(self):
+        """
+        Returns:
+            dict: {доска: {колонка: [ключи задач]}}
+        """
+        states = {}
+        with self._db_lock:
+            rows = self._db.execute("SELECT board, column_name, task_keys FROM column_state").fetchall()
+        for board, column_name, task_keys in rows:
+            states.setdefault(board, {})[column_name] = json.loads(task_keys)
+        return states
+
+    def load_reminders(self):
+        """
+        Returns:
+            list: напоминания {'reminder_id', 'board', 'column', 'task_keys',
+                  'start_time', 'next_at', 'takers': {задача: кто взял}}
+        """
+        with self._db_lock:
+            rows = self._db.execute(
+                "SELECT reminder_id, board, column_name, task_keys, start_time, next_at FROM reminders"
+            ).fetchall()
+            taker_rows = self._db.execute(
+                "SELECT reminder_id, task_key, taker FROM reminder_takers"
+            ).fetchall()
+
+        takers = {}
+        for reminder_id, task_key, taker in taker_rows:
+            takers.setdefault(reminder_id, {})[task_key] = taker
+
+        return [
+            {
+                'reminder_id': reminder_id,
+                'board': board,
+                'column': column_name,
+                'task_keys': json.loads(task_keys),
+                'start_time': start_time,
+                'next_at': next_at,
+                'takers': takers.get(reminder_id, {})
+            }
+            for reminder_id, board, column_name, task_keys, start_time, next_at in rows
+        ]
+
+    # ============== ИЗМЕНЕНИЯ ==============
+
+    def save_column(self, board, column_name, task_keys):
+        """Запоминает ключи задач колонки"""
+        self._queue(('column', board, column_name), [(
+            "INSERT OR REPLACE INTO column_state (board, column_name, task_keys) VALUES (?, ?, ?)",
+            (board, column_name, json.dumps(list(task_keys), ensure_ascii=False))
+        )])
+
+    def save_reminder(self, reminder_id, reminder):
+        """Запоминает напоминание (словарь из monitor.reminders)"""
+        self._queue(('reminder', reminder_id), [(
+            "INSERT OR REPLACE INTO reminders "
+            "(reminder_id, board, column_name, task_keys, start_time, next_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (reminder_id, reminder['board'], reminder['column'],
+             json.dumps(list(reminder['task_keys']), ensure_ascii=False),
+             reminder['start_time'], reminder.get('next_at'))
+        )])
+
+    def save_taker(self, reminder_id, task_key, taker):
+        """Запоминает, кто взял задачу из напоминания"""
+        self._queue(('taker', reminder_id, task_key), [(
+            "INSERT OR REPLACE INTO reminder_takers (reminder_id, task_key, taker) VALUES (?, ?, ?)",
+            (reminder_id, task_key, taker)
+        )])
+
+    def delete_reminder(self, reminder_id):
+        """Удаляет остановленное напоминание вместе с отметками о взятых задачах"""
+        with self._pending_lock:
+            # Несохраненные изменения этого напоминания больше не нужны
+            for key in [key for key in self._pending if key[0] != 'column' and key[1] == reminder_id]:
+                del self._pending[key]
+            self._pending[('delete', reminder_id)] = [
+                ("DELETE FROM reminders WHERE reminder_id = ?", (reminder_id,)),
+                ("DELETE FROM reminder_takers WHERE reminder_id = ?", (reminder_id,))
+            ]
+        self._wake.set()
+
+    def _queue(self, key, statements):
+        with self._pending_lock:
+            # Напоминание создано заново после удаления - удаление уже не нужно
+            if key[0] in ('reminder', 'taker'):
+                self._pending.pop(('delete', key[1]), None)
+            self._pending[key] = statements
+        self._wake.set()
+
+    # ============== ЗАПИСЬ ==============
+
+    def flush(self):
+        """
+        Записывает накопленные изменения одной транзакцией
+
+        Returns:
+            int: сколько изменений записано
+        """
+        with self._pending_lock:
+            pending = self._pending
+            self._pending = {}
+        if not pending:
+            return 0
+
+        with self._db_lock:
+            self._db.execute("BEGIN")
+            try:
+                for statements in pending.values():
+                    for sql, params in statements:
+                        self._db.execute(sql, params)
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                # Возвращаем изменения, чтобы записать их при следующей попытке
+                with self._pending_lock:
+                    for key, statements in pending.items():
+                        self._pending.setdefault(key, statements)
+                raise
+        return len(pending)
+
+    def start(self):
+        """Запускает фоновую запись изменений"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"❌ Ошибка сохранения состояния: {e}")
+            # Изменения за flush_interval попадут в одну транзакцию
+            time.sleep(self.flush_interval)
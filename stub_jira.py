@@ -0,0 +1,164 @@
+# ==============================================
+# ЗАГЛУШКА JIRA ДЛЯ ТЕСТОВ
+# ==============================================
+# Локальный HTTP-сервер вместо Jira и тестовые переменные окружения,
+# без которых config.py завершает процесс. Тесты импортируют этот модуль
+# раньше модулей бота:
+#     from stub_jira import StubJira
+#     import get_desk_api
+
+import os
+import json
+import time
+import socket
+import threading
+from urllib.parse import urlsplit
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Обязательные настройки config.py и auth_config.py (настоящие значения из .env не трогаем)
+os.environ.setdefault("BOT_TOKEN", "123456:TEST")
+os.environ.setdefault("WORK_CHAT_ID", "-100")
+os.environ.setdefault("JIRA_LOGIN", "tester")
+os.environ.setdefault("JIRA_PASSWORD", "secret")
+
+# Куки, которые заглушка считает действующими
+VALID_COOKIES = {"JSESSIONID": "stub-session"}
+
+
+def stub_board(issue_count=3):
+    """Маленький ответ доски в формате Jira Agile"""
+    columns = [
+        {'name': "Ожидают тестирования", 'statusIds': ["1"]},
+        {'name': "Тестирование", 'statusIds': ["2"]},
+    ]
+    issues = [
+        {'key': f"UGC-{number}", 'summary': f"Задача {number}", 'statusId': "1", 'assigneeName': None}
+        for number in range(1, issue_count + 1)
+    ]
+    return {'columnsData': {'columns': columns}, 'issuesData': {'issues': issues}}
+
+
+class StubRequest:
+    """Запрос, пришедший в заглушку"""
+
+    def __init__(self, method, path, query, headers, body):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers
+        self.body = body
+
+
+class StubJira:
+    """
+    HTTP-сервер на 127.0.0.1 со случайным портом
+
+    Ответ на путь задается функцией route: request -> (статус, заголовки, тело).
+    По умолчанию /board отдает stub_board() с задержкой delay.
+    Сервер поддерживает keep-alive и считает принятые соединения;
+    connect_delay - пауза на каждом новом соединении (имитация TCP+TLS рукопожатия
+    с настоящей Jira)
+
+    Использование:
+        with StubJira() as jira:
+            requests.get(jira.url("/board"))
+    """
+
+    def __init__(self, board=None, delay=0.0, connect_delay=0.0):
+        self.connect_delay = connect_delay
+        self.routes = {}
+        self.requests = []
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+        body = json.dumps(board or stub_board(), ensure_ascii=False)
+        self.route("/board", lambda request: (200, {"Content-Type": "application/json"}, body), delay)
+
+    def route(self, path, respond, delay=0.0):
+        """Задает ответ на путь (delay - пауза перед ответом, секунды)"""
+        self.routes[path] = (respond, delay)
+
+    def url(self, path="/board"):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}{path}"
+
+    def start(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                # Заголовки и тело уходят отдельными записями - без TCP_NODELAY
+                # keep-alive запросы ждали бы задержанного ACK (~40 мс)
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                with stub._lock:
+                    stub.connections += 1
+                if stub.connect_delay:
+                    time.sleep(stub.connect_delay)
+
+            def do_GET(self):
+                self._respond()
+
+            def do_POST(self):
+                self._respond()
+
+            def _read_body(self):
+                if self.headers.get("Transfer-Encoding", "").lower() != "chunked":
+                    return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                # aiohttp отправляет формы кусками без Content-Length
+                body = b""
+                while True:
+                    size = int(self.rfile.readline().split(b";")[0], 16)
+                    chunk = self.rfile.read(size + 2)[:size]
+                    if not size:
+                        return body
+                    body += chunk
+
+            def _respond(self):
+                parts = urlsplit(self.path)
+                request = StubRequest(self.command, parts.path, parts.query, self.headers, self._read_body())
+                with stub._lock:
+                    stub.requests.append(request)
+
+                respond, delay = stub.routes.get(parts.path, (lambda request: (404, {}, ""), 0.0))
+                if delay:
+                    time.sleep(delay)
+                status, headers, body = respond(request)
+                data = body.encode('utf-8') if isinstance(body, str) else body
+                self.send_response(status)
+                for name, value in headers.items():
+                    if isinstance(value, (list, tuple)):
+                        for item in value:
+                            self.send_header(name, item)
+                    else:
+                        self.send_header(name, value)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        class Server(ThreadingHTTPServer):
+            # Очередь на accept для одновременных соединений в нагрузочных тестах
+            request_queue_size = 128
+
+        self._server = Server(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,286 @@
+# ==============================================
+# ОЧЕРЕДЬ ОТПРАВКИ СООБЩЕНИЙ В TELEGRAM
+# ==============================================
+# Все исходящие сообщения (отправка, редактирование, удаление) проходят
+# через одну очередь с приоритетами. Отдельный поток отправляет их,
+# соблюдая ограничения Telegram:
+# - всего не больше ~30 сообщений в секунду
+# - в один чат не больше ~1 сообщения в секунду
+# - в одну группу не больше 20 сообщений в минуту (кроме ответов на кнопки:
+#   иначе пачка уведомлений задерживала бы их на секунды)
+# Вызывающий код только ставит сообщение в очередь и не ждет отправки.
+# При 429 сообщение возвращается в начало очереди, а чат ждет retry_after
+
+import time
+import threading
+from collections import deque
+from concurrent.futures import Future
+from adaptive_polling import RequestBudget
+
+# Классы приоритета (меньше - важнее)
+PRIORITY_INTERACTIVE = 0   # ответы на кнопки и команды
+PRIORITY_NOTIFICATION = 1  # уведомления о новых задачах
+PRIORITY_REMINDER = 2      # напоминания
+PRIORITY_DIGEST = 3        # сводки
+PRIORITIES = (PRIORITY_INTERACTIVE, PRIORITY_NOTIFICATION, PRIORITY_REMINDER, PRIORITY_DIGEST)
+
+# Методы бота, которые отправляются через очередь
+QUEUED_METHODS = ('send_message', 'edit_message_text', 'edit_message_reply_markup', 'delete_message')
+
+
+def retry_after(error):
+    """
+    Пауза из ответа 429 Telegram (ApiTelegramException)
+
+    Returns:
+        float: секунды или None если это не ограничение частоты
+    """
+    if getattr(error, 'error_code', None) != 429:
+        return None
+    result_json = getattr(error, 'result_json', None) or {}
+    return float((result_json.get('parameters') or {}).get('retry_after', 1))
+
+
+class _Outgoing:
+    """Сообщение в очереди: вызов метода бота и Future с его результатом"""
+
+    __slots__ = ('priority', 'chat_id', 'method', 'args', 'kwargs', 'future', 'attempts')
+
+    def __init__(self, priority, chat_id, method, args, kwargs):
+        self.priority = priority
+        self.chat_id = chat_id
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs
+        self.future = Future()
+        self.attempts = 0
+
+
+class TelegramSender:
+    """
+    Очередь исходящих сообщений с приоритетами и ограничением частоты
+
+    Использование:
+        sender = TelegramSender(bot)
+        sender.start()
+        future = sender.submit(PRIORITY_REMINDER, 'send_message', chat_id, text)
+        sender.submit(PRIORITY_INTERACTIVE, 'edit_message_text', text, chat_id=chat_id, message_id=message_id)
+    """
+
+    def __init__(self, bot, global_per_second=30, chat_per_second=1, group_per_minute=20,
+                 max_queue=1000, max_retries=5, clock=time.monotonic):
+        """
+        Args:
+            bot: TeleBot (или SyncBotBridge в асинхронном режиме)
+            global_per_second: сколько сообщений в секунду отправлять всего
+            chat_per_second: сколько сообщений в секунду отправлять в один чат
+            group_per_minute: сколько сообщений в минуту отправлять в одну группу
+            max_queue: сколько сообщений может ждать в очереди
+            max_retries: сколько раз повторять сообщение после 429
+            clock: источник времени
+        """
+        self._bot = bot
+        self.chat_per_second = chat_per_second
+        self.group_per_minute = group_per_minute
+        self.max_queue = max_queue
+        self.max_retries = max_retries
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._queues = {priority: deque() for priority in PRIORITIES}
+        self._size = 0
+        self._global = RequestBudget(global_per_second * 60, clock, burst=1)
+        # Ограничения чатов: {chat_id: [RequestBudget, ...]}
+        self._chat_budgets = {}
+        # Чаты, получившие 429: {chat_id: время, до которого не отправлять}
+        self._blocked_until = {}
+        self._thread = None
+        self._stop = False
+        self.sent = 0
+        self.dropped = 0
+        self.rate_limited = 0
+
+    def __len__(self):
+        """Сколько сообщений ждет отправки"""
+        with self._cond:
+            return self._size
+
+    def submit(self, priority, method, *args, **kwargs):
+        """
+        Ставит вызов bot.<method>(*args, **kwargs) в очередь
+
+        Чат берется из аргумента chat_id, а если его нет - из первого аргумента
+
+        Returns:
+            Future: результат вызова (или исключение, если отправить не удалось)
+        """
+        chat_id = kwargs['chat_id'] if 'chat_id' in kwargs else args[0]
+        item = _Outgoing(priority, chat_id, method, args, kwargs)
+        with self._cond:
+            if self._size >= self.max_queue and not self._evict_for(priority):
+                self.dropped += 1
+                item.future.set_exception(RuntimeError("Очередь отправки в Telegram переполнена"))
+                print(f"⚠️ Очередь отправки переполнена - сообщение в чат {chat_id} пропущено")
+                return item.future
+            self._queues[priority].append(item)
+            self._size += 1
+            self._cond.notify()
+        return item.future
+
+    def start(self):
+        """Запускает поток отправки"""
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._stop = False
+            self._thread = threading.Thread(target=self._loop, daemon=True, name="telegram-sender")
+            self._thread.start()
+
+    def stop(self):
+        """Останавливает поток отправки (неотправленные сообщения остаются в очереди)"""
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            thread.join()
+
+    def stats(self):
+        """Счетчики для get_monitoring_status()"""
+        with self._cond:
+            return {
+                'queued': self._size,
+                'sent': self.sent,
+                'dropped': self.dropped,
+                'rate_limited': self.rate_limited
+            }
+
+    def _evict_for(self, priority):
+        # Освобождаем место, выбрасывая самое новое сообщение наименее важного класса
+        for lower in reversed(PRIORITIES):
+            if lower < priority:
+                return False
+            if self._queues[lower]:
+                item = self._queues[lower].pop()
+                self._size -= 1
+                self.dropped += 1
+                item.future.set_exception(RuntimeError("Сообщение вытеснено из очереди отправки"))
+                return True
+        return False
+
+    def _budgets(self, chat_id, priority):
+        budgets = self._chat_budgets.get(chat_id)
+        if budgets is None:
+            budgets = [RequestBudget(self.chat_per_second * 60, self._clock, burst=1)]
+            # У групп и каналов отрицательный id - для них еще и минутное ограничение
+            if str(chat_id).startswith('-'):
+                budgets.append(RequestBudget(self.group_per_minute, self._clock, burst=1))
+            self._chat_budgets[chat_id] = budgets
+        # Ответы на кнопки не ждут минутного ограничения группы и не расходуют его
+        if priority == PRIORITY_INTERACTIVE:
+            return budgets[:1]
+        return budgets
+
+    def _chat_wait(self, chat_id, priority, now):
+        wait = self._blocked_until.get(chat_id, now) - now
+        for budget in self._budgets(chat_id, priority):
+            wait = max(wait, budget.wait_time())
+        return wait
+
+    def _take_ready(self):
+        """
+        Выбирает самое важное сообщение, чат которого можно отправлять сейчас
+
+        Сообщения одного чата внутри класса приоритета уходят по порядку.
+
+        Returns:
+            tuple: (сообщение или None, сколько ждать до следующей попытки или None)
+        """
+        if self._size == 0:
+            return None, None
+        global_wait = self._global.wait_time()
+        if global_wait > 0:
+            return None, global_wait
+
+        now = self._clock()
+        waits = {}
+        for priority in PRIORITIES:
+            queue = self._queues[priority]
+            for index, item in enumerate(queue):
+                if item.chat_id in waits:
+                    continue
+                wait = self._chat_wait(item.chat_id, priority, now)
+                if wait <= 0:
+                    del queue[index]
+                    self._size -= 1
+                    self._global.try_acquire()
+                    for budget in self._budgets(item.chat_id, priority):
+                        budget.try_acquire()
+                    self._blocked_until.pop(item.chat_id, None)
+                    return item, None
+                waits[item.chat_id] = wait
+        return None, min(waits.values())
+
+    def _send(self, item):
+        try:
+            result = getattr(self._bot, item.method)(*item.args, **item.kwargs)
+        except Exception as e:
+            pause = retry_after(e)
+            item.attempts += 1
+            if pause is not None and item.attempts <= self.max_retries:
+                with self._cond:
+                    self.rate_limited += 1
+                    self._blocked_until[item.chat_id] = self._clock() + pause
+                    # Возвращаем в начало очереди, чтобы не нарушить порядок сообщений чата
+                    self._queues[item.priority].appendleft(item)
+                    self._size += 1
+                print(f"⏳ Telegram ограничил частоту в чате {item.chat_id} - повтор через {pause:g} сек")
+                return
+            print(f"❌ Ошибка {item.method} в чат {item.chat_id}: {e}")
+            item.future.set_exception(e)
+            return
+
+        with self._cond:
+            self.sent += 1
+        item.future.set_result(result)
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._stop:
+                        return
+                    item, wait = self._take_ready()
+                    if item is not None:
+                        break
+                    self._cond.wait(wait)
+            self._send(item)
+
+
+class QueuedBot:
+    """
+    Бот, у которого отправка сообщений идет через TelegramSender
+
+    send_message, edit_message_text, edit_message_reply_markup и delete_message
+    ставятся в очередь с приоритетом этого объекта и возвращают Future.
+    Остальные методы (регистрация обработчиков, answer_callback_query, polling)
+    вызываются у исходного бота напрямую
+    """
+
+    def __init__(self, bot, sender, priority=PRIORITY_INTERACTIVE):
+        self._bot = bot
+        self._sender = sender
+        self._priority = priority
+
+    def with_priority(self, priority):
+        """Тот же бот, но сообщения ставятся в очередь с приоритетом priority"""
+        return QueuedBot(self._bot, self._sender, priority)
+
+    def __getattr__(self, name):
+        if name not in QUEUED_METHODS:
+            return getattr(self._bot, name)
+
+        def enqueue(*args, **kwargs):
+            return self._sender.submit(self._priority, name, *args, **kwargs)
+
+        return enqueue
@@ -0,0 +1,129 @@
+# ==============================================
+# ТЕСТ АДАПТИВНОГО ИНТЕРВАЛА ОПРОСА
+# ==============================================
+# Проверяет рост интервала при ошибках и простое, возврат после
+# успешной проверки и изменений, рабочие часы, а также пополнение
+# и исчерпание бюджета запросов
+
+import time
+from adaptive_polling import AdaptivePollPolicy, RequestBudget
+from monitoring_engine import BoardState
+
+class FakeClock:
+    """Управляемые часы: время идет только по команде теста"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def local_time(text):
+    """Местное время для проверки рабочих часов, например "2026-10-19 11:00" (понедельник)"""
+    return lambda: time.strptime(text, "%Y-%m-%d %H:%M")
+
+def make_policy(localtime=local_time("2026-10-18 11:00")):
+    # По умолчанию воскресенье - нерабочее время
+    return AdaptivePollPolicy(
+        base_interval=300, min_interval=30, working_interval=60, max_interval=1800,
+        backoff_factor=2, idle_polls_per_step=3, recent_change_window=600,
+        working_hours=(10, 19), localtime=localtime
+    )
+
+def test_error_backoff_and_recovery():
+    """
+    Каждая ошибка подряд удваивает паузу до max_interval;
+    первая успешная проверка возвращает обычный интервал
+    """
+    print("🧪 Пауза при ошибках и восстановление...")
+    policy = make_policy()
+    state = BoardState("ARM_QA", ["Тестирование"])
+
+    intervals = []
+    for _ in range(6):
+        state.error_streak += 1
+        intervals.append(policy.next_interval(state, False, now=0))
+    assert intervals == [300, 600, 1200, 1800, 1800, 1800]
+
+    state.error_streak = 0
+    assert policy.next_interval(state, True, now=0) == 300
+    print("✅ Пауза растет и сбрасывается")
+
+def test_idle_growth_and_change():
+    """
+    Без изменений интервал растет каждые idle_polls_per_step проверок;
+    изменение в колонке сразу возвращает min_interval на recent_change_window
+    """
+    print("🧪 Простой и изменения...")
+    policy = make_policy()
+    state = BoardState("ARM_QA", ["Тестирование"])
+
+    intervals = []
+    for idle_streak in (0, 2, 3, 6, 9, 30):
+        state.idle_streak = idle_streak
+        intervals.append(policy.next_interval(state, True, now=5000))
+    assert intervals == [300, 300, 600, 1200, 1800, 1800]
+
+    state.idle_streak = 0
+    state.last_change_at = 5000
+    assert policy.next_interval(state, True, now=5100) == 30
+    assert policy.next_interval(state, True, now=5599) == 30
+    # Окно частого опроса закончилось
+    assert policy.next_interval(state, True, now=5600) == 300
+    print("✅ Интервал следует за активностью доски")
+
+def test_working_hours():
+    """
+    В рабочие часы будних дней опрос чаще и при простое не реже base_interval
+    """
+    print("🧪 Рабочие часы...")
+    state = BoardState("ARM_QA", ["Тестирование"])
+
+    monday_day = make_policy(local_time("2026-10-19 11:00"))
+    monday_evening = make_policy(local_time("2026-10-19 19:00"))
+    saturday_day = make_policy(local_time("2026-10-24 11:00"))
+    assert monday_day.is_working_time()
+    assert not monday_evening.is_working_time() and not saturday_day.is_working_time()
+
+    assert monday_day.next_interval(state, True, now=0) == 60
+    state.idle_streak = 30
+    assert monday_day.next_interval(state, True, now=0) == 300
+    assert saturday_day.next_interval(state, True, now=0) == 1800
+
+    no_hours = AdaptivePollPolicy(300, 30, 60, 1800, working_hours=None)
+    assert not no_hours.is_working_time()
+    print("✅ Рабочие часы учитываются")
+
+def test_budget_exhaustion_and_refill():
+    """
+    30 запросов в минуту: запас расходуется подряд, затем запрос
+    появляется раз в 2 секунды; запас не превышает burst
+    """
+    print("🧪 Бюджет запросов...")
+    clock = FakeClock()
+    budget = RequestBudget(30, clock=clock)
+
+    assert sum(budget.try_acquire() for _ in range(40)) == 30
+    assert budget.wait_time() == 2.0
+
+    clock.now += 1
+    assert not budget.try_acquire()
+    assert budget.wait_time() == 1.0
+    clock.now += 1
+    assert budget.try_acquire()
+    assert not budget.try_acquire()
+
+    # Долгий простой не копит больше burst запросов
+    clock.now += 3600
+    assert sum(budget.try_acquire() for _ in range(40)) == 30
+
+    small = RequestBudget(6, clock=clock, burst=2)
+    assert [small.try_acquire() for _ in range(3)] == [True, True, False]
+    assert small.wait_time() == 10.0
+    print("✅ Бюджет расходуется и пополняется")
+
+if __name__ == "__main__":
+    test_error_backoff_and_recovery()
+    test_idle_growth_and_change()
+    test_working_hours()
+    test_budget_exhaustion_and_refill()
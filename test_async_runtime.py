@@ -0,0 +1,167 @@
+# ==============================================
+# ТЕСТ АСИНХРОННОГО РЕЖИМА
+# ==============================================
+# Асинхронный клиент Jira и бот (AsyncTeleBot + SyncBotBridge + bot_handlers)
+# против локальных заглушек Jira и Telegram Bot API:
+# - одновременные загрузки доски через aiohttp
+# - 200 одновременных нажатий на 40 сообщений: пропускная способность
+#   и ответ Telegram на каждое нажатие
+
+import os
+import time
+import asyncio
+import tempfile
+from urllib.parse import parse_qs
+from concurrent.futures import ThreadPoolExecutor
+from stub_jira import StubJira, stub_board, VALID_COOKIES
+from telebot import types, asyncio_helper
+from telebot.async_telebot import AsyncTeleBot
+from get_desk_api import url, board_caches, circuit_breaker
+from board_cache import BoardCache
+from cookie_store import cookie_store
+from async_jira import AsyncJiraClient
+from async_runtime import SyncBotBridge
+from bot_handlers import setup_handlers, handler_executor
+from callback_codec import callback_codec, OP_TASK
+from config import JIRA_POOL_SIZE, ASYNC_HANDLER_WORKERS
+
+TOKEN = "123:TEST"
+MESSAGES = 40
+PRESSES = 200
+
+def with_stub_board(test):
+    """Доска ARM_QA загружается с заглушки Jira, куки - во временном файле"""
+    def run():
+        saved_url = url.get("ARM_QA")
+        saved_cache = board_caches.get("ARM_QA")
+        saved_path = cookie_store.path
+        sync_loads = []
+        with tempfile.TemporaryDirectory() as directory, StubJira(board=stub_board(MESSAGES)) as jira:
+            cookie_store.path = os.path.join(directory, 'cookies.json')
+            cookie_store.save(VALID_COOKIES)
+            url["ARM_QA"] = jira.url()
+            # Синхронных загрузок быть не должно - доску грузит асинхронный клиент
+            board_caches["ARM_QA"] = BoardCache("ARM_QA", sync_loads.append, ttl=60)
+            try:
+                test(jira)
+            finally:
+                url["ARM_QA"] = saved_url
+                board_caches["ARM_QA"] = saved_cache
+                cookie_store.path = saved_path
+        assert sync_loads == []
+    run.__name__ = test.__name__
+    run.__doc__ = test.__doc__
+    return run
+
+def test_async_fetch_board():
+    """
+    50 одновременных загрузок доски через aiohttp: все успешны,
+    снимок в общем кэше, соединений не больше JIRA_POOL_SIZE
+    """
+    print("🧪 Одновременные загрузки доски через aiohttp...")
+
+    @with_stub_board
+    def check(jira):
+        async def scenario():
+            client = AsyncJiraClient()
+            try:
+                started = time.perf_counter()
+                results = await asyncio.gather(*(client.fetch_board("ARM_QA") for _ in range(50)))
+                return results, time.perf_counter() - started
+            finally:
+                await client.close()
+
+        results, elapsed = asyncio.run(scenario())
+        print(f"📊 50 загрузок за {elapsed * 1000:.0f} мс, соединений: {jira.connections}")
+        assert all(result.ok and snapshot is not None for snapshot, result in results)
+        assert board_caches["ARM_QA"].peek().issue_keys_in("Ожидают тестирования")[-1] == f"UGC-{MESSAGES}"
+        assert jira.connections <= JIRA_POOL_SIZE
+        assert circuit_breaker.allow()
+
+    check()
+    print("✅ Доска загружена")
+
+def callback_update(number, data, message_id):
+    return types.Update.de_json({
+        'update_id': number,
+        'callback_query': {
+            'id': str(number),
+            'from': {'id': 7, 'is_bot': False, 'first_name': "Иван"},
+            'chat_instance': "1",
+            'data': data,
+            'message': {'message_id': message_id, 'date': 0, 'chat': {'id': -100, 'type': "group"}}
+        }
+    })
+
+def test_callback_throughput():
+    """
+    200 нажатий на 40 сообщений через AsyncTeleBot: каждое нажатие получает
+    ровно один ответ Telegram - либо экран, либо ответ на отмененное нажатие
+    """
+    print("🧪 Нагрузка: 200 нажатий в асинхронном режиме...")
+
+    @with_stub_board
+    def check(jira):
+        # Заглушка Telegram Bot API: редактирование и ответ на нажатие всегда успешны
+        telegram = StubJira()
+        ok = lambda request: (200, {"Content-Type": "application/json"}, '{"ok": true, "result": true}')
+        telegram.route(f"/bot{TOKEN}/editMessageText", ok)
+        telegram.route(f"/bot{TOKEN}/answerCallbackQuery", ok)
+        saved_api_url = asyncio_helper.API_URL
+
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            executor = ThreadPoolExecutor(ASYNC_HANDLER_WORKERS)
+            async_bot = AsyncTeleBot(TOKEN)
+            client = AsyncJiraClient(executor)
+            try:
+                setup_handlers(SyncBotBridge(async_bot, loop, executor))
+                await client.fetch_board("ARM_QA")
+
+                updates = [
+                    callback_update(
+                        number,
+                        callback_codec.encode(OP_TASK, f"UGC-{number // MESSAGES + 1}", "ARM_QA"),
+                        1000 + number % MESSAGES
+                    )
+                    for number in range(PRESSES)
+                ]
+                started = time.perf_counter()
+                await async_bot.process_new_updates(updates)
+                # Ожидание очереди обработчиков блокирующее - не в цикле событий
+                assert await loop.run_in_executor(None, handler_executor.wait_idle, 30)
+                return time.perf_counter() - started
+            finally:
+                await client.close()
+                await async_bot.close_session()
+                executor.shutdown()
+
+        telegram.start()
+        asyncio_helper.API_URL = telegram.url("/bot{0}/{1}")
+        try:
+            elapsed = asyncio.run(scenario())
+        finally:
+            asyncio_helper.API_URL = saved_api_url
+            telegram.stop()
+
+        edits = [parse_qs(request.body.decode()) for request in telegram.requests if request.path.endswith("editMessageText")]
+        answers = [parse_qs(request.body.decode()) for request in telegram.requests if request.path.endswith("answerCallbackQuery")]
+        print(f"📊 {PRESSES} нажатий за {elapsed:.2f} сек ({PRESSES / elapsed:.0f} в секунду): "
+              f"экранов {len(edits)}, ответов на отмененные {len(answers)}")
+
+        assert len(edits) + len(answers) == PRESSES
+        # Ответы только на отмененные нажатия - без текста ошибки
+        assert all('text' not in answer for answer in answers)
+        assert {int(edit['message_id'][0]) for edit in edits} == set(range(1000, 1000 + MESSAGES))
+        for edit in edits:
+            message_id = int(edit['message_id'][0])
+            shown_key = edit['text'][0].split(" ", 2)[1]
+            # На сообщении показана одна из задач, нажатых на нем
+            assert shown_key in {f"UGC-{number // MESSAGES + 1}" for number in range(message_id - 1000, PRESSES, MESSAGES)}
+
+    check()
+    print("✅ Нажатия обработаны")
+
+if __name__ == "__main__":
+    test_async_fetch_board()
+    test_callback_throughput()
@@ -0,0 +1,123 @@
+# ==============================================
+# ТЕСТ HTTP-ВХОДА В JIRA
+# ==============================================
+# HttpAuthBackend входит в локальную заглушку Jira:
+# форма login.jsp, запасной вход через REST и отказ обоих способов
+
+import time
+import json
+from urllib.parse import parse_qs
+from email.utils import formatdate
+from stub_jira import StubJira
+from auth_backends import AuthBackend, HttpAuthBackend
+
+def set_cookie(name, value, expires=None):
+    cookie = f"{name}={value}; Path=/"
+    if expires:
+        cookie += f"; Expires={formatdate(expires, usegmt=True)}"
+    return cookie
+
+def login_form(reason, cookies=()):
+    """Ответ login.jsp: результат в X-Seraph-LoginReason и выданные куки"""
+    def respond(request):
+        form = parse_qs(request.body.decode())
+        headers = {"Set-Cookie": list(cookies)}
+        if form.get("os_username") == ["tester"] and form.get("os_password") == ["secret"]:
+            headers["X-Seraph-LoginReason"] = reason
+        else:
+            headers["X-Seraph-LoginReason"] = "AUTHENTICATED_FAILED"
+        return 200, headers, ""
+    return respond
+
+def test_form_login():
+    """
+    login.jsp принял пароль: возвращаются куки сессии и самый ранний срок важных куков
+    """
+    print("🧪 Вход через login.jsp...")
+    session_expires = int(time.time()) + 3600
+    remember_expires = int(time.time()) + 14 * 86400
+    with StubJira() as jira:
+        jira.route("/login.jsp", login_form("OK", [
+            set_cookie("JSESSIONID", "abc", session_expires),
+            set_cookie("seraph.rememberme.cookie", "remember", remember_expires),
+            set_cookie("other", "x", int(time.time()) + 60)
+        ]))
+        cookies, expires_at = HttpAuthBackend(jira.url(""), "tester", "secret").login()
+
+        login = jira.requests[0]
+        assert (login.method, login.path) == ("POST", "/login.jsp")
+        assert login.headers["X-Atlassian-Token"] == "no-check"
+        assert parse_qs(login.body.decode())["os_cookie"] == ["true"]
+
+    assert cookies == {"JSESSIONID": "abc", "seraph.rememberme.cookie": "remember", "other": "x"}
+    # Срок неважного кука "other" не учитывается
+    assert expires_at == session_expires
+    print("✅ Куки получены")
+
+def test_rest_fallback():
+    """
+    login.jsp отклонил вход (например включена капча) - вход через REST API сессий
+    """
+    print("🧪 Запасной вход через REST...")
+
+    def rest_session(request):
+        credentials = json.loads(request.body)
+        if credentials != {"username": "tester", "password": "secret"}:
+            return 401, {}, ""
+        return 200, {"Set-Cookie": [set_cookie("JSESSIONID", "rest")]}, '{"session": {"name": "JSESSIONID"}}'
+
+    with StubJira() as jira:
+        jira.route("/login.jsp", login_form("AUTHENTICATION_DENIED"))
+        jira.route("/rest/auth/1/session", rest_session)
+        cookies, expires_at = HttpAuthBackend(jira.url(""), "tester", "secret").login()
+        assert [request.path for request in jira.requests] == ["/login.jsp", "/rest/auth/1/session"]
+
+    assert cookies == {"JSESSIONID": "rest"}
+    assert expires_at is None
+    print("✅ Вход через REST выполнен")
+
+def test_login_rejected():
+    """
+    Неверный пароль: оба способа отклонены, куков нет;
+    анонимный JSESSIONID от login.jsp успехом не считается
+    """
+    print("🧪 Неверный пароль...")
+    with StubJira() as jira:
+        jira.route("/login.jsp", login_form("OK", [set_cookie("JSESSIONID", "anonymous")]))
+        jira.route("/rest/auth/1/session", lambda request: (401, {}, ""))
+        assert HttpAuthBackend(jira.url(""), "tester", "wrong").login() == ({}, None)
+    print("✅ Вход отклонен")
+
+def test_jira_unreachable():
+    """
+    Jira недоступна - ошибка соединения не выбрасывается, куков нет
+    """
+    print("🧪 Jira недоступна...")
+    jira = StubJira().start()
+    base_url = jira.url("")
+    jira.stop()
+    assert HttpAuthBackend(base_url, "tester", "secret", timeout=2).login() == ({}, None)
+    print("✅ Ошибка соединения обработана")
+
+def test_backend_without_login():
+    """
+    Backend без login() не создается: ошибка при запуске, а не при обновлении куков
+    """
+    print("🧪 Backend без login()...")
+
+    class ForgotLogin(AuthBackend):
+        name = "forgot"
+
+    try:
+        ForgotLogin()
+        assert False, "Ожидалась ошибка TypeError"
+    except TypeError:
+        pass
+    print("✅ Backend без login() отклонен")
+
+if __name__ == "__main__":
+    test_form_login()
+    test_rest_fallback()
+    test_login_rejected()
+    test_jira_unreachable()
+    test_backend_without_login()
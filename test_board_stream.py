@@ -0,0 +1,153 @@
+# ==============================================
+# ТЕСТ ПОТОКОВОГО РАЗБОРА ОТВЕТА ДОСКИ
+# ==============================================
+# Проверяет, что разбор по кускам дает то же, что json.loads,
+# при любых границах кусков (в том числе внутри чисел с точкой и экспонентой),
+# и сравнивает время и пиковую память с json.loads на 1k/10k/50k задач
+
+import json
+import time
+import random
+import tracemalloc
+from board_stream import BoardStreamParser, parse_board_stream, COLUMN_FIELDS, ISSUE_FIELDS
+
+def make_board(issue_count, seed=1):
+    """Синтетический ответ доски с лишними полями, как у настоящей Jira"""
+    rng = random.Random(seed)
+    columns = [
+        {
+            'id': index,
+            'name': name,
+            'statusIds': [str(10000 + index)],
+            'statisticsFieldValue': rng.randint(0, issue_count),
+            'min': 0.5,
+            'max': 1.25e2
+        }
+        for index, name in enumerate(["Бэклог", "Ожидают тестирования", "Тестирование", "Готово"])
+    ]
+    issues = []
+    for number in range(issue_count):
+        issues.append({
+            'id': number,
+            'key': f"UGC-{number}",
+            'summary': f"Задача {number} \"в кавычках\" \\ со слэшем",
+            'statusId': str(10000 + rng.randrange(4)),
+            'assigneeName': rng.choice(["Иван", "Мария", None]),
+            'description': "Описание " * rng.randint(0, 5),
+            'estimateStatistic': {'statFieldValue': {'value': rng.random() * 10, 'text': "1.5h"}},
+            'trackingStatistic': {'value': -1.5e-3, 'ratio': 1e10},
+            'extraFields': [{'id': f"customfield_{field}", 'value': [1, 2.5, True, None]} for field in range(5)],
+            'hidden': False
+        })
+    return {
+        'rapidViewId': 12.5,
+        'orderData': {'rank': 1.0e3, 'canRank': True},
+        'columnsData': {'columns': columns, 'extra': -0.0},
+        'issuesData': {'issues': issues, 'rankCustomFieldId': 10019},
+        'sprintsData': {'sprints': [], 'version': 3e0}
+    }
+
+def expected_result(board):
+    """Что должен вернуть разбор: json.loads, сокращенный до используемых полей"""
+    return {
+        'columnsData': {'columns': [
+            {field: column[field] for field in COLUMN_FIELDS if field in column}
+            for column in board['columnsData']['columns']
+        ]},
+        'issuesData': {'issues': [
+            {field: issue[field] for field in ISSUE_FIELDS if field in issue}
+            for issue in board['issuesData']['issues']
+        ]}
+    }
+
+def split_randomly(data, rng, max_size):
+    chunks = []
+    pos = 0
+    while pos < len(data):
+        size = rng.randint(1, max_size)
+        chunks.append(data[pos:pos + size])
+        pos += size
+    return chunks
+
+def test_random_chunk_boundaries():
+    """
+    Случайные границы кусков (байты UTF-8, числа, экспоненты) не меняют результат
+    """
+    print("🧪 Случайные границы кусков...")
+    rng = random.Random(42)
+    board = make_board(8)
+    data = json.dumps(board, ensure_ascii=False).encode('utf-8')
+    expected = expected_result(json.loads(data))
+
+    for _ in range(100):
+        chunks = split_randomly(data, rng, rng.choice([1, 3, 7, 64]))
+        assert parse_board_stream(chunks) == expected
+    print("✅ 100 разбиений совпали с json.loads")
+
+def test_float_split_everywhere():
+    """
+    Граница куска в каждой позиции документа с дробными числами и экспонентами
+    """
+    print("🧪 Граница после '.', 'e', 'E'...")
+    document = (
+        '{"rapidViewId": 12.5, "scale": 1E+2, "ratio": -3.25e-4,'
+        ' "columnsData": {"columns": [{"name": "A", "statisticsFieldValue": 2.0}]},'
+        ' "issuesData": {"issues": [{"key": "UGC-1", "weight": 6.02e23}], "total": 1.5}}'
+    )
+    expected = expected_result(json.loads(document))
+    for split in range(1, len(document)):
+        parser = BoardStreamParser()
+        parser.feed(document[:split])
+        parser.feed(document[split:])
+        assert parser.close() == expected, f"Граница на позиции {split}"
+    print("✅ Все позиции разобраны верно")
+
+def test_truncated_document():
+    """
+    Оборванный документ - ошибка, а не частичный результат
+    """
+    print("🧪 Оборванный документ...")
+    parser = BoardStreamParser()
+    parser.feed('{"rapidViewId": 12.')
+    try:
+        parser.close()
+        assert False, "Ожидалась ошибка"
+    except ValueError:
+        pass
+    print("✅ Ошибка для оборванного документа")
+
+def measure(parse, data):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = parse(data)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+def test_benchmark(sizes=(1000, 10000)):
+    """
+    Время разбора и пиковая память (tracemalloc): json.loads всего ответа
+    против потокового разбора кусками по 64 КБ
+    """
+    print("🧪 Замер разбора...")
+    for size in sizes:
+        data = json.dumps(make_board(size), ensure_ascii=False).encode('utf-8')
+        chunks = lambda data: (data[pos:pos + 65536] for pos in range(0, len(data), 65536))
+
+        full, full_time, full_peak = measure(lambda data: expected_result(json.loads(data)), data)
+        streamed, stream_time, stream_peak = measure(lambda data: parse_board_stream(chunks(data)), data)
+        assert streamed == full
+
+        print(f"📊 {size} задач ({len(data) / 1e6:.1f} МБ): "
+              f"json.loads {full_time * 1000:.0f} мс / {full_peak / 1e6:.1f} МБ, "
+              f"поток {stream_time * 1000:.0f} мс / {stream_peak / 1e6:.1f} МБ")
+        # Пик потокового разбора - сокращенные задачи, а не весь документ
+        assert stream_peak < full_peak
+    print("✅ Замер выполнен")
+
+if __name__ == "__main__":
+    test_random_chunk_boundaries()
+    test_float_split_everywhere()
+    test_truncated_document()
+    test_benchmark((1000, 10000, 50000))
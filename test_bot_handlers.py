@@ -0,0 +1,211 @@
+# ==============================================
+# ТЕСТ ОБРАБОТЧИКОВ КНОПОК
+# ==============================================
+# Нажатия проходят весь путь: telebot -> очередь сообщения -> роутер -> обработчик,
+# включая отмену устаревших экранов.
+# Вместо Telegram - FakeBot, вместо Jira - загрузчики досок со счетчиком
+
+import json
+import threading
+from types import SimpleNamespace
+from concurrent.futures import Future
+from stub_jira import stub_board
+import get_desk_api
+from get_desk_api import url, board_caches
+from board_cache import BoardCache
+from board_snapshot import BoardSnapshot
+from bot_handlers import setup_handlers, handler_executor
+from callback_codec import callback_codec, OP_TASK, OP_BACK_TO_COLUMNS, OP_DELETE
+
+class FakeBot:
+    """Telegram-бот, который запоминает вызовы"""
+
+    def __init__(self):
+        self.callback_handlers = []
+        self.edits = []
+        self.answers = []
+
+    def callback_query_handler(self, func=None, **kwargs):
+        def register(handler):
+            self.callback_handlers.append(handler)
+            return handler
+        return register
+
+    def message_handler(self, *args, **kwargs):
+        return lambda handler: handler
+
+    def edit_message_text(self, **kwargs):
+        self.edits.append(kwargs)
+
+    def answer_callback_query(self, callback_query_id, text=None, **kwargs):
+        self.answers.append((callback_query_id, text))
+
+    def send_message(self, *args, **kwargs):
+        pass
+
+    def delete_message(self, *args, **kwargs):
+        pass
+
+    def press(self, data, message_id=1, call_id="1"):
+        """Нажатие кнопки в сообщении message_id"""
+        call = SimpleNamespace(
+            id=call_id,
+            data=data,
+            message=SimpleNamespace(chat=SimpleNamespace(id=-100), message_id=message_id),
+            from_user=SimpleNamespace(id=7, first_name="Иван", username="ivan")
+        )
+        for handler in self.callback_handlers:
+            handler(call)
+
+class CountingLoader:
+    """Загрузчик доски, считающий запросы к Jira"""
+
+    def __init__(self, issue_count):
+        self.issue_count = issue_count
+        self.calls = 0
+        # Пока событие не установлено, "Jira" не отвечает
+        self.gate = threading.Event()
+        self.gate.set()
+        self.started = threading.Event()
+
+    def __call__(self, board_name):
+        self.calls += 1
+        self.started.set()
+        self.gate.wait(5)
+        return BoardSnapshot(stub_board(self.issue_count))
+
+def with_boards(test):
+    """Подменяет доски ARM_QA и ARM_DEV кэшами с загрузчиками-счетчиками"""
+    def run():
+        saved_url = dict(url)
+        saved_caches = dict(board_caches)
+        loaders = {'ARM_QA': CountingLoader(2), 'ARM_DEV': CountingLoader(5)}
+        url.clear()
+        board_caches.clear()
+        for board_name, loader in loaders.items():
+            url[board_name] = f"http://127.0.0.1:9/{board_name}"
+            board_caches[board_name] = BoardCache(board_name, loader, ttl=60)
+        try:
+            test(loaders)
+        finally:
+            url.clear()
+            url.update(saved_url)
+            board_caches.clear()
+            board_caches.update(saved_caches)
+    run.__name__ = test.__name__
+    run.__doc__ = test.__doc__
+    return run
+
+def test_task_button_uses_board_from_payload():
+    """
+    Кнопка задачи знает свою доску: загружается только она,
+    а уже загруженный снимок используется без запроса к Jira
+    """
+    print("🧪 Доска задачи из данных кнопки...")
+
+    @with_boards
+    def check(loaders):
+        bot = FakeBot()
+        setup_handlers(bot)
+
+        # Снимка ARM_DEV еще нет - одна загрузка ARM_DEV, ARM_QA не трогаем
+        bot.press(callback_codec.encode(OP_TASK, "UGC-5", "ARM_DEV"))
+        assert handler_executor.wait_idle(5)
+        assert loaders['ARM_DEV'].calls == 1 and loaders['ARM_QA'].calls == 0
+        assert "UGC-5" in bot.edits[-1]['text']
+        back = json.loads(bot.edits[-1]['reply_markup'])['inline_keyboard'][0][0]
+        assert callback_codec.decode(back['callback_data']) == (OP_BACK_TO_COLUMNS, ["ARM_DEV"])
+
+        # Повторное нажатие - снимок уже в кэше
+        bot.press(callback_codec.encode(OP_TASK, "UGC-4", "ARM_DEV"), message_id=2)
+        assert handler_executor.wait_idle(5)
+        assert loaders['ARM_DEV'].calls == 1 and loaders['ARM_QA'].calls == 0
+        assert "UGC-4" in bot.edits[-1]['text']
+
+    check()
+    print("✅ Загружена только доска задачи")
+
+def test_legacy_task_button_prefers_cached_boards():
+    """
+    У старой кнопки доски нет: сначала ищем в снимках из кэша
+    и загружаем доски, только если задачи там нет
+    """
+    print("🧪 Старая кнопка задачи без доски...")
+
+    @with_boards
+    def check(loaders):
+        bot = FakeBot()
+        setup_handlers(bot)
+        get_desk_api.get_board_data("ARM_DEV")
+        assert loaders['ARM_DEV'].calls == 1
+
+        # Задача есть в снимке ARM_DEV - ARM_QA не загружается
+        bot.press("task_UGC-5", message_id=11)
+        assert handler_executor.wait_idle(5)
+        assert loaders['ARM_QA'].calls == 0 and loaders['ARM_DEV'].calls == 1
+        assert "UGC-5" in bot.edits[-1]['text']
+
+        # Задачи нет нигде - каждая доска загружена не больше одного раза
+        bot.press("task_UGC-99", message_id=12)
+        assert handler_executor.wait_idle(5)
+        assert loaders['ARM_QA'].calls == 1 and loaders['ARM_DEV'].calls == 1
+        assert "UGC-99" in bot.edits[-1]['text'] and "❌" in bot.edits[-1]['text']
+
+    check()
+    print("✅ Лишних загрузок нет")
+
+def test_superseded_presses_are_answered():
+    """
+    Три быстрых нажатия на одно сообщение: показан только последний экран,
+    а на отмененные нажатия Telegram получает ответ (иначе часики на кнопке)
+    """
+    print("🧪 Ответ на отмененные нажатия...")
+
+    @with_boards
+    def check(loaders):
+        bot = FakeBot()
+        setup_handlers(bot)
+        loaders['ARM_DEV'].gate.clear()
+
+        # Первое нажатие ждет медленную Jira, второе ждет в очереди
+        bot.press(callback_codec.encode(OP_TASK, "UGC-1", "ARM_DEV"), message_id=21, call_id="1")
+        assert loaders['ARM_DEV'].started.wait(5)
+        bot.press(callback_codec.encode(OP_TASK, "UGC-2", "ARM_DEV"), message_id=21, call_id="2")
+        # Третье отменяет ожидающее второе и выполняющееся первое
+        bot.press(callback_codec.encode(OP_TASK, "UGC-3", "ARM_DEV"), message_id=21, call_id="3")
+        assert bot.answers == [("2", None)]
+
+        loaders['ARM_DEV'].gate.set()
+        assert handler_executor.wait_idle(5)
+        assert sorted(bot.answers) == [("1", None), ("2", None)]
+        assert len(bot.edits) == 1 and "UGC-3" in bot.edits[0]['text']
+
+    check()
+    print("✅ Отмененные нажатия получили ответ")
+
+def test_failed_queued_delete_shows_error():
+    """
+    Через очередь отправки удаление возвращает Future: если Telegram
+    отказал позже, в сообщении показывается ошибка удаления
+    """
+    print("🧪 Неудачное удаление через очередь отправки...")
+    bot = FakeBot()
+    deleted = Future()
+    bot.delete_message = lambda *args, **kwargs: deleted
+    setup_handlers(bot)
+
+    bot.press(callback_codec.encode(OP_DELETE, "0000dead"), message_id=31)
+    assert handler_executor.wait_idle(5)
+    assert bot.edits == []
+
+    deleted.set_exception(RuntimeError("message can't be deleted"))
+    assert len(bot.edits) == 1
+    assert bot.edits[0]['message_id'] == 31
+    assert "Ошибка при удалении" in bot.edits[0]['text']
+    print("✅ Ошибка удаления показана")
+
+if __name__ == "__main__":
+    test_task_button_uses_board_from_payload()
+    test_legacy_task_button_prefers_cached_boards()
+    test_superseded_presses_are_answered()
+    test_failed_queued_delete_shows_error()
@@ -0,0 +1,171 @@
+# ==============================================
+# ТЕСТ ДАННЫХ КНОПОК И МАРШРУТИЗАЦИИ
+# ==============================================
+# Проверяет, что данные кнопок помещаются в 64 байта и разбираются обратно,
+# и сравнивает стоимость выбора обработчика с цепочкой startswith
+
+import time
+from callback_codec import (
+    CallbackCodec, CallbackRouter, MAX_CALLBACK_BYTES,
+    OP_BOARD, OP_COLUMN, OP_BACK_TO_COLUMNS, OP_TASK, OP_BACK_TO_REMINDER, OP_TAKE, OP_READ, OP_DELETE
+)
+
+LONG_COLUMN = "Ожидают тестирования после ревью и сборки релизного стенда"
+
+class FakeCall:
+    """Нажатие кнопки: только данные"""
+
+    def __init__(self, data):
+        self.data = data
+
+def test_round_trip():
+    """
+    Данные любой кнопки укладываются в 64 байта и разбираются в те же поля
+    """
+    print("🧪 Кодирование и разбор...")
+    codec = CallbackCodec()
+
+    # Старый формат для такой колонки был бы длиннее лимита
+    assert len(f"column_ARM_QA:{LONG_COLUMN}#12".encode('utf-8')) > MAX_CALLBACK_BYTES
+
+    cases = [
+        (OP_BOARD, ["ARM_QA"]),
+        (OP_COLUMN, ["ARM_QA", LONG_COLUMN, "12"]),
+        (OP_TASK, ["UGC-8006", "ARM_QA", "3f2a9c1b"]),
+        (OP_TAKE, ["UGC-8006", "3f2a9c1b"]),
+        (OP_COLUMN, ["ARM_QA", "a|b", "0"]),
+        (OP_COLUMN, ["ARM_QA", "~похоже на токен", "0"]),
+    ]
+    for op, fields in cases:
+        data = codec.encode(op, *fields)
+        assert len(data.encode('utf-8')) <= MAX_CALLBACK_BYTES
+        assert codec.decode(data) == (op, fields)
+
+    # Токен зависит только от значения
+    assert codec.token(LONG_COLUMN) == CallbackCodec().token(LONG_COLUMN)
+    print("✅ Все поля разобраны обратно")
+
+def test_too_long_and_stale():
+    """
+    Слишком длинные данные не кодируются; забытый токен и чужой формат не разбираются
+    """
+    print("🧪 Ограничения...")
+    codec = CallbackCodec(max_tokens=2)
+
+    try:
+        codec.encode(OP_TASK, *["UGC-8006"] * 10)
+        assert False, "Ожидалась ошибка длины"
+    except ValueError:
+        pass
+
+    first = codec.encode(OP_COLUMN, "ARM_QA", "Колонка 1")
+    codec.encode(OP_COLUMN, "ARM_QA", "Колонка 2")
+    codec.encode(OP_COLUMN, "ARM_QA", "Колонка 3")
+    assert codec.decode(first) is None
+    # Повторное кодирование восстанавливает кнопку
+    codec.encode(OP_COLUMN, "ARM_QA", "Колонка 1")
+    assert codec.decode(first) == (OP_COLUMN, ["ARM_QA", "Колонка 1"])
+
+    assert codec.decode("ARM_QA") is None
+    assert codec.decode("column_ARM_QA:Тестирование") is None
+    print("✅ Устаревшие и чужие данные отклонены")
+
+def test_router_dispatch():
+    """
+    Обработчик выбирается по коду операции; старые кнопки - через legacy_parser
+    """
+    print("🧪 Маршрутизация...")
+    codec = CallbackCodec()
+    unknown = []
+    router = CallbackRouter(
+        codec,
+        legacy_parser=lambda data: (OP_DELETE, [data[len("delete_"):]]) if data.startswith("delete_") else None,
+        on_unknown=unknown.append
+    )
+
+    @router.route(OP_COLUMN)
+    def handle_column(call, board_name, column_name, page=None):
+        return board_name, column_name, page
+
+    @router.route(OP_DELETE)
+    def handle_delete(call, reminder_id):
+        return reminder_id
+
+    assert router.dispatch(FakeCall(codec.encode(OP_COLUMN, "ARM_QA", LONG_COLUMN))) == ("ARM_QA", LONG_COLUMN, None)
+    assert router.dispatch(FakeCall(codec.encode(OP_COLUMN, "ARM_QA", LONG_COLUMN, 1))) == ("ARM_QA", LONG_COLUMN, "1")
+    assert router.dispatch(FakeCall("delete_3f2a9c1b")) == "3f2a9c1b"
+    assert router.dispatch(FakeCall(codec.encode(OP_READ, "3f2a9c1b"))) is None
+    assert router.dispatch(FakeCall("что-то другое")) is None
+    assert len(unknown) == 2
+    print("✅ Обработчики выбраны верно")
+
+def test_dispatch_benchmark():
+    """
+    Сравнивает выбор обработчика роутером с цепочкой фильтров startswith,
+    которую telebot перебирает для каждого нажатия
+    """
+    print("🧪 Стоимость выбора обработчика...")
+    codec = CallbackCodec()
+    boards = ["ARM_QA", "ARM_DEV"]
+    ops = [OP_BOARD, OP_COLUMN, OP_TASK, OP_BACK_TO_REMINDER, OP_BACK_TO_COLUMNS, OP_TAKE, OP_READ, OP_DELETE]
+
+    router = CallbackRouter(codec)
+    for op in ops:
+        router.route(op)(lambda call, *fields: fields)
+
+    # Старые обработчики: фильтры в порядке регистрации + разбор строки в обработчике
+    def legacy_column(call):
+        data, _, page = call.data.replace("column_", "", 1).rpartition("#")
+        return data.partition(":") + (page,)
+
+    legacy_handlers = [
+        (lambda call: call.data in boards, lambda call: call.data),
+        (lambda call: call.data.startswith("column_"), legacy_column),
+        (lambda call: call.data.startswith("task_"), lambda call: call.data.replace("task_", "")),
+        (lambda call: call.data.startswith("back_to_reminder_"), lambda call: call.data.replace("back_to_reminder_", "")),
+        (lambda call: call.data.startswith("back_to_columns"), lambda call: call.data.partition(":")),
+        (lambda call: call.data.startswith("take_"), lambda call: call.data.replace("take_", "").split("_reminder_")),
+        (lambda call: call.data.startswith("read_"), lambda call: call.data.replace("read_", "")),
+        (lambda call: call.data.startswith("delete_"), lambda call: call.data.replace("delete_", "")),
+    ]
+
+    def legacy_dispatch(call):
+        for check, handler in legacy_handlers:
+            if check(call):
+                return handler(call)
+
+    new_calls = [
+        FakeCall(codec.encode(OP_BOARD, "ARM_QA")),
+        FakeCall(codec.encode(OP_COLUMN, "ARM_QA", "Тестирование", 2)),
+        FakeCall(codec.encode(OP_TASK, "UGC-8006", "ARM_QA")),
+        FakeCall(codec.encode(OP_TAKE, "UGC-8006", "3f2a9c1b")),
+        FakeCall(codec.encode(OP_DELETE, "3f2a9c1b")),
+    ]
+    old_calls = [
+        FakeCall("ARM_QA"),
+        FakeCall("column_ARM_QA:Тестирование#2"),
+        FakeCall("task_UGC-8006"),
+        FakeCall("take_UGC-8006_reminder_3f2a9c1b"),
+        FakeCall("delete_3f2a9c1b"),
+    ]
+
+    def measure(dispatch, calls, rounds=20000):
+        started = time.perf_counter()
+        for _ in range(rounds):
+            for call in calls:
+                dispatch(call)
+        return (time.perf_counter() - started) / (rounds * len(calls)) * 1e9
+
+    router_ns = measure(router.dispatch, new_calls)
+    legacy_ns = measure(legacy_dispatch, old_calls)
+    print(f"📊 Роутер: {router_ns:.0f} нс на нажатие")
+    print(f"📊 Цепочка startswith: {legacy_ns:.0f} нс на нажатие")
+    # Оба варианта - единицы микросекунд; роутер не зависит от числа обработчиков
+    assert router_ns < 50000 and legacy_ns < 50000
+    print("✅ Замер выполнен")
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_too_long_and_stale()
+    test_router_dispatch()
+    test_dispatch_benchmark()
@@ -0,0 +1,83 @@
+# ==============================================
+# ТЕСТ СРАВНЕНИЯ СОСТОЯНИЙ КОЛОНКИ
+# ==============================================
+# Проверяет, что новые задачи определяются по ключам, а не по количеству
+
+from board_snapshot import BoardSnapshot, diff_issue_keys
+
+WAITING = "Ожидают тестирования"
+IN_TEST = "Тестирование"
+
+def make_snapshot(waiting_keys, in_test_keys=()):
+    """Строит снимок доски с двумя колонками"""
+    issues = [{'key': key, 'summary': f"Задача {key}", 'statusId': '1'} for key in waiting_keys]
+    issues += [{'key': key, 'summary': f"Задача {key}", 'statusId': '2'} for key in in_test_keys]
+    return BoardSnapshot({
+        'columnsData': {'columns': [
+            {'name': WAITING, 'statusIds': ['1'], 'statisticsFieldValue': len(waiting_keys)},
+            {'name': IN_TEST, 'statusIds': ['2'], 'statisticsFieldValue': len(in_test_keys)}
+        ]},
+        'issuesData': {'issues': issues}
+    })
+
+def test_swap_is_detected():
+    """
+    Одна задача ушла, другая пришла - количество не изменилось, но новая задача найдена
+    """
+    print("🧪 Замена задачи при том же количестве...")
+    before = make_snapshot(['UGC-1', 'UGC-2'])
+    after = make_snapshot(['UGC-1', 'UGC-3'], in_test_keys=['UGC-2'])
+
+    added, removed = diff_issue_keys(before.issue_keys_in(WAITING), after.issue_keys_in(WAITING))
+
+    assert added == ['UGC-3']
+    assert removed == ['UGC-2']
+    print("✅ Замена определена")
+
+def test_reorder_is_not_a_change():
+    """
+    Перестановка задач внутри колонки не создает уведомлений
+    """
+    print("🧪 Перестановка задач...")
+    before = make_snapshot(['UGC-1', 'UGC-2', 'UGC-3'])
+    after = make_snapshot(['UGC-3', 'UGC-1', 'UGC-2'])
+
+    added, removed = diff_issue_keys(before.issue_keys_in(WAITING), after.issue_keys_in(WAITING))
+
+    assert added == []
+    assert removed == []
+    print("✅ Перестановка не считается изменением")
+
+def test_bulk_move():
+    """
+    Массовый перенос: часть задач ушла в тестирование, пачка новых пришла
+    """
+    print("🧪 Массовый перенос задач...")
+    old_keys = [f"UGC-{i}" for i in range(100)]
+    new_keys = [f"UGC-{i}" for i in range(50, 130)]
+    before = make_snapshot(old_keys)
+    after = make_snapshot(new_keys, in_test_keys=[f"UGC-{i}" for i in range(50)])
+
+    added, removed = diff_issue_keys(before.issue_keys_in(WAITING), after.issue_keys_in(WAITING))
+
+    # Порядок добавленных - как на доске, убранных - как было
+    assert added == [f"UGC-{i}" for i in range(100, 130)]
+    assert removed == [f"UGC-{i}" for i in range(50)]
+    print("✅ Массовый перенос определен точно")
+
+def test_added_keys_follow_board_order():
+    """
+    Новые задачи возвращаются в порядке доски, даже если пришли в середину колонки
+    """
+    print("🧪 Новые задачи в середине колонки...")
+    added, removed = diff_issue_keys(['UGC-1', 'UGC-4'], ['UGC-5', 'UGC-1', 'UGC-2', 'UGC-4', 'UGC-3'])
+
+    assert added == ['UGC-5', 'UGC-2', 'UGC-3']
+    assert removed == []
+    print("✅ Порядок сохранен")
+
+if __name__ == "__main__":
+    test_swap_is_detected()
+    test_reorder_is_not_a_change()
+    test_bulk_move()
+    test_added_keys_follow_board_order()
@@ -0,0 +1,123 @@
+# ==============================================
+# ТЕСТ СТРАНИЦ СПИСКА ЗАДАЧ КОЛОНКИ
+# ==============================================
+# Проверяет границы страниц, лимит сообщения Telegram (4096 символов UTF-16),
+# пустую колонку и номер страницы за пределами списка
+
+import stub_jira  # noqa: F401 - тестовые переменные окружения для config.py
+from board_snapshot import BoardSnapshot
+from get_desk_api import format_column_page
+from config import TELEGRAM_MESSAGE_LIMIT
+
+COLUMN = "Ожидают тестирования"
+
+def make_snapshot(issue_count, summary=None, assignee="Иван"):
+    issues = [
+        {
+            'key': f"UGC-{number}",
+            'summary': summary or f"Задача {number}",
+            'statusId': "1",
+            'assigneeName': assignee
+        }
+        for number in range(1, issue_count + 1)
+    ]
+    return BoardSnapshot({
+        'columnsData': {'columns': [
+            {'name': COLUMN, 'statusIds': ["1"], 'statisticsFieldValue': issue_count},
+            {'name': "Готово", 'statusIds': ["2"], 'statisticsFieldValue': 0}
+        ]},
+        'issuesData': {'issues': issues}
+    })
+
+def telegram_length(text):
+    """Длина текста так, как ее считает Telegram (эмодзи - два символа)"""
+    return len(text.encode('utf-16-le')) // 2
+
+def shown_keys(text):
+    return [line.split("[", 1)[1].split("]", 1)[0] for line in text.splitlines() if "[UGC-" in line]
+
+def test_page_boundaries():
+    """
+    41 задача по 20 на странице: 3 страницы, задачи не теряются и не повторяются
+    """
+    print("🧪 Границы страниц...")
+    snapshot = make_snapshot(41)
+    keys = []
+    for page in range(3):
+        text, shown_page, pages = format_column_page(snapshot, COLUMN, page, page_size=20)
+        assert (shown_page, pages) == (page, 3)
+        assert f"Страница {page + 1} из 3" in text
+        keys += shown_keys(text)
+    assert keys == [f"UGC-{number}" for number in range(1, 42)]
+
+    # Ровно одна полная страница - без номера страницы
+    text, shown_page, pages = format_column_page(make_snapshot(20), COLUMN, 0, page_size=20)
+    assert (shown_page, pages) == (0, 1) and "Страница" not in text
+    assert len(shown_keys(text)) == 20
+    print("✅ Страницы разбиты верно")
+
+def test_message_limit():
+    """
+    Очень длинные названия обрезаются: страница помещается в сообщение
+    и номер страницы не отрезан
+    """
+    print("🧪 Лимит 4096 символов...")
+    snapshot = make_snapshot(45, summary="Очень длинное название задачи 🚀 " * 40)
+    for page in range(3):
+        text, _, pages = format_column_page(snapshot, COLUMN, page, page_size=20)
+        assert telegram_length(text) <= TELEGRAM_MESSAGE_LIMIT
+        assert text.endswith(f"Страница {page + 1} из {pages}")
+        assert len(shown_keys(text)) == (20 if page < 2 else 5)
+        assert "…" in text
+    print("✅ Страницы помещаются в сообщение")
+
+def test_long_assignee_and_emoji():
+    """
+    Длинные имена исполнителей и названия из одних эмодзи (два символа UTF-16 каждое):
+    страница все равно помещается в сообщение, номер страницы не отрезан
+    """
+    print("🧪 Длинные имена исполнителей и эмодзи...")
+    snapshot = make_snapshot(90, summary="🚀" * 500, assignee="👤" * 500)
+    for page_size in (20, 45):
+        for page in range(90 // page_size):
+            text, _, pages = format_column_page(snapshot, COLUMN, page, page_size=page_size)
+            assert telegram_length(text) <= TELEGRAM_MESSAGE_LIMIT
+            assert text.endswith(f"Страница {page + 1} из {pages}")
+    print("✅ Страницы помещаются в сообщение")
+
+def test_empty_column():
+    """
+    Пустая колонка - одна страница с сообщением об отсутствии задач;
+    несуществующая колонка - сообщение об ошибке
+    """
+    print("🧪 Пустая колонка...")
+    text, shown_page, pages = format_column_page(make_snapshot(3), "Готово", 0)
+    assert (shown_page, pages) == (0, 1)
+    assert "Нет задач в этой колонке" in text and shown_keys(text) == []
+
+    text, shown_page, pages = format_column_page(make_snapshot(3), "Нет такой", 0)
+    assert (shown_page, pages) == (0, 1) and "не найдена" in text
+    print("✅ Пустая колонка показана")
+
+def test_page_out_of_range():
+    """
+    Номер страницы за пределами (колонка уменьшилась, пока сообщение висело) -
+    показывается ближайшая существующая страница
+    """
+    print("🧪 Страница за пределами...")
+    snapshot = make_snapshot(25)
+    text, shown_page, pages = format_column_page(snapshot, COLUMN, 7, page_size=20)
+    assert (shown_page, pages) == (1, 2)
+    assert shown_keys(text) == [f"UGC-{number}" for number in range(21, 26)]
+
+    text, shown_page, pages = format_column_page(snapshot, COLUMN, -3, page_size=20)
+    assert (shown_page, pages) == (0, 2)
+    assert shown_keys(text)[0] == "UGC-1"
+    print("✅ Показана ближайшая страница")
+
+if __name__ == "__main__":
+    test_page_boundaries()
+    test_message_limit()
+    test_long_assignee_and_emoji()
+    test_empty_column()
+    test_page_out_of_range()
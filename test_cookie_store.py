@@ -0,0 +1,86 @@
+# ==============================================
+# ТЕСТ ХРАНИЛИЩА КУКОВ
+# ==============================================
+# Проверяет, что файл куков читается только после изменения,
+# запись атомарная, а некорректные файлы не дают куков
+
+import os
+import json
+import tempfile
+from cookie_store import CookieStore, write_json_atomic
+
+def test_file_read_only_when_changed():
+    """
+    Пока файл не изменился, куки берутся из памяти;
+    запись внешним скриптом (как get_cookies.py) подхватывается
+    """
+    print("🧪 Перечитывание только измененного файла...")
+    with tempfile.TemporaryDirectory() as directory:
+        store = CookieStore(os.path.join(directory, 'cookies.json'))
+        store.save({"JSESSIONID": "first"}, expires_at=2000000000.0)
+
+        reads = []
+        read = store._read_and_validate
+        store._read_and_validate = lambda: reads.append(1) or read()
+
+        for _ in range(100):
+            assert store.load() == {"JSESSIONID": "first"}
+        assert reads == []
+        assert store.metadata()['expires_at'] == 2000000000.0
+
+        # Внешний скрипт пишет старый формат без сведений о сроке
+        write_json_atomic(store.path, {"cookies": {"JSESSIONID": "second", "atlassian.xsrf.token": "t"}})
+        assert store.load() == {"JSESSIONID": "second", "atlassian.xsrf.token": "t"}
+        assert store.load() == {"JSESSIONID": "second", "atlassian.xsrf.token": "t"}
+        assert len(reads) == 1
+        assert store.metadata() == {}
+    print("✅ Файл перечитан один раз")
+
+def test_invalid_files():
+    """
+    Нет файла, пустой файл, битый JSON, нет важных куков - куков нет
+    """
+    print("🧪 Некорректные файлы...")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'cookies.json')
+        store = CookieStore(path)
+        assert store.load() is None
+
+        for content in ("", "{not json", json.dumps({"cookies": {}}),
+                        json.dumps({"cookies": {"other": "x"}}), json.dumps(["JSESSIONID"])):
+            with open(path, 'w', encoding='utf-8') as cookie_file:
+                cookie_file.write(content)
+            store.invalidate()
+            assert store.load() is None, content
+
+        store.save({"seraph.rememberme.cookie": "r"})
+        assert store.load() == {"seraph.rememberme.cookie": "r"}
+        os.remove(path)
+        assert store.load() is None
+    print("✅ Некорректные файлы отклонены")
+
+def test_atomic_write():
+    """
+    Запись через временный файл: после записи и после ошибки
+    в каталоге нет временных файлов, старое содержимое не повреждено
+    """
+    print("🧪 Атомарная запись...")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'cookies.json')
+        write_json_atomic(path, {"cookies": {"JSESSIONID": "ok"}})
+        assert os.listdir(directory) == ['cookies.json']
+
+        try:
+            write_json_atomic(path, {"cookies": {"JSESSIONID": object()}})
+            assert False, "Ожидалась ошибка сериализации"
+        except TypeError:
+            pass
+        assert os.listdir(directory) == ['cookies.json']
+        with open(path, encoding='utf-8') as cookie_file:
+            assert json.load(cookie_file) == {"cookies": {"JSESSIONID": "ok"}}
+    print("✅ Файл не поврежден")
+
+if __name__ == "__main__":
+    test_file_read_only_when_changed()
+    test_invalid_files()
+    test_atomic_write()
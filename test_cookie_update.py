@@ -19,13 +19,13 @@ def test_cookie_update():
         
         # Тестируем API запрос
         print("🔍 Тестируем API запрос...")
-        response = get_desk_api()
+        result = get_desk_api()
         
-        if response and response.status_code == 200:
+        if result.ok:
             print("✅ API запрос успешен!")
             return True
         else:
-            print(f"❌ API запрос не удался: статус {response.status_code if response else 'нет ответа'}")
+            print(f"❌ API запрос не удался: {result.error_message}")
             return False
     else:
         print("❌ Не удалось обновить куки")
@@ -0,0 +1,145 @@
+# ==============================================
+# ТЕСТ ИНКРЕМЕНТАЛЬНОЙ СИНХРОНИЗАЦИИ ДОСКИ
+# ==============================================
+# Сравнивает снимок, собранный из дельт, с полной загрузкой доски
+# на случайных изменениях задач
+
+import random
+from board_snapshot import BoardSnapshot
+from delta_sync import DeltaSync, compare_snapshots
+
+COLUMNS = [
+    {'name': "Ожидают тестирования", 'statusIds': ['1']},
+    {'name': "Тестирование", 'statusIds': ['2']},
+    {'name': "Готово", 'statusIds': ['3']}
+]
+
+class FakeClock:
+    """Управляемые часы: время идет только по команде теста"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class FakeJira:
+    """Доска в Jira: задачи и время их последнего изменения"""
+
+    def __init__(self, clock, size):
+        self.clock = clock
+        self.issues = {}
+        self.updated = {}
+        self.full_loads = 0
+        self.search_fails = False
+        for index in range(size):
+            self.change(f"UGC-{index}")
+
+    def change(self, key):
+        self.issues[key] = {'key': key, 'summary': f"Задача {key}", 'statusId': random.choice('123')}
+        self.updated[key] = self.clock()
+
+    def delete(self, key):
+        del self.issues[key]
+        del self.updated[key]
+
+    def load_full(self, board_name):
+        self.full_loads += 1
+        columns = []
+        for column in COLUMNS:
+            count = sum(1 for issue in self.issues.values() if issue['statusId'] in column['statusIds'])
+            columns.append(dict(column, statisticsFieldValue=count))
+        return BoardSnapshot({
+            'columnsData': {'columns': columns},
+            'issuesData': {'issues': [dict(issue) for issue in self.issues.values()]}
+        })
+
+    def load_delta(self, board_name, since_seconds):
+        if self.search_fails:
+            raise ConnectionError("поиск Jira недоступен")
+        changed = [dict(self.issues[key]) for key, at in self.updated.items() if at >= self.clock() - since_seconds]
+        return changed, len(changed)
+
+def make_sync(jira, clock, full_interval=3600):
+    cache = [None]
+    sync = DeltaSync("ARM_QA", jira.load_full, jira.load_delta, lambda: cache[0], full_interval, 120, clock)
+    return sync, cache
+
+def test_delta_matches_full_load():
+    """
+    После каждой проверки снимок из дельт совпадает с полной загрузкой,
+    а размер дельты зависит от числа изменений, а не от размера доски
+    """
+    print("🧪 Дельта против полной загрузки...")
+    random.seed(18)
+    clock = FakeClock()
+    jira = FakeJira(clock, 2000)
+    sync, cache = make_sync(jira, clock)
+
+    for cycle in range(50):
+        clock.now += 60
+        for key in random.sample(sorted(jira.issues), 5):
+            jira.change(key)
+        jira.change(f"UGC-{2000 + cycle}")
+
+        cache[0] = sync("ARM_QA")
+        assert compare_snapshots(cache[0], jira.load_full("ARM_QA")) == []
+        for column in COLUMNS:
+            assert cache[0].column(column['name'])['statisticsFieldValue'] == len(cache[0].issue_keys_in(column['name']))
+
+    assert sync.full_syncs == 1
+    assert sync.delta_syncs == 49
+    # Окно дельты (60 сек + запас 120) захватывает несколько проверок, но не всю доску
+    assert sync.last_issues <= 4 * 6
+    print(f"📊 Задач в последней дельте: {sync.last_issues} из {len(jira.issues)}")
+    print("✅ Дельта совпадает с полной загрузкой")
+
+def test_full_resync_reports_drift():
+    """
+    Удаленную задачу дельта не видит: полная загрузка исправляет снимок
+    и засчитывает расхождение
+    """
+    print("🧪 Сверка при полной загрузке...")
+    clock = FakeClock()
+    jira = FakeJira(clock, 10)
+    sync, cache = make_sync(jira, clock, full_interval=600)
+
+    cache[0] = sync("ARM_QA")
+    clock.now += 300
+    jira.delete("UGC-3")
+    cache[0] = sync("ARM_QA")
+    assert "UGC-3" in cache[0].issue_by_key
+
+    clock.now += 300
+    cache[0] = sync("ARM_QA")
+    assert sync.last_mode == "full"
+    assert "UGC-3" not in cache[0].issue_by_key
+    assert sync.checks == 1
+    assert sync.mismatches == 1
+    print("✅ Расхождение найдено и исправлено")
+
+def test_full_resync_when_search_fails():
+    """
+    Поиск Jira падает: проверка дельты пропускается,
+    но полная загрузка все равно выполняется
+    """
+    print("🧪 Полная загрузка при ошибке поиска...")
+    clock = FakeClock()
+    jira = FakeJira(clock, 10)
+    sync, cache = make_sync(jira, clock, full_interval=600)
+    cache[0] = sync("ARM_QA")
+
+    jira.search_fails = True
+    clock.now += 600
+    jira.delete("UGC-3")
+    cache[0] = sync("ARM_QA")
+    assert sync.last_mode == "full"
+    assert jira.full_loads == 2
+    assert "UGC-3" not in cache[0].issue_by_key
+    assert sync.checks == 0
+    print("✅ Полная загрузка выполнена")
+
+if __name__ == "__main__":
+    test_delta_matches_full_load()
+    test_full_resync_reports_drift()
+    test_full_resync_when_search_fails()
@@ -0,0 +1,104 @@
+# ==============================================
+# ТЕСТ ЗАПРОСА К JIRA И АВТОМАТА ЗАЩИТЫ
+# ==============================================
+# Проверяет на локальной заглушке Jira, что пробный запрос автомата защиты
+# не остается занятым навсегда: ни после непредвиденной ошибки запроса,
+# ни когда срок истек еще до отправки запроса
+
+import os
+import time
+import tempfile
+from stub_jira import StubJira, VALID_COOKIES
+import get_desk_api
+from get_desk_api import get_desk_api as request_jira, ERROR_CONNECTION, ERROR_TIMEOUT
+from circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+from cookie_store import cookie_store
+
+def setup_cookies(directory):
+    """Куки во временном файле вместо cookies.json"""
+    previous = cookie_store.path
+    cookie_store.path = os.path.join(directory, 'cookies.json')
+    cookie_store.save(VALID_COOKIES)
+    return previous
+
+def half_open_breaker():
+    """Автомат после сбоя, готовый пропустить пробный запрос"""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    return breaker
+
+def test_redirect_loop_releases_trial():
+    """
+    TooManyRedirects - ошибка запроса, а не исключение из get_desk_api;
+    пробный запрос засчитан как сбой и автомат снова пропускает запросы
+    """
+    print("🧪 Бесконечный редирект в пробном запросе...")
+    with tempfile.TemporaryDirectory() as directory, StubJira() as jira:
+        previous_path = setup_cookies(directory)
+        previous_breaker = get_desk_api.circuit_breaker
+        get_desk_api.circuit_breaker = breaker = half_open_breaker()
+        jira.route("/loop", lambda request: (302, {"Location": "/loop"}, ""))
+        try:
+            result = request_jira(request_url=jira.url("/loop"), deadline=time.monotonic() + 0.2)
+        finally:
+            get_desk_api.circuit_breaker = previous_breaker
+            cookie_store.path = previous_path
+
+    assert result.error == ERROR_CONNECTION
+    assert breaker.state == OPEN
+    assert breaker.allow(), "Пробный запрос остался занят"
+    print("✅ Пробный запрос освобожден")
+
+def test_unexpected_error_releases_trial():
+    """
+    Исключение, которое get_desk_api не обрабатывает, пробрасывается,
+    но пробный запрос освобождается
+    """
+    print("🧪 Непредвиденное исключение в пробном запросе...")
+    with tempfile.TemporaryDirectory() as directory:
+        previous_path = setup_cookies(directory)
+        previous_breaker = get_desk_api.circuit_breaker
+        get_desk_api.circuit_breaker = breaker = half_open_breaker()
+        try:
+            request_jira(board_name="НЕТ_ТАКОЙ_ДОСКИ")
+            assert False, "Ожидалось исключение"
+        except KeyError:
+            pass
+        finally:
+            get_desk_api.circuit_breaker = previous_breaker
+            cookie_store.path = previous_path
+
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow(), "Пробный запрос остался занят"
+    print("✅ Исключение проброшено, пробный запрос освобожден")
+
+def test_expired_deadline_is_not_failure():
+    """
+    Срок истек до первого запроса - Jira не виновата: сбой не засчитывается,
+    а пробный запрос освобождается
+    """
+    print("🧪 Срок истек до отправки запроса...")
+    with tempfile.TemporaryDirectory() as directory, StubJira() as jira:
+        previous_path = setup_cookies(directory)
+        previous_breaker = get_desk_api.circuit_breaker
+        try:
+            get_desk_api.circuit_breaker = closed = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+            result = request_jira(request_url=jira.url(), deadline=time.monotonic() - 1)
+            assert result.error == ERROR_TIMEOUT
+            assert closed.state == CLOSED
+
+            get_desk_api.circuit_breaker = trial = half_open_breaker()
+            result = request_jira(request_url=jira.url(), deadline=time.monotonic() - 1)
+            assert result.error == ERROR_TIMEOUT
+            assert trial.state == HALF_OPEN and trial.allow()
+        finally:
+            get_desk_api.circuit_breaker = previous_breaker
+            cookie_store.path = previous_path
+
+        assert jira.requests == []
+    print("✅ Сбой не засчитан")
+
+if __name__ == "__main__":
+    test_redirect_loop_releases_trial()
+    test_unexpected_error_releases_trial()
+    test_expired_deadline_is_not_failure()
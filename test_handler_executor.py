@@ -0,0 +1,190 @@
+# ==============================================
+# ТЕСТ ОЧЕРЕДИ ОБРАБОТЧИКОВ
+# ==============================================
+# Проверяет порядок нажатий на одно сообщение, отмену устаревших экранов,
+# ограничение пула и очереди; нагрузочный тест - 200 одновременных нажатий
+# с медленной "Jira"
+
+import io
+import time
+import random
+import threading
+from contextlib import redirect_stdout, redirect_stderr
+from handler_executor import HandlerExecutor
+
+def test_same_message_in_order():
+    """
+    Нажатия на одно сообщение выполняются по очереди и в порядке поступления
+    """
+    print("🧪 Порядок нажатий на одно сообщение...")
+    executor = HandlerExecutor(max_workers=4)
+    executor.start()
+    done = []
+    overlapping = []
+    running = set()
+    lock = threading.Lock()
+
+    def handler(number):
+        with lock:
+            if (1, 10) in running:
+                overlapping.append(number)
+            running.add((1, 10))
+        time.sleep(0.005)
+        with lock:
+            running.discard((1, 10))
+            done.append(number)
+
+    for number in range(10):
+        executor.submit((1, 10), handler, number)
+    assert executor.wait_idle(5)
+    executor.stop()
+
+    assert done == list(range(10))
+    assert overlapping == []
+    print("✅ Нажатия выполнены по порядку")
+
+def test_superseded_render():
+    """
+    Новый экран отменяет ожидающие экраны (для них вызывается on_drop);
+    выполняющийся узнает об отмене, а взятие задачи (не экран) выполняется всегда
+    """
+    print("🧪 Отмена устаревших экранов...")
+    executor = HandlerExecutor(max_workers=1)
+    started = threading.Event()
+    release = threading.Event()
+    results = []
+    dropped = []
+
+    def render(name):
+        if name == "колонки":
+            started.set()
+            release.wait(5)
+        results.append((name, executor.is_superseded()))
+
+    def take(task_key):
+        results.append((f"взять {task_key}", executor.is_superseded()))
+
+    executor.start()
+    executor.submit((1, 10), render, "колонки", supersede=True)
+    assert started.wait(5)
+    executor.submit((1, 10), render, "страница 1", supersede=True, on_drop=lambda: dropped.append("страница 1"))
+    executor.submit((1, 10), take, "UGC-1")
+    executor.submit((1, 10), render, "страница 2", supersede=True, on_drop=lambda: dropped.append("страница 2"))
+    release.set()
+    assert executor.wait_idle(5)
+    executor.stop()
+
+    assert results == [("колонки", True), ("взять UGC-1", False), ("страница 2", False)]
+    assert dropped == ["страница 1"]
+    assert executor.stats()['superseded'] == 2
+    print("✅ Показан только последний экран")
+
+def test_handler_error_is_logged():
+    """
+    Исключение обработчика печатается с трассировкой и не останавливает поток
+    """
+    print("🧪 Ошибка в обработчике...")
+    executor = HandlerExecutor(max_workers=1)
+    done = []
+
+    def broken():
+        raise ValueError("сломался")
+
+    stdout, stderr = io.StringIO(), io.StringIO()
+    with redirect_stdout(stdout), redirect_stderr(stderr):
+        executor.start()
+        executor.submit((1, 10), broken)
+        executor.submit((1, 10), done.append, "следующий")
+        assert executor.wait_idle(5)
+        executor.stop()
+
+    assert "❌ Ошибка в обработчике broken" in stdout.getvalue()
+    assert "Traceback" in stderr.getvalue() and "ValueError: сломался" in stderr.getvalue()
+    assert done == ["следующий"]
+    assert executor.stats()['errors'] == 1
+    print("✅ Ошибка напечатана, следующий обработчик выполнен")
+
+def test_bounded_queue():
+    """
+    При переполнении очереди нажатие отклоняется
+    """
+    print("🧪 Ограничение очереди...")
+    executor = HandlerExecutor(max_workers=1, max_pending=3)
+    # Потоки не запущены - все остается в очереди
+    accepted = [executor.submit((1, number), lambda: None) for number in range(5)]
+    assert accepted == [True, True, True, False, False]
+    assert executor.stats()['rejected'] == 2
+    print("✅ Лишние нажатия отклонены")
+
+def test_load_200_callbacks():
+    """
+    200 одновременных нажатий на 40 сообщений, обработчик ждет "Jira" 5-30 мс:
+    - одновременно выполняется не больше max_workers обработчиков
+    - на одном сообщении обработчики не пересекаются
+    - последним на каждом сообщении показан экран последнего нажатия
+    """
+    print("🧪 Нагрузка: 200 одновременных нажатий...")
+    workers = 8
+    executor = HandlerExecutor(max_workers=workers, max_pending=500)
+    executor.start()
+    lock = threading.Lock()
+    running = set()
+    peak = [0]
+    collisions = []
+    shown = {}
+    last_submitted = {}
+    rng = random.Random(7)
+    delays = [rng.uniform(0.005, 0.03) for _ in range(200)]
+
+    def render(message, number):
+        with lock:
+            if message in running:
+                collisions.append(message)
+            running.add(message)
+            peak[0] = max(peak[0], len(running))
+        # Медленный запрос к Jira
+        time.sleep(delays[number])
+        with lock:
+            running.discard(message)
+            if not executor.is_superseded():
+                shown[message] = number
+
+    barrier = threading.Barrier(200)
+
+    def click(number):
+        message = (1, number % 40)
+        barrier.wait()
+        with lock:
+            executor.submit(message, render, message, number, supersede=True)
+            last_submitted[message] = number
+
+    started = time.perf_counter()
+    clicks = [threading.Thread(target=click, args=(number,)) for number in range(200)]
+    for thread in clicks:
+        thread.start()
+    for thread in clicks:
+        thread.join()
+    assert executor.wait_idle(30)
+    elapsed = time.perf_counter() - started
+    executor.stop()
+
+    stats = executor.stats()
+    print(f"📊 Время: {elapsed:.2f} сек, пик одновременных: {peak[0]}, макс. очередь: {stats['max_pending']}")
+    print(f"📊 Выполнено: {stats['completed']}, отменено: {stats['superseded']}, "
+          f"ожидание: сред. {stats['wait_avg'] * 1000:.0f} мс, макс. {stats['wait_max'] * 1000:.0f} мс")
+
+    assert peak[0] <= workers
+    assert collisions == []
+    assert shown == last_submitted
+    assert stats['submitted'] == 200 and stats['rejected'] == 0
+    assert stats['pending'] == 0 and stats['running'] == 0 and stats['keys'] == 0
+    # Отмененные ожидающие обработчики не выполнялись
+    assert stats['completed'] < 200
+    print("✅ Нагрузка обработана")
+
+if __name__ == "__main__":
+    test_same_message_in_order()
+    test_superseded_render()
+    test_handler_error_is_logged()
+    test_bounded_queue()
+    test_load_200_callbacks()
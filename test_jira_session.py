@@ -0,0 +1,104 @@
+# ==============================================
+# ЗАМЕР ОБЩЕЙ KEEP-ALIVE СЕССИИ JIRA
+# ==============================================
+# Сравнивает задержку загрузки доски с локальной заглушки Jira:
+# общая сессия с пулом соединений против нового соединения на каждый запрос.
+# 100 последовательных и 20 одновременных запросов, p50 и p99.
+# Рукопожатие с настоящей Jira (TCP+TLS) заглушка имитирует паузой
+# на каждом новом соединении
+
+import time
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from stub_jira import StubJira, stub_board
+from jira_session import get_session, close_session, set_session_cookies
+from config import JIRA_POOL_SIZE
+
+# Пауза на новом соединении, секунды
+HANDSHAKE_DELAY = 0.01
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+def timed_get(get, board_url):
+    started = time.perf_counter()
+    response = get(board_url, timeout=10)
+    response.json()
+    assert response.status_code == 200
+    return time.perf_counter() - started
+
+def run(get, board_url, count, concurrency):
+    if concurrency == 1:
+        return [timed_get(get, board_url) for _ in range(count)]
+    with ThreadPoolExecutor(concurrency) as pool:
+        return list(pool.map(lambda _: timed_get(get, board_url), range(count)))
+
+def report(name, latencies):
+    print(f"📊 {name}: p50 {percentile(latencies, 50) * 1000:.2f} мс, "
+          f"p99 {percentile(latencies, 99) * 1000:.2f} мс")
+
+def test_pooled_vs_unpooled():
+    """
+    Общая сессия переиспользует соединения: 100 последовательных запросов -
+    одно соединение, 20 одновременных - не больше JIRA_POOL_SIZE соединений.
+    Без пула каждый запрос открывает новое соединение и платит за рукопожатие
+    """
+    print("🧪 Сессия с пулом против запроса без пула...")
+    for name, count, concurrency in (("последовательно", 100, 1), ("одновременно", 20, 20)):
+        with StubJira(board=stub_board(50), connect_delay=HANDSHAKE_DELAY) as jira:
+            close_session()
+            pooled = run(get_session().get, jira.url(), count, concurrency)
+            pooled_connections = jira.connections
+            close_session()
+
+        with StubJira(board=stub_board(50), connect_delay=HANDSHAKE_DELAY) as jira:
+            unpooled = run(requests.get, jira.url(), count, concurrency)
+            unpooled_connections = jira.connections
+
+        report(f"{name}, пул ({pooled_connections} соед.)", pooled)
+        report(f"{name}, без пула ({unpooled_connections} соед.)", unpooled)
+
+        assert unpooled_connections == count
+        if concurrency == 1:
+            assert pooled_connections == 1
+            assert percentile(pooled, 50) < percentile(unpooled, 50)
+        else:
+            assert pooled_connections <= JIRA_POOL_SIZE
+    print("✅ Замер выполнен")
+
+def test_cookie_swap_never_empty():
+    """
+    Куки меняются, пока другие потоки отправляют запросы:
+    каждый запрос уходит с кукой сессии (старой или новой), а не с пустым jar
+    """
+    print("🧪 Замена куков во время запросов...")
+    stop = threading.Event()
+
+    def swap_cookies():
+        generation = 0
+        while not stop.is_set():
+            generation += 1
+            set_session_cookies({"JSESSIONID": f"s{generation}", "atlassian.xsrf.token": "t"})
+
+    with StubJira() as jira:
+        close_session()
+        set_session_cookies({"JSESSIONID": "s0"})
+        swapper = threading.Thread(target=swap_cookies)
+        swapper.start()
+        try:
+            run(get_session().get, jira.url(), 200, 8)
+        finally:
+            stop.set()
+            swapper.join()
+            close_session()
+        cookies = [request.headers.get("Cookie", "") for request in jira.requests]
+
+    assert len(cookies) == 200
+    assert all("JSESSIONID=s" in cookie for cookie in cookies)
+    print("✅ Все запросы ушли с кукой сессии")
+
+if __name__ == "__main__":
+    test_pooled_vs_unpooled()
+    test_cookie_swap_never_empty()
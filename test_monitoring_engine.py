@@ -0,0 +1,171 @@
+# ==============================================
+# ЗАМЕР ДВИЖКА ОПРОСА НА 50 ДОСКАХ
+# ==============================================
+# MonitoringEngine опрашивает доски локальной заглушки Jira с задержкой ответа.
+# Проверяет, что время полного цикла не растет с количеством досок,
+# первые проверки разнесены по интервалу, доска не проверяется дважды
+# одновременно, а одновременных проверок не больше max_workers
+
+import time
+import asyncio
+import threading
+import requests
+from stub_jira import StubJira, stub_board
+from monitoring_engine import BoardState, MonitoringEngine, AsyncMonitoringEngine
+
+# Задержка ответа заглушки Jira, секунды
+JIRA_DELAY = 0.2
+
+class PollRecorder:
+    """Функция проверки доски, которая запоминает начала проверок и одновременность"""
+
+    def __init__(self, board_url=None, delay=0.0):
+        self.board_url = board_url
+        self.delay = delay
+        self.started_at = time.monotonic()
+        self.starts = {}
+        self.running = {}
+        self.max_running = 0
+        self.max_board_running = 0
+        self._lock = threading.Lock()
+
+    def _enter(self, state):
+        with self._lock:
+            self.starts.setdefault(state.board_name, []).append(time.monotonic() - self.started_at)
+            self.running[state.board_name] = self.running.get(state.board_name, 0) + 1
+            self.max_board_running = max(self.max_board_running, self.running[state.board_name])
+            self.max_running = max(self.max_running, sum(self.running.values()))
+
+    def _leave(self, state):
+        with self._lock:
+            self.running[state.board_name] -= 1
+
+    def __call__(self, state):
+        self._enter(state)
+        try:
+            response = requests.get(f"{self.board_url}?board={state.board_name}", timeout=10)
+            return response.status_code == 200 and bool(response.json())
+        finally:
+            self._leave(state)
+
+    async def poll_async(self, state):
+        self._enter(state)
+        try:
+            await asyncio.sleep(self.delay)
+            return True
+        finally:
+            self._leave(state)
+
+    def in_flight(self):
+        with self._lock:
+            return sum(self.running.values())
+
+    def polled(self, count):
+        """Сколько досок проверено хотя бы count раз"""
+        with self._lock:
+            return sum(1 for starts in self.starts.values() if len(starts) >= count)
+
+def make_states(board_count):
+    return [BoardState(f"BOARD_{index}", ["Ожидают тестирования"]) for index in range(board_count)]
+
+def poll_boards(board_count, interval, max_workers, until_polls=1, poke=False):
+    """
+    Опрашивает board_count досок заглушки, пока каждая не проверена until_polls раз
+
+    Returns:
+        (PollRecorder, секунды до завершения)
+    """
+    with StubJira(board=stub_board(20), delay=JIRA_DELAY) as jira:
+        recorder = PollRecorder(jira.url())
+        engine = MonitoringEngine(make_states(board_count), recorder, interval, max_workers)
+        engine.start()
+        try:
+            deadline = time.monotonic() + 30
+            while recorder.polled(until_polls) < board_count and time.monotonic() < deadline:
+                if poke:
+                    # Просьбы проверить доску, пока она уже проверяется
+                    for state in engine.states:
+                        engine.poll_now(state.board_name)
+                time.sleep(0.01)
+            elapsed = time.monotonic() - recorder.started_at
+        finally:
+            engine.stop()
+            # Заглушку останавливаем только после уже начатых проверок
+            while recorder.in_flight():
+                time.sleep(0.01)
+    assert recorder.polled(until_polls) == board_count
+    return recorder, elapsed
+
+def test_cycle_time_flat_and_staggered():
+    """
+    5 и 50 досок с интервалом 1 с: каждая доска проверена за интервал плюс
+    задержку Jira независимо от количества досок; первые проверки
+    разнесены по интервалу, а не приходят одной пачкой
+    """
+    print("🧪 Время цикла на 5 и 50 досках...")
+    interval = 1.0
+    _, few_elapsed = poll_boards(5, interval, max_workers=50)
+    recorder, many_elapsed = poll_boards(50, interval, max_workers=50)
+    print(f"📊 Все доски проверены: 5 досок - {few_elapsed:.2f} с, 50 досок - {many_elapsed:.2f} с "
+          f"(последовательно было бы {50 * JIRA_DELAY:.0f} с)")
+
+    assert many_elapsed < interval + JIRA_DELAY * 3
+    # В 10 раз больше досок - цикл дольше не больше чем на задержку Jira и шаг разнесения
+    assert many_elapsed < few_elapsed + JIRA_DELAY + interval / 5
+
+    # Доска i впервые проверяется не раньше i*T/N
+    step = interval / 50
+    first_starts = [recorder.starts[f"BOARD_{index}"][0] for index in range(50)]
+    assert all(start >= index * step - 0.05 for index, start in enumerate(first_starts))
+    # За любые 0.1 с начинается не больше нескольких проверок
+    burst = max(sum(1 for start in first_starts if at <= start < at + 0.1) for at in first_starts)
+    print(f"📊 Больше всего первых проверок за 0.1 с: {burst}")
+    assert burst <= 8
+    print("✅ Время цикла не растет, проверки разнесены")
+
+def test_board_not_polled_twice_in_flight():
+    """
+    Интервал короче ответа Jira и постоянные poll_now:
+    новая проверка доски начинается только после завершения предыдущей
+    """
+    print("🧪 Одна проверка доски за раз...")
+    recorder, _ = poll_boards(10, interval=0.05, max_workers=10, until_polls=3, poke=True)
+    assert recorder.max_board_running == 1
+    print("✅ Доска не проверялась дважды одновременно")
+
+def test_worker_pool_bound():
+    """
+    50 досок и 4 потока: одновременно идет не больше 4 проверок
+    """
+    print("🧪 Ограничение пула потоков...")
+    recorder, elapsed = poll_boards(50, interval=0.5, max_workers=4)
+    print(f"📊 Одновременных проверок: {recorder.max_running}, все доски за {elapsed:.2f} с")
+    assert recorder.max_running == 4
+    print("✅ Пул не превышен")
+
+def test_async_worker_bound():
+    """
+    Асинхронный движок: 50 досок, не больше max_workers проверок одновременно,
+    доска не проверяется дважды одновременно
+    """
+    print("🧪 Ограничение одновременных проверок в асинхронном режиме...")
+    recorder = PollRecorder(delay=0.05)
+    engine = AsyncMonitoringEngine(make_states(50), recorder.poll_async, 0.5, 4)
+
+    async def scenario():
+        runner = asyncio.create_task(engine.run())
+        while recorder.polled(2) < 50:
+            await asyncio.sleep(0.01)
+        engine.stop()
+        await runner
+
+    asyncio.run(asyncio.wait_for(scenario(), 30))
+    assert recorder.max_running == 4
+    assert recorder.max_board_running == 1
+    print("✅ Асинхронные проверки ограничены")
+
+if __name__ == "__main__":
+    test_cycle_time_flat_and_staggered()
+    test_board_not_polled_twice_in_flight()
+    test_worker_pool_bound()
+    test_async_worker_bound()
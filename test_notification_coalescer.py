@@ -0,0 +1,92 @@
+# ==============================================
+# ТЕСТ ОБЪЕДИНЕНИЯ УВЕДОМЛЕНИЙ
+# ==============================================
+# Проверяет, что изменения колонки за окно уходят одной сводкой
+
+from timer_scheduler import TimerScheduler
+from notification_coalescer import NotificationCoalescer
+
+WAITING = "Ожидают тестирования"
+
+class FakeClock:
+    """Управляемые часы: время идет только по команде теста"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def tasks(*numbers):
+    return [{'key': f"UGC-{number}", 'summary': f"Задача {number}"} for number in numbers]
+
+def make_coalescer(window=60):
+    clock = FakeClock()
+    scheduler = TimerScheduler(clock=clock)
+    batches = []
+    return NotificationCoalescer(window, scheduler, batches.append), scheduler, clock, batches
+
+def test_release_burst_becomes_one_digest():
+    """
+    Релиз принес 15 задач за две проверки - одна сводка со всеми задачами
+    """
+    print("🧪 Всплеск задач после релиза...")
+    coalescer, scheduler, clock, batches = make_coalescer()
+
+    first_keys = [f"UGC-{number}" for number in range(1, 11)]
+    all_keys = [f"UGC-{number}" for number in range(1, 16)]
+    coalescer.add(None, "ARM_QA", WAITING, tasks(*range(1, 11)), [], 10, first_keys)
+    clock.now += 30
+    scheduler.run_due()
+    coalescer.add(None, "ARM_QA", WAITING, tasks(*range(11, 16)), [], 15, all_keys)
+    assert batches == []
+
+    clock.now += 30
+    scheduler.run_due()
+    assert len(batches) == 1
+    assert list(batches[0].added) == [f"UGC-{number}" for number in range(1, 16)]
+    assert batches[0].total_count == 15
+    assert batches[0].events == 2
+    # Сохранять после отправки нужно последнее состояние колонки
+    assert batches[0].task_keys == all_keys
+    assert coalescer.pending() == 0
+    print("✅ Одна сводка на 15 задач")
+
+def test_task_that_came_and_went_is_not_reported():
+    """
+    Задача пришла и ушла в пределах окна - ее нет в сводке;
+    ушедшая задача из прошлого уведомления считается отдельно
+    """
+    print("🧪 Задача пришла и ушла...")
+    coalescer, scheduler, clock, batches = make_coalescer()
+
+    coalescer.add(None, "ARM_QA", WAITING, tasks(1, 2), ['UGC-100'], 2)
+    coalescer.add(None, "ARM_QA", WAITING, [], ['UGC-1'], 1)
+    # Другая колонка - свое окно
+    coalescer.add(None, "ARM_QA", "Тестирование", tasks(5), [], 1)
+
+    clock.now += 60
+    scheduler.run_due()
+    by_column = {batch.column_name: batch for batch in batches}
+    assert list(by_column[WAITING].added) == ['UGC-2']
+    assert by_column[WAITING].removed == {'UGC-100'}
+    assert list(by_column["Тестирование"].added) == ['UGC-5']
+    print("✅ Пришедшая и ушедшая задача не попала в сводку")
+
+def test_zero_window_sends_immediately():
+    """
+    Окно 0 - каждое изменение уходит сразу, как без объединения
+    """
+    print("🧪 Без окна...")
+    coalescer, scheduler, clock, batches = make_coalescer(window=0)
+
+    coalescer.add(None, "ARM_QA", WAITING, tasks(1), [], 1)
+    coalescer.add(None, "ARM_QA", WAITING, tasks(2), [], 2)
+    assert [list(batch.added) for batch in batches] == [['UGC-1'], ['UGC-2']]
+    assert len(scheduler) == 0
+    print("✅ Отправлено сразу")
+
+if __name__ == "__main__":
+    test_release_burst_becomes_one_digest()
+    test_task_that_came_and_went_is_not_reported()
+    test_zero_window_sends_immediately()
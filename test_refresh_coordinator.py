@@ -0,0 +1,107 @@
+# ==============================================
+# ТЕСТ КООРДИНАТОРА ОБНОВЛЕНИЯ КУКОВ
+# ==============================================
+# Проверяет, что одновременные 401 запускают только один вход в Jira
+
+import time
+import threading
+from refresh_coordinator import RefreshCoordinator
+
+class FakeClock:
+    """Управляемые часы для проверки пауз после неудач"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def test_concurrent_401_single_login():
+    """
+    50 потоков одновременно получают 401 - вход должен выполниться один раз
+    """
+    print("🧪 50 одновременных 401...")
+    logins = []
+
+    def stub_login():
+        logins.append(threading.get_ident())
+        time.sleep(0.2)  # Имитируем долгий вход через браузер
+        return True
+
+    coordinator = RefreshCoordinator(stub_login, wait_timeout=5, cooldown_base=30, cooldown_max=600)
+    seen_generation = coordinator.generation
+    barrier = threading.Barrier(50)
+    results = []
+
+    def on_401():
+        barrier.wait()
+        results.append(coordinator.refresh(seen_generation))
+
+    threads = [threading.Thread(target=on_401) for _ in range(50)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(logins) == 1, f"Ожидался 1 вход, выполнено {len(logins)}"
+    assert results == [True] * 50
+    assert coordinator.generation == seen_generation + 1
+    print("✅ Выполнен ровно один вход")
+
+def test_late_401_reuses_fresh_cookies():
+    """
+    Поток, получивший 401 на старых куках уже после обновления, не запускает вход повторно
+    """
+    print("🧪 Запоздавший 401 на старых куках...")
+    logins = []
+    coordinator = RefreshCoordinator(lambda: logins.append(1) or True, wait_timeout=5, cooldown_base=30, cooldown_max=600)
+
+    old_generation = coordinator.generation
+    assert coordinator.refresh(old_generation)
+    assert coordinator.refresh(old_generation)
+    assert len(logins) == 1
+
+    # 401 на уже новых куках - нужен новый вход
+    assert coordinator.refresh(coordinator.generation)
+    assert len(logins) == 2
+    print("✅ Старое поколение переиспользует свежие куки")
+
+def test_failed_login_cooldown():
+    """
+    После неудачного входа новые попытки ждут паузу, пауза растет экспоненциально
+    """
+    print("🧪 Пауза после неудачного входа...")
+    clock = FakeClock()
+    logins = []
+    coordinator = RefreshCoordinator(lambda: logins.append(1) and False, wait_timeout=5,
+                                     cooldown_base=30, cooldown_max=100, clock=clock)
+
+    assert not coordinator.refresh()
+    assert len(logins) == 1
+
+    # Во время паузы вход не запускается
+    clock.now += 29
+    assert not coordinator.refresh()
+    assert len(logins) == 1
+
+    # Пауза прошла - вторая попытка, после нее пауза удваивается
+    clock.now += 2
+    assert not coordinator.refresh()
+    assert len(logins) == 2
+    clock.now += 59
+    assert not coordinator.refresh()
+    assert len(logins) == 2
+    clock.now += 2
+    assert not coordinator.refresh()
+    assert len(logins) == 3
+
+    # Пауза не превышает cooldown_max
+    clock.now += 101
+    coordinator.refresh()
+    assert len(logins) == 4
+    print("✅ Пауза и экспоненциальный рост работают")
+
+if __name__ == "__main__":
+    test_concurrent_401_single_login()
+    test_late_401_reuses_fresh_cookies()
+    test_failed_login_cooldown()
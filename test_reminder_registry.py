@@ -0,0 +1,113 @@
+# ==============================================
+# ТЕСТ РЕЕСТРА НАПОМИНАНИЙ
+# ==============================================
+# Проверяет жизненный цикл напоминаний, ограничения и то, что
+# за неделю работы память реестра не растет
+
+import random
+import tracemalloc
+from reminder_registry import ReminderRegistry, ACTIVE, STOPPED, COMPLETED
+
+class FakeClock:
+    """Управляемые часы: время идет только по команде теста"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def make_reminder(index):
+    return {'task_keys': [f"UGC-{index}"], 'board': "ARM_QA", 'column': "Ожидают тестирования", 'start_time': 0}
+
+def test_lifecycle_and_limits():
+    """
+    Завершенное напоминание доступно до истечения срока, активных не больше max_active
+    """
+    print("🧪 Жизненный цикл напоминания...")
+    clock = FakeClock()
+    registry = ReminderRegistry(max_active=2, finished_ttl=3600, max_finished=10, clock=clock)
+
+    assert registry.add('a', make_reminder(1))
+    assert registry.add('b', make_reminder(2), takers={'UGC-2': "Иван"})
+    assert not registry.add('c', make_reminder(3))
+    assert registry.get('b')['takers'] == {'UGC-2': "Иван"}
+
+    assert registry.mark_taken('a', 'UGC-1', "Петр")
+    assert registry.add_reader('a', 101, "Петр (10:00)")
+    # Тот же пользователь в другую минуту не добавляется повторно
+    assert not registry.add_reader('a', 101, "Петр (10:05)")
+    assert registry.get_active('a')['readers'] == {101: "Петр (10:00)"}
+
+    reminder = registry.finish('a', STOPPED)
+    assert reminder['state'] == STOPPED
+    assert registry.get_active('a') is None
+    # Кнопки отправленного сообщения еще видят, кто взял задачу
+    assert registry.get('a')['takers'] == {'UGC-1': "Петр"}
+    assert registry.finish('a', COMPLETED) is None
+    assert registry.get('b')['state'] == ACTIVE
+
+    clock.now += 3600
+    assert registry.compact() == 1
+    assert 'a' not in registry
+    assert registry.stats() == {'active': 1, 'finished': 0, 'evicted': 1, 'rejected': 1}
+    print("✅ Жизненный цикл соблюден")
+
+def test_memory_flat_over_week():
+    """
+    Неделя работы: напоминания создаются и завершаются каждые 10 минут,
+    сжатие раз в 10 минут - число записей и память не растут
+    """
+    print("🧪 Неделя работы напоминаний...")
+    random.seed(19)
+    clock = FakeClock()
+    registry = ReminderRegistry(max_active=500, finished_ttl=3600, max_finished=1000, clock=clock)
+    next_index = 0
+    sizes = []
+    memory = []
+
+    tracemalloc.start()
+    try:
+        for step in range(7 * 24 * 6):
+            clock.now += 600
+            for _ in range(20):
+                reminder_id = f"r{next_index}"
+                registry.add(reminder_id, make_reminder(next_index))
+                registry.mark_taken(reminder_id, f"UGC-{next_index}", "Иван")
+                registry.add_reader(reminder_id, 7, "Иван (10:00)")
+                next_index += 1
+            active = registry.active_ids()
+            for reminder_id in random.sample(active, min(len(active), 20)):
+                registry.finish(reminder_id, random.choice([STOPPED, COMPLETED]))
+            registry.compact()
+
+            if step % (24 * 6) == 24 * 6 - 1:
+                sizes.append(len(registry))
+                memory.append(tracemalloc.get_traced_memory()[0])
+    finally:
+        tracemalloc.stop()
+
+    print(f"📊 Записей по дням: {sizes}")
+    print(f"📊 Память по дням (КБ): {[size // 1024 for size in memory]}")
+    assert max(sizes) <= 500 + 1000
+    assert sizes[-1] <= sizes[0] * 1.1
+    assert memory[-1] <= memory[0] * 1.2
+    print("✅ Память не растет")
+
+def test_readers_capped():
+    """
+    Прочитавших у напоминания не больше max_readers
+    """
+    print("🧪 Ограничение числа прочитавших...")
+    registry = ReminderRegistry(max_active=1, finished_ttl=3600, max_finished=10, max_readers=3, clock=FakeClock())
+    registry.add('a', make_reminder(1))
+
+    added = [registry.add_reader('a', user_id, f"Пользователь {user_id} (10:00)") for user_id in range(5)]
+    assert added == [True, True, True, False, False]
+    assert list(registry.get_active('a')['readers']) == [0, 1, 2]
+    print("✅ Список прочитавших ограничен")
+
+if __name__ == "__main__":
+    test_lifecycle_and_limits()
+    test_readers_capped()
+    test_memory_flat_over_week()
@@ -0,0 +1,215 @@
+# ==============================================
+# ТЕСТ ТИКОВ НАПОМИНАНИЙ
+# ==============================================
+# Напоминания, срок которых наступает рядом, обрабатываются одним тиком:
+# снимок каждой доски берется один раз на тик, а не на каждое напоминание
+
+import os
+import tempfile
+from stub_jira import stub_board
+import monitor
+from monitor import (
+    reminders, reminder_ticks, start_reminder_for_tasks, run_reminder_tick, stop_reminder,
+    send_reminder, restore_reminders
+)
+from get_desk_api import url, board_caches
+from board_cache import BoardCache
+from board_snapshot import BoardSnapshot
+from state_store import StateStore
+from telegram_sender import PRIORITY_REMINDER
+
+COLUMN = "Ожидают тестирования"
+
+class FakeBot:
+    """Очередь отправки в Telegram, которая запоминает сообщения"""
+
+    def __init__(self):
+        self.sent = []
+        self._priority = None
+
+    def with_priority(self, priority):
+        self._priority = priority
+        return self
+
+    def send_message(self, chat_id, text, reply_markup=None):
+        self.sent.append((self._priority, text))
+
+class CountingLoader:
+    """Загрузчик доски, считающий запросы к Jira (None - Jira недоступна)"""
+
+    def __init__(self, board):
+        self.board = board
+        self.calls = 0
+
+    def __call__(self, board_name):
+        self.calls += 1
+        return BoardSnapshot(self.board) if self.board else None
+
+def with_boards(test):
+    """Доски ARM_QA и ARM_DEV с загрузчиками-счетчиками, база состояния во временном каталоге"""
+    def run():
+        saved_url = dict(url)
+        saved_caches = dict(board_caches)
+        saved_store = monitor.state_store
+        loaders = {'ARM_QA': CountingLoader(stub_board(10)), 'ARM_DEV': CountingLoader(stub_board(10))}
+        url.clear()
+        board_caches.clear()
+        for board_name, loader in loaders.items():
+            url[board_name] = f"http://127.0.0.1:9/{board_name}"
+            board_caches[board_name] = BoardCache(board_name, loader, ttl=60)
+        started = []
+        with tempfile.TemporaryDirectory() as directory:
+            monitor.state_store = StateStore(os.path.join(directory, 'state.db'))
+            try:
+                test(loaders, started)
+            finally:
+                for reminder_id in started:
+                    stop_reminder(reminder_id)
+                monitor.state_store = saved_store
+                url.clear()
+                url.update(saved_url)
+                board_caches.clear()
+                board_caches.update(saved_caches)
+    run.__name__ = test.__name__
+    run.__doc__ = test.__doc__
+    return run
+
+def run_due_ticks(bot, reminder_ids):
+    """Выполняет тики, в которые попали напоминания (вместо ожидания планировщика)"""
+    ticks = sorted({reminders.get_active(reminder_id)['tick_at'] for reminder_id in reminder_ids})
+    for tick_at in ticks:
+        run_reminder_tick(bot, tick_at)
+    return ticks
+
+def test_one_snapshot_per_board_per_tick():
+    """
+    60 напоминаний на двух досках: одна загрузка каждой доски,
+    60 напоминаний отправлено и снова запланировано
+    """
+    print("🧪 Один снимок доски на тик...")
+
+    @with_boards
+    def check(loaders, started):
+        bot = FakeBot()
+        for number in range(60):
+            board_name = "ARM_QA" if number % 2 else "ARM_DEV"
+            started.append(start_reminder_for_tasks(bot, [f"UGC-{number % 10 + 1}"], board_name, COLUMN))
+        ticks = run_due_ticks(bot, started)
+
+        assert loaders['ARM_QA'].calls == 1 and loaders['ARM_DEV'].calls == 1
+        assert len(bot.sent) == 60
+        assert all(priority == PRIORITY_REMINDER for priority, _ in bot.sent)
+        # Каждое напоминание снова запланировано
+        assert all(reminder_id in reminder_ticks[reminders.get_active(reminder_id)['tick_at']] for reminder_id in started)
+        print(f"📊 60 напоминаний, тиков: {len(ticks)}, загрузок досок: 2")
+
+    check()
+    print("✅ Доски загружены по одному разу")
+
+def test_finished_and_unavailable():
+    """
+    Задачи ушли из колонки - напоминание завершено без сообщения;
+    Jira недоступна - напоминание не теряется, а планируется снова
+    """
+    print("🧪 Завершение и недоступная Jira...")
+
+    @with_boards
+    def check(loaders, started):
+        bot = FakeBot()
+        loaders['ARM_DEV'].board = None
+        gone = start_reminder_for_tasks(bot, ["UGC-404"], "ARM_QA", COLUMN)
+        waiting = start_reminder_for_tasks(bot, ["UGC-1"], "ARM_QA", COLUMN)
+        postponed = start_reminder_for_tasks(bot, ["UGC-2"], "ARM_DEV", COLUMN)
+        started.extend([waiting, postponed])
+        run_due_ticks(bot, [gone, waiting, postponed])
+
+        assert reminders.get_active(gone) is None
+        assert [text.count("UGC-") for _, text in bot.sent] == [1]
+        assert "UGC-1" in bot.sent[0][1]
+        assert postponed in reminder_ticks[reminders.get_active(postponed)['tick_at']]
+
+        monitor.state_store.flush()
+        saved = {reminder['reminder_id'] for reminder in monitor.state_store.load_reminders()}
+        assert saved == {waiting, postponed}
+
+    check()
+    print("✅ Напоминания завершены и отложены верно")
+
+def test_missing_column_finishes_reminder():
+    """
+    Колонки напоминания нет в снимке доски - напоминание завершается
+    и удаляется из базы, а не остается активным навсегда
+    """
+    print("🧪 Колонка пропала с доски...")
+
+    @with_boards
+    def check(loaders, started):
+        bot = FakeBot()
+        reminder_id = start_reminder_for_tasks(bot, ["UGC-1"], "ARM_QA", COLUMN)
+        started.append(reminder_id)
+        board = stub_board(10)
+        board['columnsData']['columns'] = [column for column in board['columnsData']['columns'] if column['name'] != COLUMN]
+        send_reminder(bot, reminder_id, BoardSnapshot(board))
+
+        assert reminders.get_active(reminder_id) is None
+        assert bot.sent == []
+        monitor.state_store.flush()
+        assert monitor.state_store.load_reminders() == []
+
+    check()
+    print("✅ Напоминание завершено")
+
+def test_failing_board_does_not_lose_tick():
+    """
+    Ошибка загрузки одной доски не теряет напоминания остальных досок тика,
+    а напоминания этой доски планируются снова
+    """
+    print("🧪 Ошибка одной доски в тике...")
+
+    @with_boards
+    def check(loaders, started):
+        bot = FakeBot()
+        good = start_reminder_for_tasks(bot, ["UGC-1"], "ARM_QA", COLUMN)
+        bad = start_reminder_for_tasks(bot, ["UGC-2"], "ARM_DEV", COLUMN)
+        started.extend([good, bad])
+        # Доску убрали из настроек: get_board_data падает с KeyError
+        del board_caches['ARM_DEV']
+        run_due_ticks(bot, [good, bad])
+
+        assert len(bot.sent) == 1 and "UGC-1" in bot.sent[0][1]
+        assert bad in reminder_ticks[reminders.get_active(bad)['tick_at']]
+
+    check()
+    print("✅ Остальные доски обработаны")
+
+def test_restore_skips_unknown_board():
+    """
+    Напоминание по доске, которой больше нет в настройках, не восстанавливается
+    и удаляется из базы
+    """
+    print("🧪 Восстановление напоминаний удаленной доски...")
+
+    @with_boards
+    def check(loaders, started):
+        reminder = {'board': "OLD_BOARD", 'column': COLUMN, 'task_keys': ["UGC-1"], 'start_time': 1000.0, 'next_at': None}
+        monitor.state_store.save_reminder("gone0001", reminder)
+        monitor.state_store.save_reminder("kept0001", dict(reminder, board="ARM_QA"))
+        monitor.state_store.flush()
+
+        restore_reminders(FakeBot())
+        started.append("kept0001")
+
+        assert reminders.get_active("gone0001") is None
+        assert reminders.get_active("kept0001") is not None
+        monitor.state_store.flush()
+        assert [saved['reminder_id'] for saved in monitor.state_store.load_reminders()] == ["kept0001"]
+
+    check()
+    print("✅ Напоминание удаленной доски пропущено")
+
+if __name__ == "__main__":
+    test_one_snapshot_per_board_per_tick()
+    test_finished_and_unavailable()
+    test_missing_column_finishes_reminder()
+    test_failing_board_does_not_lose_tick()
+    test_restore_skips_unknown_board()
@@ -0,0 +1,154 @@
+# ==============================================
+# ТЕСТ ФОНОВОГО ПОДДЕРЖАНИЯ СЕССИИ
+# ==============================================
+# SessionKeeper с управляемыми часами, проверкой и обновлением-заглушками:
+# обновление до истечения срока, по возрасту куков, после неудачной
+# проверки, а также счетчики для мониторинга
+
+import time
+import stub_jira  # noqa: F401 - тестовые переменные окружения для config.py
+from session_keeper import SessionKeeper
+
+class FakeClock:
+    """Управляемые часы: время идет только по команде теста"""
+
+    def __init__(self):
+        self.now = 1000000.0
+
+    def __call__(self):
+        return self.now
+
+class FakeSession:
+    """Куки Jira: срок и время выдачи, проверка и обновление"""
+
+    def __init__(self, clock, lifetime=None):
+        self.clock = clock
+        self.lifetime = lifetime
+        self.valid = True
+        self.refresh_ok = True
+        self.probes = 0
+        self.refreshes = 0
+        self._issue()
+
+    def _issue(self):
+        self.issued_at = self.clock()
+        self.expires_at = self.issued_at + self.lifetime if self.lifetime else None
+
+    def metadata(self):
+        return {'issued_at': self.issued_at, 'expires_at': self.expires_at}
+
+    def probe(self):
+        self.probes += 1
+        return self.valid
+
+    def refresh(self):
+        self.refreshes += 1
+        time.sleep(0.01)
+        if self.refresh_ok:
+            self.valid = True
+            self._issue()
+        return self.refresh_ok
+
+def make_keeper(session, clock, max_age=None):
+    return SessionKeeper(session.probe, session.refresh, session.metadata,
+                         check_interval=300, refresh_ahead=600, max_age=max_age, clock=clock)
+
+def test_refresh_ahead_of_expiry():
+    """
+    Куки живут час: до окна refresh_ahead только проверка,
+    за 10 минут до истечения - обновление без проверки
+    """
+    print("🧪 Обновление до истечения срока...")
+    clock = FakeClock()
+    session = FakeSession(clock, lifetime=3600)
+    keeper = make_keeper(session, clock)
+
+    clock.now += 2999
+    assert keeper.refresh_reason() is None
+    assert not keeper.run_once()
+    assert session.probes == 2 and session.refreshes == 0
+
+    clock.now += 1
+    assert keeper.run_once()
+    assert session.refreshes == 1 and session.probes == 2
+    assert keeper.stats()['last_refresh_reason'] == "истекает срок куков"
+    # Новые куки снова действуют час
+    assert keeper.refresh_reason() is None
+    print("✅ Куки обновлены заранее")
+
+def test_max_age_refresh():
+    """
+    Срок куков неизвестен: обновление, когда куки старше max_age минус refresh_ahead
+    """
+    print("🧪 Обновление по возрасту куков...")
+    clock = FakeClock()
+    session = FakeSession(clock)
+    keeper = make_keeper(session, clock, max_age=8 * 3600)
+
+    clock.now += 8 * 3600 - 601
+    assert not keeper.run_once()
+    clock.now += 1
+    assert keeper.run_once()
+    assert keeper.stats()['last_refresh_reason'] == "куки слишком старые"
+    assert session.issued_at == clock.now
+
+    # Без max_age возраст не учитывается
+    unlimited = make_keeper(FakeSession(clock), clock)
+    clock.now += 30 * 86400
+    assert not unlimited.run_once()
+    print("✅ Старые куки обновлены")
+
+def test_failed_probe_refresh():
+    """
+    Проверка сессии не прошла - куки обновляются; неудачное обновление
+    повторяется на следующей проверке
+    """
+    print("🧪 Обновление после неудачной проверки...")
+    clock = FakeClock()
+    session = FakeSession(clock)
+    keeper = make_keeper(session, clock)
+
+    session.valid = False
+    session.refresh_ok = False
+    assert keeper.run_once()
+    assert keeper.stats()['last_refresh_reason'] == "сессия недействительна"
+
+    session.refresh_ok = True
+    assert keeper.run_once()
+    assert session.valid
+    assert not keeper.run_once()
+    assert session.refreshes == 2
+    print("✅ Сессия восстановлена")
+
+def test_stats_counters():
+    """
+    Счетчики проверок и обновлений, длительность и время последнего обновления
+    """
+    print("🧪 Счетчики для мониторинга...")
+    clock = FakeClock()
+    session = FakeSession(clock)
+    keeper = make_keeper(session, clock)
+
+    assert keeper.stats()['avg_refresh_duration'] is None
+    keeper.run_once()
+    session.valid = False
+    session.refresh_ok = False
+    keeper.run_once()
+    session.refresh_ok = True
+    clock.now += 60
+    keeper.run_once()
+
+    stats = keeper.stats()
+    print(f"📊 {stats}")
+    assert (stats['probe_count'], stats['probe_failures']) == (3, 2)
+    assert (stats['refresh_count'], stats['refresh_failures']) == (1, 1)
+    assert stats['last_refresh_at'] == clock.now
+    assert stats['last_refresh_duration'] >= 0.01
+    assert stats['avg_refresh_duration'] == stats['total_refresh_duration'] / 2
+    print("✅ Счетчики верны")
+
+if __name__ == "__main__":
+    test_refresh_ahead_of_expiry()
+    test_max_age_refresh()
+    test_failed_probe_refresh()
+    test_stats_counters()
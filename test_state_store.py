@@ -0,0 +1,105 @@
+# ==============================================
+# ТЕСТ ХРАНИЛИЩА СОСТОЯНИЯ (SQLite)
+# ==============================================
+# Проверяет, что колонки, напоминания и взявшие задачи переживают
+# перезапуск (повторное открытие базы в режиме WAL), а накопленные
+# изменения записываются одной транзакцией
+
+import os
+import sqlite3
+import tempfile
+from state_store import StateStore
+
+REMINDER = {
+    'board': "ARM_QA",
+    'column': "Ожидают тестирования",
+    'task_keys': ["UGC-1", "UGC-2"],
+    'start_time': 1000.0,
+    'next_at': 1900.0
+}
+
+def test_round_trip_after_reopen():
+    """
+    Записанное состояние читается после повторного открытия базы;
+    база работает в режиме WAL
+    """
+    print("🧪 Сохранение и повторное открытие...")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'state.db')
+        store = StateStore(path)
+        store.save_column("ARM_QA", "Ожидают тестирования", ["UGC-1", "UGC-2"])
+        store.save_column("ARM_QA", "Тестирование", [])
+        store.save_reminder("3f2a9c1b", REMINDER)
+        store.save_taker("3f2a9c1b", "UGC-1", "Иван (@ivan)")
+        assert store.flush() == 4
+        assert os.path.exists(path + "-wal")
+
+        # "Перезапуск": новое подключение, пока старое еще открыто
+        reopened = StateStore(path)
+        assert reopened.load_column_states() == {
+            "ARM_QA": {"Ожидают тестирования": ["UGC-1", "UGC-2"], "Тестирование": []}
+        }
+        assert reopened.load_reminders() == [dict(
+            reminder_id="3f2a9c1b",
+            board=REMINDER['board'],
+            column=REMINDER['column'],
+            task_keys=REMINDER['task_keys'],
+            start_time=REMINDER['start_time'],
+            next_at=REMINDER['next_at'],
+            takers={"UGC-1": "Иван (@ivan)"}
+        )]
+
+        with sqlite3.connect(path) as db:
+            assert db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    print("✅ Состояние восстановлено")
+
+def test_unflushed_changes_are_coalesced():
+    """
+    Несколько изменений одной записи до записи в базу - в базу попадает последнее;
+    незаписанные изменения после перезапуска не видны
+    """
+    print("🧪 Объединение изменений...")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'state.db')
+        store = StateStore(path)
+        for keys in (["UGC-1"], ["UGC-1", "UGC-2"], ["UGC-2"]):
+            store.save_column("ARM_QA", "Ожидают тестирования", keys)
+        assert StateStore(path).load_column_states() == {}
+
+        assert store.flush() == 1
+        assert store.flush() == 0
+        assert StateStore(path).load_column_states() == {"ARM_QA": {"Ожидают тестирования": ["UGC-2"]}}
+    print("✅ Записано последнее изменение")
+
+def test_delete_reminder():
+    """
+    Удаление убирает напоминание и взявших задачи; повторное сохранение
+    после удаления (до записи в базу) отменяет удаление
+    """
+    print("🧪 Удаление напоминаний...")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'state.db')
+        store = StateStore(path)
+        store.save_reminder("a", REMINDER)
+        store.save_taker("a", "UGC-1", "Иван")
+        store.save_reminder("b", REMINDER)
+        store.flush()
+
+        store.delete_reminder("a")
+        store.save_taker("a", "UGC-2", "Мария")
+        store.delete_reminder("a")
+        store.delete_reminder("b")
+        store.save_reminder("b", REMINDER)
+        store.flush()
+
+        reminders = StateStore(path).load_reminders()
+        assert [reminder['reminder_id'] for reminder in reminders] == ["b"]
+        assert reminders[0]['takers'] == {}
+        with sqlite3.connect(path) as db:
+            assert db.execute("SELECT COUNT(*) FROM reminder_takers").fetchone()[0] == 0
+    print("✅ Удаленные напоминания не восстанавливаются")
+
+if __name__ == "__main__":
+    test_round_trip_after_reopen()
+    test_unflushed_changes_are_coalesced()
+    test_delete_reminder()
@@ -0,0 +1,189 @@
+# ==============================================
+# ТЕСТ ОЧЕРЕДИ ОТПРАВКИ В TELEGRAM
+# ==============================================
+# Отправляет сообщения через заглушку Bot API, которая, как и Telegram,
+# отвечает 429 при превышении ограничений частоты
+
+import time
+import threading
+from collections import deque
+from telegram_sender import (
+    TelegramSender,
+    QueuedBot,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_NOTIFICATION,
+    PRIORITY_REMINDER,
+    PRIORITY_DIGEST
+)
+
+class StubApiError(Exception):
+    """Ошибка как у telebot.apihelper.ApiTelegramException"""
+
+    def __init__(self, error_code, retry_after):
+        super().__init__(f"Error code: {error_code}")
+        self.error_code = error_code
+        self.result_json = {'ok': False, 'parameters': {'retry_after': retry_after}}
+
+class StubBotApi:
+    """
+    Заглушка Bot API: принимает сообщения и проверяет ограничения частоты
+    за любое окно в одну секунду
+    """
+
+    def __init__(self, global_limit, chat_limit, retry_after=1, fail_first=0):
+        self.global_limit = global_limit
+        self.chat_limit = chat_limit
+        self.retry_after = retry_after
+        self.fail_first = fail_first
+        self.lock = threading.Lock()
+        self.recent = deque()
+        self.recent_by_chat = {}
+        self.delivered = []
+        self.rejected = 0
+
+    def send_message(self, chat_id, text, reply_markup=None):
+        with self.lock:
+            now = time.monotonic()
+            while self.recent and self.recent[0] <= now - 1:
+                self.recent.popleft()
+            chat_recent = self.recent_by_chat.setdefault(chat_id, deque())
+            while chat_recent and chat_recent[0] <= now - 1:
+                chat_recent.popleft()
+
+            if self.fail_first or len(self.recent) >= self.global_limit or len(chat_recent) >= self.chat_limit:
+                self.fail_first = max(0, self.fail_first - 1)
+                self.rejected += 1
+                raise StubApiError(429, self.retry_after)
+
+            self.recent.append(now)
+            chat_recent.append(now)
+            self.delivered.append((chat_id, text, now))
+            return {'chat_id': chat_id, 'text': text}
+
+def test_burst_stays_within_limits():
+    """
+    Всплеск из 300 сообщений в 10 чатов уходит без единого 429,
+    сообщения каждого чата приходят по порядку
+    """
+    print("🧪 Всплеск сообщений...")
+    # Ограничения увеличены в 20 раз, чтобы тест шел пару секунд
+    api = StubBotApi(global_limit=600, chat_limit=21)
+    sender = TelegramSender(api, global_per_second=200, chat_per_second=20)
+    sender.start()
+    try:
+        started = time.perf_counter()
+        futures = [
+            sender.submit(PRIORITY_REMINDER, 'send_message', chat_id, f"{chat_id}:{index}")
+            for index in range(30)
+            for chat_id in range(1, 11)
+        ]
+        # Постановка в очередь не ждет отправки
+        assert time.perf_counter() - started < 0.5
+        for future in futures:
+            future.result(timeout=10)
+    finally:
+        sender.stop()
+
+    assert api.rejected == 0
+    assert sender.stats()['sent'] == 300
+    for chat_id in range(1, 11):
+        texts = [text for chat, text, _ in api.delivered if chat == chat_id]
+        assert texts == [f"{chat_id}:{index}" for index in range(30)]
+    print(f"📊 Отправлено за {api.delivered[-1][2] - api.delivered[0][2]:.2f} сек без 429")
+    print("✅ Ограничения соблюдены")
+
+def test_priority_order():
+    """
+    Ответы на кнопки уходят раньше уведомлений, уведомления - раньше напоминаний и сводок
+    """
+    print("🧪 Порядок приоритетов...")
+    api = StubBotApi(global_limit=100, chat_limit=100)
+    sender = TelegramSender(api, global_per_second=100, chat_per_second=100)
+    bot = QueuedBot(api, sender)
+
+    bot.with_priority(PRIORITY_DIGEST).send_message(1, "сводка")
+    bot.with_priority(PRIORITY_REMINDER).send_message(1, "напоминание")
+    bot.with_priority(PRIORITY_NOTIFICATION).send_message(1, "уведомление")
+    last = bot.send_message(1, "ответ")
+
+    sender.start()
+    try:
+        last.result(timeout=5)
+        sender.submit(PRIORITY_DIGEST, 'send_message', 1, "конец").result(timeout=5)
+    finally:
+        sender.stop()
+
+    assert [text for _, text, _ in api.delivered] == ["ответ", "уведомление", "напоминание", "сводка", "конец"]
+    print("✅ Приоритеты соблюдены")
+
+def test_retry_after_is_honored():
+    """
+    После 429 сообщение повторяется не раньше retry_after и не теряется
+    """
+    print("🧪 Повтор после 429...")
+    api = StubBotApi(global_limit=100, chat_limit=100, retry_after=0.3, fail_first=1)
+    sender = TelegramSender(api, global_per_second=100, chat_per_second=100)
+    sender.start()
+    try:
+        started = time.monotonic()
+        first = sender.submit(PRIORITY_INTERACTIVE, 'send_message', 1, "первое")
+        second = sender.submit(PRIORITY_INTERACTIVE, 'send_message', 1, "второе")
+        second.result(timeout=5)
+        assert first.result(timeout=5)['text'] == "первое"
+    finally:
+        sender.stop()
+
+    assert api.delivered[0][2] - started >= 0.3
+    assert [text for _, text, _ in api.delivered] == ["первое", "второе"]
+    assert sender.stats()['rate_limited'] == 1
+    print("✅ retry_after соблюден")
+
+def test_overflow_drops_least_important():
+    """
+    При переполнении очереди выбрасываются сводки, а не ответы на кнопки
+    """
+    print("🧪 Переполнение очереди...")
+    api = StubBotApi(global_limit=100, chat_limit=100)
+    sender = TelegramSender(api, max_queue=2)
+
+    digest = sender.submit(PRIORITY_DIGEST, 'send_message', 1, "сводка")
+    sender.submit(PRIORITY_INTERACTIVE, 'send_message', 1, "ответ 1")
+    sender.submit(PRIORITY_INTERACTIVE, 'send_message', 1, "ответ 2")
+    late_digest = sender.submit(PRIORITY_DIGEST, 'send_message', 1, "поздняя сводка")
+
+    assert digest.exception(timeout=0) is not None
+    assert late_digest.exception(timeout=0) is not None
+    assert len(sender) == 2
+    assert sender.stats()['dropped'] == 2
+    print("✅ Выброшены только сводки")
+
+def test_interactive_skips_group_budget():
+    """
+    Пачка уведомлений израсходовала минутное ограничение группы:
+    следующее уведомление ждет, а ответ на кнопку уходит сразу
+    """
+    print("🧪 Ответ на кнопку после пачки уведомлений...")
+    api = StubBotApi(global_limit=100, chat_limit=100)
+    # Группе - одно сообщение в 10 секунд, чтобы ограничение исчерпалось одним уведомлением
+    sender = TelegramSender(api, global_per_second=100, chat_per_second=100, group_per_minute=6)
+    sender.start()
+    try:
+        sender.submit(PRIORITY_NOTIFICATION, 'send_message', -100, "уведомление").result(timeout=5)
+        waiting = sender.submit(PRIORITY_NOTIFICATION, 'send_message', -100, "лишнее уведомление")
+        started = time.monotonic()
+        sender.submit(PRIORITY_INTERACTIVE, 'send_message', -100, "ответ").result(timeout=1)
+        answered_in = time.monotonic() - started
+        assert not waiting.done()
+    finally:
+        sender.stop()
+
+    print(f"📊 Ответ на кнопку отправлен за {answered_in * 1000:.0f} мс")
+    assert answered_in < 0.5
+    print("✅ Ответ не ждал ограничения группы")
+
+if __name__ == "__main__":
+    test_burst_stays_within_limits()
+    test_priority_order()
+    test_retry_after_is_honored()
+    test_overflow_drops_least_important()
+    test_interactive_skips_group_budget()
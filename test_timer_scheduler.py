@@ -0,0 +1,96 @@
+# ==============================================
+# ТЕСТ ПЛАНИРОВЩИКА НАПОМИНАНИЙ
+# ==============================================
+# Проверяет порядок срабатывания, отмену и работу с большим числом заданий
+
+import time
+import threading
+from timer_scheduler import TimerScheduler
+
+class FakeClock:
+    """Управляемые часы: время идет только по команде теста"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def test_fires_in_due_order():
+    """
+    Задания выполняются по времени срабатывания, а не по порядку постановки
+    """
+    print("🧪 Порядок срабатывания...")
+    clock = FakeClock()
+    scheduler = TimerScheduler(clock=clock)
+    fired = []
+
+    scheduler.schedule(30, fired.append, 'c')
+    scheduler.schedule(10, fired.append, 'a')
+    scheduler.schedule(20, fired.append, 'b')
+
+    clock.now += 15
+    assert scheduler.run_due() == 1
+    clock.now += 100
+    assert scheduler.run_due() == 2
+
+    assert fired == ['a', 'b', 'c']
+    assert len(scheduler) == 0
+    print("✅ Порядок соблюден")
+
+def test_cancel():
+    """
+    Отмененное задание не выполняется, повторная отмена ничего не делает
+    """
+    print("🧪 Отмена задания...")
+    clock = FakeClock()
+    scheduler = TimerScheduler(clock=clock)
+    fired = []
+
+    keep = scheduler.schedule(10, fired.append, 'keep')
+    drop = scheduler.schedule(5, fired.append, 'drop')
+    assert scheduler.cancel(drop)
+    assert not scheduler.cancel(drop)
+    assert scheduler.next_due() == 10
+
+    clock.now += 10
+    scheduler.run_due()
+
+    assert fired == ['keep']
+    assert not scheduler.cancel(keep)
+    print("✅ Отмена работает")
+
+def test_10k_reminders_constant_threads():
+    """
+    10 000 напоминаний обслуживаются одним потоком планировщика
+    """
+    print("🧪 10 000 напоминаний...")
+    scheduler = TimerScheduler()
+    fired = []
+    lock = threading.Lock()
+
+    def remind(index):
+        with lock:
+            fired.append(index)
+
+    threads_before = threading.active_count()
+    scheduler.start()
+    timer_ids = [scheduler.schedule(0.2 + (i % 100) / 1000, remind, i) for i in range(10000)]
+    # Половину пользователи удалили до срабатывания
+    for timer_id in timer_ids[::2]:
+        scheduler.cancel(timer_id)
+
+    assert threading.active_count() == threads_before + 1
+
+    deadline = time.monotonic() + 10
+    while len(scheduler) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    scheduler.stop()
+
+    assert sorted(fired) == list(range(1, 10000, 2))
+    print("✅ Сработали только не отмененные напоминания, поток один")
+
+if __name__ == "__main__":
+    test_fires_in_due_order()
+    test_cancel()
+    test_10k_reminders_constant_threads()
@@ -0,0 +1,118 @@
+# ==============================================
+# ТЕСТ КЭША ЭКРАНОВ
+# ==============================================
+# Проверяет, что экран строится один раз на версию снимка,
+# а сообщение не редактируется, если уже показывает этот экран
+
+import json
+from concurrent.futures import Future
+from view_cache import ViewCache, RenderedView
+
+class FakeMarkup:
+    """Кнопки с сериализацией, как у telebot.types.InlineKeyboardMarkup"""
+
+    def __init__(self, *buttons):
+        self.buttons = buttons
+
+    def to_json(self):
+        return json.dumps({'inline_keyboard': [[{'text': text}] for text in self.buttons]})
+
+class FakeBot:
+    """Записывает редактирования сообщений"""
+
+    def __init__(self):
+        self.edits = []
+
+    def edit_message_text(self, chat_id, message_id, text, reply_markup=None):
+        self.edits.append((chat_id, message_id, text, reply_markup))
+        return Future()
+
+def test_render_once_per_version():
+    """
+    Экран строится заново только для новой версии снимка
+    """
+    print("🧪 Экран на версию снимка...")
+    views = ViewCache()
+    builds = []
+
+    def build():
+        builds.append(1)
+        return "Колонки", FakeMarkup("Ожидают тестирования (3 задач)")
+
+    first = views.render(("ARM_QA", 1, 'columns', 0), build)
+    again = views.render(("ARM_QA", 1, 'columns', 0), build)
+    newer = views.render(("ARM_QA", 2, 'columns', 0), build)
+
+    assert first is again
+    assert newer is not first
+    assert len(builds) == 2
+    assert isinstance(first.markup, str)
+    print("✅ Экран построен дважды для двух версий")
+
+def test_noop_edit_is_skipped():
+    """
+    Повторный показ того же экрана не вызывает edit_message_text;
+    другой экран и новое содержимое - вызывают
+    """
+    print("🧪 Пропуск редактирования без изменений...")
+    bot = FakeBot()
+    views = ViewCache()
+    columns = RenderedView("Колонки", FakeMarkup("A (1 задач)"))
+
+    assert views.show(bot, 1, 10, columns)
+    assert not views.show(bot, 1, 10, columns)
+    # Новая версия снимка с тем же содержимым - тоже без редактирования
+    assert not views.show(bot, 1, 10, RenderedView("Колонки", FakeMarkup("A (1 задач)")))
+    # Другое сообщение
+    assert views.show(bot, 1, 11, columns)
+    # Содержимое изменилось
+    assert views.show(bot, 1, 10, RenderedView("Колонки", FakeMarkup("A (2 задач)")))
+
+    assert len(bot.edits) == 3
+    assert views.stats()['skipped_edits'] == 2
+    print("✅ Лишние редактирования пропущены")
+
+def test_failed_edit_is_forgotten():
+    """
+    Если редактирование не удалось, следующий показ снова редактирует сообщение
+    """
+    print("🧪 Ошибка редактирования...")
+    futures = []
+
+    class FailingBot(FakeBot):
+        def edit_message_text(self, *args, **kwargs):
+            future = super().edit_message_text(*args, **kwargs)
+            futures.append(future)
+            return future
+
+    bot = FailingBot()
+    views = ViewCache()
+    view = RenderedView("Задачи")
+
+    views.show(bot, 1, 10, view)
+    futures[0].set_exception(RuntimeError("Bad Request"))
+    assert views.show(bot, 1, 10, view)
+    assert len(bot.edits) == 2
+    print("✅ После ошибки сообщение редактируется снова")
+
+def test_bounded_size():
+    """
+    Экранов и сообщений хранится не больше заданного
+    """
+    print("🧪 Ограничение размера...")
+    bot = FakeBot()
+    views = ViewCache(max_views=5, max_messages=5)
+
+    for index in range(20):
+        view = views.render(("ARM_QA", index, 'columns', 0), lambda: (f"Экран {index}", None))
+        views.show(bot, 1, index, view)
+
+    assert views.stats()['views'] == 5
+    assert views.stats()['messages'] == 5
+    print("✅ Размер ограничен")
+
+if __name__ == "__main__":
+    test_render_once_per_version()
+    test_noop_edit_is_skipped()
+    test_failed_edit_is_forgotten()
+    test_bounded_size()
@@ -0,0 +1,186 @@
+# ==============================================
+# ТЕСТ ПРИЕМА ВЕБХУКОВ JIRA
+# ==============================================
+# Отправляет записанные вебхуки на локальный сервер, применяет их
+# к снимку доски и измеряет задержку от отправки до обнаружения задачи
+
+import json
+import time
+import threading
+import urllib.request
+from board_snapshot import BoardSnapshot, diff_issue_keys
+from board_cache import BoardCache
+from webhook_server import WebhookServer, parse_issue_event, issue_event_update
+
+WAITING = "Ожидают тестирования"
+IN_TEST = "Тестирование"
+
+def make_snapshot():
+    """Снимок доски: UGC-1 ждет тестирования, UGC-2 в тестировании"""
+    return BoardSnapshot({
+        'columnsData': {'columns': [
+            {'name': WAITING, 'statusIds': ['1'], 'statisticsFieldValue': 1},
+            {'name': IN_TEST, 'statusIds': ['2'], 'statisticsFieldValue': 1}
+        ]},
+        'issuesData': {'issues': [
+            {'key': 'UGC-1', 'summary': "Задача 1", 'statusId': '1'},
+            {'key': 'UGC-2', 'summary': "Задача 2", 'statusId': '2'}
+        ]}
+    })
+
+def webhook(event, key, status_id, summary="Задача"):
+    """Вебхук Jira в том виде, в котором его присылает Jira"""
+    return {
+        'webhookEvent': event,
+        'issue': {
+            'key': key,
+            'fields': {
+                'summary': summary,
+                'status': {'id': status_id, 'name': "статус"},
+                'assignee': {'displayName': "Иван"}
+            }
+        }
+    }
+
+def test_parse_issue_event():
+    """
+    Из вебхука берутся поля в формате доски, посторонние события пропускаются
+    """
+    print("🧪 Разбор вебхука...")
+    event = parse_issue_event(webhook('jira:issue_updated', 'UGC-3', 1, "Новая"))
+
+    assert event['event'] == 'updated'
+    assert event['issue'] == {'key': 'UGC-3', 'summary': "Новая", 'statusId': '1', 'assigneeName': "Иван"}
+    assert parse_issue_event({'webhookEvent': 'comment_created'}) is None
+    print("✅ Вебхук разобран")
+
+def test_incremental_snapshot_update():
+    """
+    Перенос задачи вебхуком меняет колонки и счетчики как новый ответ доски
+    """
+    print("🧪 Обновление снимка по вебхуку...")
+    before = make_snapshot()
+
+    # UGC-2 вернули в ожидание, пришла новая UGC-3, UGC-1 удалена
+    after = before.with_issue({'key': 'UGC-2', 'summary': "Задача 2", 'statusId': '1'})
+    after = after.with_issue({'key': 'UGC-3', 'summary': "Задача 3", 'statusId': '1'})
+    after = after.without_issue('UGC-1')
+
+    added, removed = diff_issue_keys(before.issue_keys_in(WAITING), after.issue_keys_in(WAITING))
+    assert added == ['UGC-2', 'UGC-3']
+    assert removed == ['UGC-1']
+    assert after.column(WAITING)['statisticsFieldValue'] == 2
+    assert after.column(IN_TEST)['statisticsFieldValue'] == 0
+    # Исходный снимок не изменился
+    assert before.issue_keys_in(WAITING) == ['UGC-1']
+    print("✅ Снимок обновлен")
+
+def test_webhook_delivery_latency():
+    """
+    Записанные вебхуки отправляются на сервер; измеряется задержка до обнаружения
+    """
+    print("🧪 Доставка вебхуков...")
+    snapshot = [make_snapshot()]
+    detected = {}
+    done = threading.Event()
+    lock = threading.Lock()
+
+    def on_event(event):
+        with lock:
+            before = snapshot[0]
+            snapshot[0] = before.with_issue(event['issue'])
+            added, _ = diff_issue_keys(before.issue_keys_in(WAITING), snapshot[0].issue_keys_in(WAITING))
+            for key in added:
+                detected[key] = time.perf_counter()
+            if len(detected) == 20:
+                done.set()
+
+    server = WebhookServer('127.0.0.1', 0, '/jira-webhook', on_event, secret='s3cret')
+    server.start()
+    try:
+        # Без секрета запрос отклоняется
+        request = urllib.request.Request(
+            f"http://127.0.0.1:{server.port}/jira-webhook",
+            data=json.dumps(webhook('jira:issue_created', 'UGC-99', 1)).encode(),
+            method='POST'
+        )
+        try:
+            urllib.request.urlopen(request)
+            assert False, "Запрос без секрета должен быть отклонен"
+        except urllib.error.HTTPError as e:
+            assert e.code == 403
+
+        sent = {}
+        for index in range(100, 120):
+            key = f"UGC-{index}"
+            body = json.dumps(webhook('jira:issue_created', key, 1)).encode()
+            sent[key] = time.perf_counter()
+            urllib.request.urlopen(urllib.request.Request(
+                f"http://127.0.0.1:{server.port}/jira-webhook?secret=s3cret", data=body, method='POST'
+            ))
+
+        assert done.wait(5), "Не все вебхуки обработаны"
+    finally:
+        server.stop()
+
+    latencies = sorted(detected[key] - sent[key] for key in sent)
+    print(f"📊 Задержка: медиана {latencies[10] * 1000:.1f} мс, максимум {latencies[-1] * 1000:.1f} мс")
+    assert server.rejected == 1
+    assert latencies[-1] < 1.0
+    print("✅ Все вебхуки доставлены")
+
+def test_webhook_during_poll_is_replayed():
+    """
+    Вебхук, пришедший во время загрузки доски, не теряется: загруженный
+    снимок (запрошенный до события) получает событие перед записью в кэш
+    """
+    print("🧪 Вебхук во время опроса...")
+    loading = threading.Event()
+    release = threading.Event()
+
+    def slow_loader(board_name):
+        # Jira ответила состоянием до вебхука
+        loading.set()
+        release.wait(5)
+        return make_snapshot()
+
+    cache = BoardCache("ARM_QA", slow_loader, ttl=60)
+    cache.put(make_snapshot())
+    poll = threading.Thread(target=cache.refresh)
+    poll.start()
+    assert loading.wait(5)
+
+    # UGC-3 пришла в колонку, UGC-1 удалена - пока идет опрос
+    created = parse_issue_event(webhook('jira:issue_created', 'UGC-3', 1, "Новая"))
+    deleted = parse_issue_event(webhook('jira:issue_deleted', 'UGC-1', 1))
+    assert cache.apply(issue_event_update(created)) is not None
+    assert cache.apply(issue_event_update(deleted)) is not None
+    webhook_keys = cache.peek().issue_keys_in(WAITING)
+
+    release.set()
+    poll.join(5)
+    assert cache.peek().issue_keys_in(WAITING) == webhook_keys == ['UGC-3']
+    # Событие о чужом проекте к доске не относится
+    other = parse_issue_event(webhook('jira:issue_created', 'OTHER-1', 1))
+    assert cache.apply(issue_event_update(other)) is None
+    print("✅ Событие повторено на загруженном снимке")
+
+def test_secret_is_required():
+    """
+    Без секрета сервер вебхуков не запускается
+    """
+    print("🧪 Обязательный секрет...")
+    for secret in (None, ""):
+        try:
+            WebhookServer('127.0.0.1', 0, '/jira-webhook', lambda event: None, secret=secret)
+            assert False, "Сервер без секрета не должен запускаться"
+        except ValueError:
+            pass
+    print("✅ Сервер без секрета не запущен")
+
+if __name__ == "__main__":
+    test_parse_issue_event()
+    test_incremental_snapshot_update()
+    test_webhook_delivery_latency()
+    test_webhook_during_poll_is_replayed()
+    test_secret_is_required()
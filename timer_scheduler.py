@@ -0,0 +1,190 @@
+# ==============================================
+# ПЛАНИРОВЩИК ОТЛОЖЕННЫХ ЗАДАНИЙ
+# ==============================================
+# Один поток и очередь с приоритетом (куча) по времени срабатывания
+# вместо отдельного спящего потока на каждое напоминание.
+# Постановка - O(log n), отмена - O(1) (запись помечается отмененной
+# и выбрасывается из кучи при извлечении или пересборке)
+
+import time
+import heapq
+import asyncio
+import itertools
+import threading
+
+
+class TimerScheduler:
+    """
+    Выполняет функции в заданное время
+
+    Использование:
+        scheduler = TimerScheduler()
+        scheduler.start()
+        timer_id = scheduler.schedule(300, send_reminder, bot, reminder_id)
+        scheduler.cancel(timer_id)
+    """
+
+    def __init__(self, clock=time.monotonic, executor=None):
+        """
+        Args:
+            clock: источник времени (в тестах - управляемые часы + run_due())
+            executor: пул для выполнения функций (например ThreadPoolExecutor);
+                      без него функции выполняются в потоке планировщика
+        """
+        self._clock = clock
+        self._executor = executor
+        self._cond = threading.Condition()
+        # Записи кучи: [время срабатывания, порядковый номер, id, функция, аргументы]
+        self._heap = []
+        self._entries = {}
+        self._cancelled = 0
+        self._ids = itertools.count(1)
+        self._thread = None
+        self._stop = False
+        # Асинхронный режим: цикл событий и событие пробуждения
+        self._event_loop = None
+        self._async_wake = None
+
+    def __len__(self):
+        """Количество запланированных (не отмененных) заданий"""
+        with self._cond:
+            return len(self._entries)
+
+    def schedule(self, delay, func, *args):
+        """
+        Планирует вызов func(*args) через delay секунд
+
+        Returns:
+            int: id задания для отмены
+        """
+        with self._cond:
+            timer_id = next(self._ids)
+            entry = [self._clock() + delay, timer_id, timer_id, func, args]
+            self._entries[timer_id] = entry
+            heapq.heappush(self._heap, entry)
+            # Будим поток, только если новое задание стало ближайшим
+            if self._heap[0] is entry:
+                self._cond.notify()
+                if self._event_loop is not None:
+                    self._event_loop.call_soon_threadsafe(self._async_wake.set)
+            return timer_id
+
+    def cancel(self, timer_id):
+        """
+        Отменяет задание
+
+        Returns:
+            bool: True если задание было запланировано и еще не выполнялось
+        """
+        with self._cond:
+            entry = self._entries.pop(timer_id, None)
+            if entry is None:
+                return False
+            entry[3] = None
+            self._cancelled += 1
+            # Отмененных больше половины - пересобираем кучу, чтобы она не росла
+            if self._cancelled > len(self._heap) // 2:
+                self._heap = [item for item in self._heap if item[3] is not None]
+                heapq.heapify(self._heap)
+                self._cancelled = 0
+            return True
+
+    def next_due(self):
+        """Через сколько секунд сработает ближайшее задание (None если заданий нет)"""
+        with self._cond:
+            self._drop_cancelled()
+            if not self._heap:
+                return None
+            return max(0.0, self._heap[0][0] - self._clock())
+
+    def run_due(self):
+        """
+        Выполняет все задания, время которых наступило
+
+        Returns:
+            int: сколько заданий выполнено
+        """
+        due = []
+        with self._cond:
+            now = self._clock()
+            self._drop_cancelled()
+            while self._heap and self._heap[0][0] <= now:
+                entry = heapq.heappop(self._heap)
+                del self._entries[entry[2]]
+                due.append(entry)
+                self._drop_cancelled()
+
+        for entry in due:
+            self._run(entry[3], entry[4])
+        return len(due)
+
+    def start(self):
+        """Запускает поток планировщика"""
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._stop = False
+            self._thread = threading.Thread(target=self._loop, daemon=True)
+            self._thread.start()
+
+    async def run_async(self):
+        """
+        Асинхронный режим: планировщик работает задачей цикла событий вместо потока
+
+        Функции выполняются в executor, поэтому не блокируют цикл событий
+        """
+        self._async_wake = asyncio.Event()
+        self._event_loop = asyncio.get_running_loop()
+        try:
+            while not self._stop:
+                self.run_due()
+                try:
+                    await asyncio.wait_for(self._async_wake.wait(), self.next_due())
+                except asyncio.TimeoutError:
+                    pass
+                self._async_wake.clear()
+        finally:
+            self._event_loop = None
+
+    def stop(self):
+        """Останавливает поток планировщика (запланированные задания сохраняются)"""
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+            if self._event_loop is not None:
+                self._event_loop.call_soon_threadsafe(self._async_wake.set)
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            thread.join()
+
+    def _drop_cancelled(self):
+        while self._heap and self._heap[0][3] is None:
+            heapq.heappop(self._heap)
+            self._cancelled -= 1
+
+    def _run(self, func, args):
+        if self._executor is not None:
+            self._executor.submit(self._call, func, args)
+        else:
+            self._call(func, args)
+
+    @staticmethod
+    def _call(func, args):
+        try:
+            func(*args)
+        except Exception as e:
+            print(f"❌ Ошибка отложенного задания: {e}")
+
+    def _loop(self):
+        while True:
+            self.run_due()
+            with self._cond:
+                if self._stop:
+                    return
+                self._drop_cancelled()
+                timeout = max(0.0, self._heap[0][0] - self._clock()) if self._heap else None
+                if timeout is None or timeout > 0:
+                    self._cond.wait(timeout)
+                if self._stop:
+                    return
@@ -0,0 +1,138 @@
+# ==============================================
+# КЭШ ЭКРАНОВ БОТА
+# ==============================================
+# Экраны (текст + кнопки) досок и колонок строятся один раз на версию
+# снимка доски и хранятся уже сериализованными. Для каждого сообщения
+# запоминается, какой экран оно сейчас показывает: если после нажатия
+# кнопки экран не изменился, edit_message_text не вызывается
+# (Telegram все равно ответил бы "message is not modified")
+
+import threading
+from collections import OrderedDict
+
+
+class RenderedView:
+    """Готовый экран: текст и кнопки в JSON (как их принимает Bot API)"""
+
+    __slots__ = ('text', 'markup')
+
+    def __init__(self, text, markup=None):
+        self.text = text
+        # InlineKeyboardMarkup сериализуется один раз
+        self.markup = markup.to_json() if hasattr(markup, 'to_json') else markup
+
+    def same_as(self, other):
+        return other is self or (
+            other is not None and other.text == self.text and other.markup == self.markup
+        )
+
+
+class ViewCache:
+    """
+    Кэш экранов по ключу (доска, версия снимка, экран, страница)
+    и учет того, что показывает каждое сообщение
+
+    Использование:
+        view = views.render((board, snapshot.version, 'columns', 0), lambda: (text, markup))
+        views.show(bot, chat_id, message_id, view)
+    """
+
+    def __init__(self, max_views=256, max_messages=1024):
+        """
+        Args:
+            max_views: сколько готовых экранов хранить
+            max_messages: для скольких сообщений помнить показанный экран
+        """
+        self.max_views = max_views
+        self.max_messages = max_messages
+        self._lock = threading.Lock()
+        self._views = OrderedDict()
+        self._shown = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.skipped_edits = 0
+
+    def render(self, key, build):
+        """
+        Возвращает готовый экран по ключу, при промахе строит его
+
+        Args:
+            key: ключ экрана; должен включать версию снимка, из которого строится экран
+            build: функция без аргументов -> (текст, кнопки или None)
+
+        Returns:
+            RenderedView
+        """
+        with self._lock:
+            view = self._views.get(key)
+            if view is not None:
+                self._views.move_to_end(key)
+                self.hits += 1
+                return view
+            self.misses += 1
+
+        view = RenderedView(*build())
+        with self._lock:
+            self._views[key] = view
+            while len(self._views) > self.max_views:
+                self._views.popitem(last=False)
+        return view
+
+    def show(self, bot, chat_id, message_id, view):
+        """
+        Показывает экран в сообщении, если оно показывает что-то другое
+
+        Returns:
+            bool: True если сообщение редактировалось
+        """
+        message = (chat_id, message_id)
+        with self._lock:
+            if view.same_as(self._shown.get(message)):
+                self._shown.move_to_end(message)
+                self.skipped_edits += 1
+                return False
+            self._shown[message] = view
+            self._shown.move_to_end(message)
+            while len(self._shown) > self.max_messages:
+                self._shown.popitem(last=False)
+
+        try:
+            result = bot.edit_message_text(
+                chat_id=chat_id,
+                message_id=message_id,
+                text=view.text,
+                reply_markup=view.markup
+            )
+        except Exception:
+            self.forget(chat_id, message_id)
+            raise
+
+        # Через очередь отправки результат приходит позже: при ошибке
+        # забываем экран, чтобы следующий показ отредактировал сообщение
+        if hasattr(result, 'add_done_callback'):
+            def on_done(future):
+                if future.exception() is not None:
+                    self._forget_view(message, view)
+            result.add_done_callback(on_done)
+        return True
+
+    def forget(self, chat_id, message_id):
+        """Забывает, что показывает сообщение (например после удаления)"""
+        with self._lock:
+            self._shown.pop((chat_id, message_id), None)
+
+    def _forget_view(self, message, view):
+        with self._lock:
+            if self._shown.get(message) is view:
+                del self._shown[message]
+
+    def stats(self):
+        """Счетчики кэша"""
+        with self._lock:
+            return {
+                'views': len(self._views),
+                'messages': len(self._shown),
+                'hits': self.hits,
+                'misses': self.misses,
+                'skipped_edits': self.skipped_edits
+            }
@@ -0,0 +1,163 @@
+# ==============================================
+# ПРИЕМ ВЕБХУКОВ JIRA
+# ==============================================
+# Встроенный HTTP-сервер принимает события jira:issue_created,
+# jira:issue_updated и jira:issue_deleted. Каждое событие сразу
+# применяется к снимку доски и проходит ту же проверку колонок,
+# что и опрос, поэтому уведомления приходят почти без задержки,
+# а опрос доски нужен только для редкой сверки
+#
+# Настройка вебхука в Jira: URL http://<хост бота>:<WEBHOOK_PORT><WEBHOOK_PATH>?secret=<JIRA_WEBHOOK_SECRET>
+
+import json
+import time
+import hmac
+import threading
+from urllib.parse import urlsplit, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from board_snapshot import issue_from_jira
+
+ISSUE_EVENTS = {
+    'jira:issue_created': 'created',
+    'jira:issue_updated': 'updated',
+    'jira:issue_deleted': 'deleted'
+}
+
+# Самый большой принимаемый вебхук (байты)
+MAX_BODY_SIZE = 1024 * 1024
+
+
+def parse_issue_event(payload):
+    """
+    Разбирает тело вебхука Jira
+
+    Args:
+        payload: разобранный JSON вебхука
+
+    Returns:
+        dict: {'event': 'created'|'updated'|'deleted', 'issue': задача в формате доски,
+               'received_at': time.monotonic()} или None если событие не о задаче
+    """
+    if not isinstance(payload, dict):
+        return None
+    event = ISSUE_EVENTS.get(payload.get('webhookEvent'))
+    issue = payload.get('issue')
+    if event is None or not isinstance(issue, dict) or not issue.get('key'):
+        return None
+
+    return {'event': event, 'issue': issue_from_jira(issue), 'received_at': time.monotonic()}
+
+
+def issue_event_update(event):
+    """
+    Изменение снимка доски по событию вебхука (для BoardCache.apply)
+
+    Событие относится к доске, если задача уже есть на доске или если
+    она из проекта доски и ее статус отображается в колонке доски.
+    Изменение идемпотентно: его можно повторить на снимке, загруженном позже
+
+    Returns:
+        функция update(BoardSnapshot) -> BoardSnapshot (тот же объект, если событие не о доске)
+    """
+    issue = event['issue']
+    task_key = issue['key']
+    project_key = task_key.rsplit('-', 1)[0]
+
+    def update(snapshot):
+        if event['event'] == 'deleted':
+            return snapshot.without_issue(task_key)
+        if snapshot.issue(task_key) is not None or (
+            project_key in snapshot.project_keys() and issue['statusId'] in snapshot.column_by_status
+        ):
+            return snapshot.with_issue(issue)
+        return snapshot
+
+    return update
+
+
+class WebhookServer:
+    """
+    HTTP-сервер вебхуков в фоновом потоке
+    """
+
+    def __init__(self, host, port, path, on_event, secret):
+        """
+        Args:
+            host, port: адрес, на котором слушать
+            path: путь вебхука (например /jira-webhook)
+            on_event: функция on_event(event) для каждого события о задаче
+            secret: секрет, который запрос передает в ?secret= или заголовке X-Webhook-Secret
+
+        Raises:
+            ValueError: если секрет не задан - без него вебхук может прислать кто угодно
+        """
+        if not secret:
+            raise ValueError("Не задан секрет вебхука (JIRA_WEBHOOK_SECRET) - прием вебхуков не запущен")
+        self.path = path
+        self.secret = secret
+        self.on_event = on_event
+        self.received = 0
+        self.rejected = 0
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def start(self):
+        """Запускает сервер в фоновом потоке"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Останавливает сервер"""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _authorized(self, handler, query):
+        supplied = handler.headers.get('X-Webhook-Secret') or (query.get('secret') or [''])[0]
+        return hmac.compare_digest(supplied.encode(), self.secret.encode())
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                parts = urlsplit(self.path)
+                if parts.path != server.path:
+                    return self._reply(404)
+                if not server._authorized(self, parse_qs(parts.query)):
+                    server.rejected += 1
+                    return self._reply(403)
+
+                length = int(self.headers.get('Content-Length') or 0)
+                if length <= 0 or length > MAX_BODY_SIZE:
+                    return self._reply(400)
+                try:
+                    payload = json.loads(self.rfile.read(length))
+                except ValueError:
+                    return self._reply(400)
+
+                event = parse_issue_event(payload)
+                # Отвечаем сразу - Jira не должна ждать отправки в Telegram
+                self._reply(204)
+                if event is not None:
+                    server.received += 1
+                    try:
+                        server.on_event(event)
+                    except Exception as e:
+                        print(f"❌ Ошибка обработки вебхука {event['issue']['key']}: {e}")
+
+            def _reply(self, status):
+                self.send_response(status)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                # Не засоряем консоль строкой на каждый запрос
+                pass
+
+        return Handler